@@ -6,7 +6,7 @@
 import fitz
 from .Element import Element
 from .share import (IText, TextDirection)
-from .algorithm import (solve_rects_intersection, graph_bfs)
+from .algorithm import (graph_bfs, group_rects_by_connectivity)
 
 
 class BaseCollection:
@@ -15,6 +15,7 @@ class BaseCollection:
         '''Init collection from a list of instances.'''
         self._parent = parent
         self._instances = []
+        self._bbox = None # cached union bbox, see ElementCollection
         self.extend(instances or []) # Note to exclude empty instance by default
 
     def __getitem__(self, idx):
@@ -34,18 +35,45 @@ class BaseCollection:
     def parent(self): return self._parent
 
 
+    def __getstate__(self):
+        '''Copy or pickle collection without cached bbox.'''
+        state = self.__dict__.copy()
+        state['_bbox'] = None
+        return state
+
+
     @property
     def bbox(self):
         '''bbox of combined collection.'''
-        rect = fitz.Rect()
-        for instance in self._instances:
-            rect |= instance.bbox
+        rect = self._bbox
+        if rect is None:
+            rect = fitz.Rect()
+            for instance in self._instances:
+                rect |= instance.bbox
+            if self._owns_instances(): self._bbox = rect
         return fitz.Rect([round(x,1) for x in rect]) # NOTE: round to avoid digital error
 
 
+    def _owns_instances(self):
+        '''Whether the contained instances invalidate the cached bbox of this collection when
+        changing their bbox. The union bbox is re-calculated each time otherwise.'''
+        return False
+
+
+    def invalidate_bbox(self):
+        '''Invalidate cached bbox.'''
+        self._bbox = None
+
+
+    def _include_bbox(self, instance):
+        '''Update cached bbox with the added instance.'''
+        if self._bbox is not None: self._bbox |= instance.bbox
+
+
     def append(self, instance): 
         if not instance: return
         self._instances.append(instance)
+        self._include_bbox(instance)
 
 
     def extend(self, instances:list): 
@@ -63,6 +91,7 @@ class BaseCollection:
             BaseCollection: self
         """
         self._instances = []
+        self.invalidate_bbox()
         self.extend(instances or [])
         return self
 
@@ -145,26 +174,8 @@ class Collection(BaseCollection, IText):
             * Checking intersections between paths is actually a Rectangle-Intersection 
               problem, studied already in many literatures.
         """
-        # build the graph -> adjacent list:
-        # the i-th item is a set of indexes, which connected to the i-th instance
-        num = len(self._instances)
-        index_groups = [set() for _ in range(num)] # type: list[set]
-
-        # solve rectangle intersection problem
-        i_rect_x, i = [], 0
-        d_rect = (-dx, -dy, dx, dy)
-        for rect in self._instances:
-            points = [a+b for a,b in zip(rect.bbox, d_rect)] # consider tolerance
-            i_rect_x.append((i,   points, points[0]))
-            i_rect_x.append((i+1, points, points[2]))
-            i += 2
-        i_rect_x.sort(key=lambda item: item[-1])
-        solve_rects_intersection(i_rect_x, 2*num, index_groups)
-
-        # search graph -> grouped index of instance
-        groups = graph_bfs(index_groups)
-        groups = [self.__class__([self._instances[i] for i in group]) for group in groups]
-        return groups
+        groups = group_rects_by_connectivity([instance.bbox for instance in self._instances], dx, dy)
+        return [self.__class__([self._instances[i] for i in group]) for group in groups]
     
     
     def group_by_columns(self, factor:float=0.0, sorted:bool=True, text_direction:bool=False):
@@ -255,7 +266,46 @@ class Collection(BaseCollection, IText):
 
 
 class ElementCollection(Collection):
-    '''Collection of ``Element`` instances.'''
+    '''Collection of ``Element`` instances.
+
+    .. note::
+        A collection with parent, e.g. lines of a text block, is the owner of the contained
+        elements: it caches the union bbox, which is invalidated by an element changing its
+        bbox. An element has one owner only, so the cache of previous owner is disabled if the
+        element is taken by another collection.
+    '''
+    _shared = False # whether any instance is taken by another collection
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._owns_instances():
+            for e in self._instances: e._owner = self
+
+
+    def _owns_instances(self):
+        return self._parent is not None and not self._shared
+
+
+    def _include_bbox(self, e:Element):
+        '''Update cached bbox with the added instance, and take the ownership of it.'''
+        if self._parent is None: return
+        owner = getattr(e, '_owner', None)
+        if owner is not None and owner is not self:
+            owner._shared = True
+            owner.invalidate_bbox()
+        e._owner = self
+        super()._include_bbox(e)
+
+
+    def _release(self, e:Element):
+        '''Release the ownership of the removed instance.'''
+        if getattr(e, '_owner', None) is self: e._owner = None
+
+
+    def reset(self, instances:list=None):
+        for e in self._instances: self._release(e)
+        return super().reset(instances)
+
 
     def _update_bbox(self, e:Element):
         '''Update parent bbox.'''
@@ -271,6 +321,7 @@ class ElementCollection(Collection):
         """
         if not e: return
         self._instances.append(e)
+        self._include_bbox(e)
         self._update_bbox(e)
 
         # set parent
@@ -286,6 +337,7 @@ class ElementCollection(Collection):
         """        
         if not e: return
         self._instances.insert(nth, e)
+        self._include_bbox(e)
         self._update_bbox(e)
         e.parent = self._parent # set parent
 
@@ -299,7 +351,10 @@ class ElementCollection(Collection):
         Returns:
             Collection: the removed instance.
         """        
-        return self._instances.pop(nth)
+        self.invalidate_bbox()
+        e = self._instances.pop(nth)
+        self._release(e)
+        return e
 
 
     def is_flow_layout(self, line_separate_threshold:float, cell_layout=False):
@@ -15,34 +15,52 @@ CS. If final coordinates are provided, should update it after creating an empty
 '''
 
 import copy
+import threading
 import fitz
 from .share import IText
 from . import constants
 
 
 class Element(IText):
-    '''Boundary box with attribute in fitz.Rect type.'''
+    '''Boundary box with attribute in fitz.Rect type.
+
+    .. note::
+        ``__slots__`` is defined for elements created in large quantities, e.g. ``Char``,
+        ``TextSpan`` and ``Line``, to save memory and speed up attribute access. Subclasses
+        without ``__slots__`` work as normal classes with ``__dict__``.
+    '''
+    __slots__ = ('bbox', '_parent', '_owner')
 
     # all coordinates are related to un-rotated page in PyMuPDF
     # e.g. Matrix(0.0, 1.0, -1.0, 0.0, 842.0, 0.0)
     ROTATION_MATRIX = fitz.Matrix(0.0) # rotation angle = 0 degree by default
 
+    # rotation matrix of the page processed in current thread, which overrides the default one,
+    # so that pages with different rotations can be processed in parallel threads
+    _LOCAL = threading.local()
+
 
     @classmethod
     def set_rotation_matrix(cls, rotation_matrix):
-        """Set global rotation matrix.
+        """Set rotation matrix of the page processed in current thread.
 
         Args:
             Rotation_matrix (fitz.Matrix): target matrix
         """
         if rotation_matrix and isinstance(rotation_matrix, fitz.Matrix):
-            cls.ROTATION_MATRIX = rotation_matrix
+            cls._LOCAL.matrix = rotation_matrix
+
+
+    @classmethod
+    def rotation_matrix(cls):
+        '''Rotation matrix of the page processed in current thread.'''
+        return getattr(cls._LOCAL, 'matrix', cls.ROTATION_MATRIX)
 
 
     @classmethod
     def pure_rotation_matrix(cls):
         '''Pure rotation matrix used for calculating text direction after rotation.'''
-        a,b,c,d,e,f = cls.ROTATION_MATRIX
+        a,b,c,d,e,f = cls.rotation_matrix()
         return fitz.Matrix(a,b,c,d,0,0)
 
 
@@ -50,11 +68,12 @@ class Element(IText):
         ''' Initialize Element and convert to the real (rotation considered) page CS.'''
         self.bbox = fitz.Rect()  # type: fitz.Rect
         self._parent = parent # type: Element
+        self._owner = None # collection caching the union bbox of this element, if any
 
         # NOTE: Any coordinates provided in raw is in original page CS 
         # (without considering page rotation).
         if 'bbox' in (raw or {}):
-            rect = fitz.Rect(raw['bbox']) * Element.ROTATION_MATRIX
+            rect = fitz.Rect(raw['bbox']) * Element.rotation_matrix()
             self.update_bbox(rect)
 
 
@@ -73,6 +92,16 @@ class Element(IText):
     def __repr__(self): return f'{self.__class__.__name__}({tuple(self.bbox)})'
 
 
+    def __getstate__(self):
+        '''Copy or pickle element without the owner collection, which is set again when the
+        copy is added to a collection.'''
+        slots = {}
+        for cls in type(self).__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                if name!='_owner' and hasattr(self, name): slots[name] = getattr(self, name)
+        return getattr(self, '__dict__', None), slots
+
+
     # ------------------------------------------------
     # parent element
     # ------------------------------------------------
@@ -119,6 +148,8 @@ class Element(IText):
                 in real page CS (with rotation considered).
         '''
         self.bbox = fitz.Rect([round(x,1) for x in rect])
+        owner = getattr(self, '_owner', None) # not set for an unpickled element
+        if owner is not None: owner.invalidate_bbox()
         return self
 
 
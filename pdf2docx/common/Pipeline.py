@@ -0,0 +1,195 @@
+'''Staged pipeline with bounded queues between stages, so that the stages of different items
+overlap, e.g. extracting page k+1 while parsing page k and creating docx of page k-1.
+
+* Each stage runs in its own worker threads and gets items from a bounded queue, which
+  limits the count of items held in memory.
+* The results are yielded in the order of input items, so the final stage, e.g. creating
+  docx, works in the caller thread.
+* An exception raised by a stage is passed along with the item, and the later stages skip
+  that item.
+
+.. note::
+    Threads share the Python GIL, so the stages overlap mostly when the work releases GIL,
+    e.g. rendering or encoding images. A stage working on objects which are not thread-safe,
+    e.g. ``fitz.Document``, must run with one worker only.
+'''
+
+import logging
+import threading
+from queue import Queue, Empty, Full
+from time import perf_counter
+
+
+class Stage:
+    '''A pipeline stage processing items with a function in worker threads.'''
+
+    def __init__(self, name:str, func, workers:int=1, maxsize:int=4):
+        '''
+        Args:
+            name (str): Stage name.
+            func (callable): Function processing an item and returning the next item.
+            workers (int, optional): Count of worker threads. Defaults to 1.
+            maxsize (int, optional): Capacity of the input queue. Defaults to 4.
+        '''
+        self.name = name
+        self.func = func
+        self.workers = max(1, int(workers))
+        self.queue = Queue(maxsize=maxsize)
+
+        # statistics
+        self.count = 0        # count of processed items
+        self.busy = 0.0       # total processing time of all workers
+        self.max_depth = 0    # maximum input queue depth
+        self._depth_sum = 0   # sum of input queue depth sampled when an item is queued
+        self._samples = 0
+        self._finished = 0    # count of finished workers
+        self._lock = threading.Lock()
+
+
+    def sample_depth(self):
+        '''Record current depth of the input queue.'''
+        depth = self.queue.qsize()
+        with self._lock:
+            self.max_depth = max(self.max_depth, depth)
+            self._depth_sum += depth
+            self._samples += 1
+
+
+    @property
+    def stats(self):
+        '''Statistics: processed items, mean/maximum queue depth and throughput, i.e. items
+        per second of the workers.'''
+        return {
+            'items'     : self.count,
+            'workers'   : self.workers,
+            'mean_depth': round(self._depth_sum/self._samples, 2) if self._samples else 0.0,
+            'max_depth' : self.max_depth,
+            'throughput': round(self.count*self.workers/self.busy, 2) if self.busy else 0.0
+        }
+
+
+class Pipeline:
+    '''Process items through stages in worker threads.'''
+
+    _STOP = object() # sentinel to stop workers
+
+    def __init__(self, stages:list, maxsize:int=4, final:str='output'):
+        '''
+        Args:
+            stages (list): A list of stage: ``(name, func, workers)``.
+            maxsize (int, optional): Capacity of the queue before each stage. Defaults to 4.
+            final (str, optional): Name of the final stage, i.e. the caller consuming the
+                results. Defaults to 'output'.
+        '''
+        self.stages = [Stage(name, func, workers, maxsize) for name, func, workers in stages]
+        self.final = Stage(final, None, 1, maxsize)
+        self._cancel = threading.Event()
+
+
+    @property
+    def stats(self):
+        '''Statistics of each stage, including the final stage run by caller.'''
+        return {stage.name: stage.stats for stage in self.stages + [self.final]}
+
+
+    def run(self, items):
+        '''Process items and yield results in the order of input items.
+
+        Args:
+            items (iterable): Input items.
+
+        Yields:
+            tuple: ``(item, result, exception)``, where ``exception`` is the error raised by
+            any stage, or None.
+        '''
+        threads = [threading.Thread(target=self._feed, args=(items,), daemon=True)]
+        for i, stage in enumerate(self.stages):
+            target = self.stages[i+1] if i+1<len(self.stages) else self.final
+            threads.extend(threading.Thread(target=self._work, args=(stage, target), daemon=True)
+                                for _ in range(stage.workers))
+        for thread in threads: thread.start()
+
+        # reorder results
+        pending, next_idx = {}, 0
+        try:
+            while True:
+                res = self._get(self.final.queue)
+                if res is self._STOP: break
+                pending[res[0]] = res[1:]
+                while next_idx in pending:
+                    t0 = perf_counter()
+                    yield pending.pop(next_idx) # processed by caller
+                    self.final.count += 1
+                    self.final.busy += perf_counter()-t0
+                    next_idx += 1
+        finally:
+            self._cancel.set()
+            for thread in threads: thread.join()
+
+
+    def report(self):
+        '''Log statistics of each stage.'''
+        for name, stats in self.stats.items():
+            logging.info('Stage %s: %d items, %d workers, queue depth mean %.2f max %d, '
+                        'throughput %.2f items/s', name, stats['items'], stats['workers'],
+                        stats['mean_depth'], stats['max_depth'], stats['throughput'])
+
+
+    def _feed(self, items):
+        '''Put input items, with sequence index, to the first stage.'''
+        stage = self.stages[0]
+        for idx, item in enumerate(items):
+            if not self._put(stage.queue, (idx, item, item, None)): return
+            stage.sample_depth()
+        for _ in range(stage.workers): self._put(stage.queue, self._STOP)
+
+
+    def _work(self, stage:Stage, target:Stage):
+        '''Worker of stage: process items from input queue, and put results to the next stage.'''
+        queue = target.queue
+        while True:
+            res = self._get(stage.queue)
+            if res is None: return # cancelled
+            if res is self._STOP: break
+
+            idx, item, value, error = res
+            if error is None:
+                t0 = perf_counter()
+                try:
+                    value = stage.func(value)
+                except Exception as e:
+                    error = e
+                with stage._lock:
+                    stage.count += 1
+                    stage.busy += perf_counter()-t0
+
+            if not self._put(queue, (idx, item, value, error)): return
+            target.sample_depth()
+
+        # the last finished worker stops the next stage
+        with stage._lock:
+            stage._finished += 1
+            last = stage._finished==stage.workers
+        if last:
+            for _ in range(target.workers): self._put(queue, self._STOP)
+
+
+    def _put(self, queue:Queue, item):
+        '''Put item to queue unless cancelled.'''
+        while not self._cancel.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+
+    def _get(self, queue:Queue):
+        '''Get item from queue, or None if cancelled.'''
+        while not self._cancel.is_set():
+            try:
+                return queue.get(timeout=0.1)
+            except Empty:
+                continue
+        return None
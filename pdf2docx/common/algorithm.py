@@ -183,6 +183,38 @@ def _report_pair(i:int, j:int, index_groups:list):
     index_groups[j].add(i)
 
 
+def group_rects_by_connectivity(rects:list, dx:float, dy:float):
+    '''Group connected rects, i.e. intersected with each other with tolerance considered.
+
+    Args:
+        rects (list): A list of rect (x0, y0, x1, y1).
+        dx (float): x-tolerances to define connectivity.
+        dy (float): y-tolerances to define connectivity.
+
+    Returns:
+        list: A list of connected components, i.e. set of rect indexes.
+    '''
+    # build the graph -> adjacent list:
+    # the i-th item is a set of indexes, which connected to the i-th rect
+    num = len(rects)
+    index_groups = [set() for _ in range(num)] # type: list[set]
+
+    # solve rectangle intersection problem
+    i_rect_x, i = [], 0
+    d_rect = (-dx, -dy, dx, dy)
+    for rect in rects:
+        points = [a+b for a,b in zip(rect, d_rect)] # consider tolerance
+        i_rect_x.append((i,   points, points[0]))
+        i_rect_x.append((i+1, points, points[2]))
+        i += 2
+    i_rect_x.sort(key=lambda item: item[-1])
+
+    solve_rects_intersection(i_rect_x, 2*num, index_groups)
+
+    # search graph -> grouped index of rects
+    return graph_bfs(index_groups)
+
+
 
 # -------------------------------------------------------------------------------------------
 # Implementation of recursive X-Y cut algorithm, which is:
@@ -318,38 +350,43 @@ def inner_contours(img_binary:np.array, bbox:tuple, min_w:float, min_h:float):
     # In general, we focus on only level 2, but considering edge case: level 2 contours 
     # might be counted as level 1 incorrectly, e.g. test/samples/demo-table-close-underline.pdf. 
     # So, get first the concerned level 1 contours, i.e. those contained by other level 1 contour.
-    def contains(bbox1, bbox2):
-        x0, y0, x1, y1 = bbox1
-        u0, v0, u1, v1 = bbox2
-        return u0>=x0 and v0>=y0 and u1<=x1 and v1<=y1
-
-    level_1_bbox_list, res_level_1, res = [], [], []
-    for i in level_1:
-        x, y, w, h = cv.boundingRect(contours[i])
-        if w<min_w or h<min_h: continue
-        level_1_bbox_list.append((x, y, x+w, y+h))
-
-    for bbox1 in level_1_bbox_list:
-        for bbox2 in level_1_bbox_list:
-            if bbox1==bbox2: continue # skip itself
-            if contains(bbox1, bbox2):
-                res_level_1.append(bbox2)
-                res.append(bbox2)
+    def contains(bboxes1, bboxes2):
+        '''Whether each of ``bboxes1`` (m,4) contains each of ``bboxes2`` (n,4) -> (m,n).'''
+        A, B = bboxes1[:, None, :], bboxes2[None, :, :]
+        return np.all(B[...,:2]>=A[...,:2], axis=-1) & np.all(B[...,2:]<=A[...,2:], axis=-1)
+
+    def valid_bboxes(indexes):
+        '''Bounding rects of contours with small ones ignored.'''
+        bboxes = _bounding_rects(contours, indexes)
+        w, h = bboxes[:,2]-bboxes[:,0], bboxes[:,3]-bboxes[:,1]
+        return bboxes[(w>=min_w) & (h>=min_h)]
+
+    # level 1 contained by other level 1 (with same bbox excluded), in order of 
+    # (container, contained) pairs
+    level_1_bboxes = valid_bboxes(level_1)
+    same = np.all(level_1_bboxes[:, None, :]==level_1_bboxes[None, :, :], axis=-1)
+    _, j = np.nonzero(contains(level_1_bboxes, level_1_bboxes) & ~same)
+    res_level_1 = level_1_bboxes[j]
 
     # now level 2: with contours contained in `res_level_1` excluded
-    def contained_in_concerned_level_1(bbox):
-        for level_1_bbox in res_level_1:
-            if contains(level_1_bbox, bbox): return True
-        return False
-
-    for i in level_2:
-        x, y, w, h = cv.boundingRect(contours[i])
-        level_2_bbox = (x, y, x+w, y+h)
-        if w<min_w or h<min_h: continue
-        if contained_in_concerned_level_1(level_2_bbox): continue
-        res.append(level_2_bbox)
-    
-    return res
+    level_2_bboxes = valid_bboxes(level_2)
+    if len(res_level_1):
+        contained = contains(np.unique(res_level_1, axis=0), level_2_bboxes).any(axis=0)
+        level_2_bboxes = level_2_bboxes[~contained]
+
+    return [tuple(bbox) for bbox in res_level_1.tolist() + level_2_bboxes.tolist()]
+
+
+def _bounding_rects(contours:list, indexes:np.array):
+    '''Bounding rects ``(x0, y0, x1, y1)`` of specified contours, same to ``cv.boundingRect``
+    but calculated in bulk.'''
+    if not len(indexes): return np.zeros((0,4), dtype=int)
+    points = [contours[i].reshape(-1,2) for i in indexes]
+    starts = np.cumsum([0] + [len(pts) for pts in points[:-1]])
+    points = np.concatenate(points)
+    p0 = np.minimum.reduceat(points, starts, axis=0)
+    p1 = np.maximum.reduceat(points, starts, axis=0) + 1
+    return np.concatenate((p0, p1), axis=1).astype(int)
 
 
 def xy_project_profile(img_source:np.array, img_binary:np.array, gap:int=5, dw:int=None, dh:int=None):   
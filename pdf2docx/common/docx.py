@@ -1,6 +1,8 @@
 '''docx operation methods based on ``python-docx``.'''
 
-from docx.shared import Pt
+import copy
+from functools import lru_cache
+from docx.shared import Pt, RGBColor
 try:
     # python-docx <= 0.8.11 or python-docx > 1.0.0
     from docx.oxml import OxmlElement, parse_xml, register_element_cls
@@ -10,14 +12,39 @@ except ImportError:
 from docx.oxml.ns import qn, nsdecls
 from docx.oxml.shape import CT_Picture
 from docx.oxml.xmlchemy import BaseOxmlElement, OneAndOnlyOne
+from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.text import WD_COLOR_INDEX
 from docx.image.exceptions import UnrecognizedImageError
 from docx.table import _Cell
+from docx.text.paragraph import Paragraph
 from docx.opc.constants import RELATIONSHIP_TYPE
-from .share import rgb_value
+from .share import rgb_value, rgb_component
 from lxml import etree
 
 
+# ---------------------------------------------------------
+# element templates
+# ---------------------------------------------------------
+@lru_cache(maxsize=1024)
+def _template(tag:str, attrs:tuple):
+    return OxmlElement(tag, {qn(name): value for name, value in attrs})
+
+
+def new_element(tag:str, attrs:dict=None):
+    """Create an element by copying the cached template, rather than parsing xml string
+    for each paragraph, run or cell.
+
+    Args:
+        tag (str): Tag name with namespace prefix, e.g. ``w:shd``.
+        attrs (dict, optional): Attributes with namespace prefix, e.g. ``{'w:val': '0'}``.
+            The attribute values must be string.
+
+    Returns:
+        BaseOxmlElement: A new element, which is independent of the template.
+    """
+    return copy.copy(_template(tag, tuple(attrs.items()) if attrs else ()))
+
+
 # ---------------------------------------------------------
 # section and paragraph
 # ---------------------------------------------------------
@@ -65,10 +92,8 @@ def set_columns(section, width_list:list, space=0):
 
     # insert column with width
     for w in width_list:
-        e = OxmlElement('w:col')
-        e.set(qn('w:w'), str(int(20*w)))
-        e.set(qn('w:space'), str(int(20*space))) # basic unit 1/20 Pt
-        cols.append(e)
+        # basic unit 1/20 Pt
+        cols.append(new_element('w:col', {'w:w': str(int(20*w)), 'w:space': str(int(20*space))}))
 
 def delete_paragraph(paragraph):
     '''Delete a paragraph.
@@ -81,6 +106,45 @@ def delete_paragraph(paragraph):
     paragraph._p = paragraph._element = None
 
 
+def last_paragraph(container, n:int=1):
+    '''Get the n-th last paragraph of a block container, e.g. Document or _Cell.
+
+    It's equal to ``container.paragraphs[-n]``, but walks from the end of container
+    rather than creating the list of all paragraphs.
+
+    Args:
+        container (Document, _Cell): ``python-docx`` block container.
+        n (int, optional): The n-th last paragraph. Defaults to 1.
+
+    Returns:
+        Paragraph: The target paragraph, or None if not exist.
+    '''
+    parent = getattr(container, '_body', container) # Document -> _Body
+    for i, p in enumerate(parent._element.iterchildren(qn('w:p'), reversed=True), start=1):
+        if i==n: return Paragraph(p, parent)
+    return None
+
+
+def next_paragraph(container, paragraph=None):
+    '''Get the paragraph next to the given paragraph.
+
+    Args:
+        container (Document, _Cell): ``python-docx`` block container.
+        paragraph (Paragraph, optional): The reference paragraph. Get the first paragraph
+            of container if None.
+
+    Returns:
+        Paragraph: The target paragraph, or None if not exist.
+    '''
+    parent = getattr(container, '_body', container) # Document -> _Body
+    if paragraph is None:
+        ps = parent._element.iterchildren(qn('w:p'))
+    else:
+        ps = paragraph._p.itersiblings(qn('w:p'))
+    p = next(ps, None)
+    return None if p is None else Paragraph(p, parent)
+
+
 def reset_paragraph_format(p, line_spacing:float=1.05):
     '''Reset paragraph format, especially line spacing.
 
@@ -105,11 +169,9 @@ def reset_paragraph_format(p, line_spacing:float=1.05):
     pf.widow_control = True
 
     # do not adjust spacing between Chinese and Latin/number
-    xml = r'<w:autoSpaceDE {} w:val="0"/>'.format(nsdecls('w'))
-    p._p.get_or_add_pPr().insert(0, parse_xml(xml))
-
-    xml = r'<w:autoSpaceDN {} w:val="0"/>'.format(nsdecls('w'))
-    p._p.get_or_add_pPr().insert(0, parse_xml(xml))
+    pPr = p._p.get_or_add_pPr()
+    pPr.insert(0, new_element('w:autoSpaceDE', {'w:val': '0'}))
+    pPr.insert(0, new_element('w:autoSpaceDN', {'w:val': '0'}))
 
     return pf
 
@@ -136,6 +198,83 @@ def set_hidden_property(p):
 # ---------------------------------------------------------
 # text properties
 # ---------------------------------------------------------
+# Here give 6/16 of the valid highlight colors
+HIGHLIGHT_COLORS = {
+    rgb_value((1,0,0)): WD_COLOR_INDEX.RED,
+    rgb_value((0,1,0)): WD_COLOR_INDEX.BRIGHT_GREEN,
+    rgb_value((0,0,1)): WD_COLOR_INDEX.BLUE,
+    rgb_value((1,1,0)): WD_COLOR_INDEX.YELLOW,
+    rgb_value((1,0,1)): WD_COLOR_INDEX.PINK,
+    rgb_value((0,1,1)): WD_COLOR_INDEX.TURQUOISE
+}
+
+
+def set_char_font(p_run, font_name:str):
+    '''Set font name, including the font for East Asian characters.
+
+    Args:
+        p_run (docx.text.run.Run): Proxy object wrapping <w:r> element.
+        font_name (str): Font name.
+    '''
+    p_run.font.name = font_name
+    p_run._element.rPr.rFonts.set(qn('w:eastAsia'), font_name) # for CJK characters
+
+
+class CharStyles:
+    '''Character styles interned from the distinct text formats of a document.
+
+    A run refers to the named style in ``styles.xml`` rather than repeating the direct
+    formatting, e.g. font, color and size, so the document gets smaller and faster to write.
+    '''
+    def __init__(self, styles):
+        '''
+        Args:
+            styles (Styles): ``python-docx`` styles of the document.
+        '''
+        self._styles = styles
+        self._ids = {} # text format -> style id
+
+    def __len__(self): return len(self._ids)
+
+    def style_id(self, font_name:str, color:int, size:float, bold:bool, italic:bool):
+        '''Get id of the character style with given format, or add a new one.
+
+        Args:
+            font_name (str): Font name.
+            color (int): Font color.
+            size (float): Font size in Pt.
+            bold (bool): Bold font.
+            italic (bool): Italic font.
+
+        Returns:
+            str: Style id.
+        '''
+        key = (font_name, color, size, bold, italic)
+        style_id = self._ids.get(key, None)
+        if style_id is None:
+            style = self._styles.add_style(f'PDF Span {len(self._ids)+1}', WD_STYLE_TYPE.CHARACTER)
+            font = style.font
+            font.bold = bold
+            font.italic = italic
+            font.name = font_name
+            style.element.rPr.rFonts.set(qn('w:eastAsia'), font_name) # for CJK characters
+            font.color.rgb = RGBColor(*rgb_component(color))
+            font.size = Pt(size)
+            style_id = self._ids[key] = style.style_id
+        return style_id
+
+
+def set_char_style(p_run, style_id:str):
+    '''Refer to a character style. The style element is inserted as the first run property,
+    so set it after the direct formatting inserted at the beginning, e.g. scaling.
+
+    Args:
+        p_run (docx.text.run.Run): Proxy object wrapping <w:r> element.
+        style_id (str): Style id.
+    '''
+    p_run._r.get_or_add_rPr().insert(0, new_element('w:rStyle', {'w:val': style_id}))
+
+
 def set_char_scaling(p_run, scale:float=1.0):
     '''Set character spacing: scaling. 
     
@@ -145,8 +284,7 @@ def set_char_scaling(p_run, scale:float=1.0):
         p_run (docx.text.run.Run): Proxy object wrapping <w:r> element.
         scale (float, optional): scaling factor. Defaults to 1.0.
     '''
-    p_run._r.get_or_add_rPr().insert(0, 
-        parse_xml(r'<w:w {} w:val="{}"/>'.format(nsdecls('w'), 100*scale)))
+    p_run._r.get_or_add_rPr().insert(0, new_element('w:w', {'w:val': str(100*scale)}))
 
 
 def set_char_spacing(p_run, space:float=0.0):
@@ -158,8 +296,7 @@ def set_char_spacing(p_run, space:float=0.0):
         p_run (docx.text.run.Run): Proxy object wrapping <w:r> element.
         space (float, optional): Spacing value in Pt. Expand if positive else condense. Defaults to 0.0.
     '''
-    p_run._r.get_or_add_rPr().insert(0, 
-        parse_xml(r'<w:spacing {} w:val="{}"/>'.format(nsdecls('w'), 20*space)))
+    p_run._r.get_or_add_rPr().insert(0, new_element('w:spacing', {'w:val': str(20*space)}))
 
 
 def set_char_shading(p_run, srgb:int):
@@ -173,23 +310,14 @@ def set_char_shading(p_run, srgb:int):
         srgb (int): Color value.
     '''
     # try to set highlight first using python-docx built-in method
-    # Here give 6/16 of the valid highlight colors
-    color_map = {        
-        rgb_value((1,0,0)): WD_COLOR_INDEX.RED,
-        rgb_value((0,1,0)): WD_COLOR_INDEX.BRIGHT_GREEN,
-        rgb_value((0,0,1)): WD_COLOR_INDEX.BLUE,
-        rgb_value((1,1,0)): WD_COLOR_INDEX.YELLOW,
-        rgb_value((1,0,1)): WD_COLOR_INDEX.PINK,
-        rgb_value((0,1,1)): WD_COLOR_INDEX.TURQUOISE
-    }
-    if srgb in color_map:
-        p_run.font.highlight_color = color_map[srgb]
+    if srgb in HIGHLIGHT_COLORS:
+        p_run.font.highlight_color = HIGHLIGHT_COLORS[srgb]
 
     # set char shading
     else:
         c = hex(srgb)[2:].zfill(6)
-        xml = r'<w:shd {} w:val="clear" w:color="auto" w:fill="{}"/>'.format(nsdecls('w'), c)
-        p_run._r.get_or_add_rPr().insert(0, parse_xml(xml))
+        shd = new_element('w:shd', {'w:val': 'clear', 'w:color': 'auto', 'w:fill': c})
+        p_run._r.get_or_add_rPr().insert(0, shd)
 
 
 def set_char_underline(p_run, srgb:int):
@@ -200,8 +328,7 @@ def set_char_underline(p_run, srgb:int):
         srgb (int): Color value.
     '''
     c = hex(srgb)[2:].zfill(6)
-    xml = r'<w:u {} w:val="single" w:color="{}"/>'.format(nsdecls('w'), c)
-    p_run._r.get_or_add_rPr().insert(0, parse_xml(xml))
+    p_run._r.get_or_add_rPr().insert(0, new_element('w:u', {'w:val': 'single', 'w:color': c}))
 
 
 def add_hyperlink(paragraph, url, text):
@@ -257,6 +384,24 @@ def pt_to_emu(value_pt):
     return int(value_pt * EMU_PER_PT)
 
 
+def rotated_frame(x:int, y:int, width:int, height:int, rotation:int=0):
+    '''Frame of a picture before rotating around its center, so that the rotated picture
+    covers the box ``(x, y, width, height)``. Only multiples of 90 degrees are considered.
+
+    Returns:
+        tuple: ``(x, y, width, height)`` of the frame.
+    '''
+    if rotation % 180 == 0: return x, y, width, height
+    d = (width-height) // 2
+    return x+d, y-d, height, width
+
+
+def set_picture_rotation(element, rotation:int):
+    '''Set clockwise rotation angle of the picture in drawing element, e.g. ``wp:inline``.'''
+    if rotation:
+        element.xpath('.//pic:spPr/a:xfrm')[0].set('rot', str(rotation*60000))
+
+
 def add_floating_picture_pt(
     paragraph,
     image_path,
@@ -264,6 +409,7 @@ def add_floating_picture_pt(
     y_pt,
     width_pt,
     height_pt,
+    rotation=0,
 ):
     """
     Insert floating image at absolute position using points (pt).
@@ -274,13 +420,12 @@ def add_floating_picture_pt(
     :param y_pt: vertical position in pt
     :param width_pt: width in pt
     :param height_pt: height in pt
+    :param rotation: clockwise rotation angle, a multiple of 90
     """
 
     # Convert to EMU
-    x_emu = pt_to_emu(x_pt)
-    y_emu = pt_to_emu(y_pt)
-    width_emu = pt_to_emu(width_pt)
-    height_emu = pt_to_emu(height_pt)
+    x_emu, y_emu, width_emu, height_emu = rotated_frame(
+        pt_to_emu(x_pt), pt_to_emu(y_pt), pt_to_emu(width_pt), pt_to_emu(height_pt), rotation)
 
     run = paragraph.add_run()
     run.add_picture(image_path)
@@ -297,6 +442,7 @@ def add_floating_picture_pt(
     a_ext = inline.xpath(".//a:ext")[0]
     a_ext.set("cx", str(width_emu))
     a_ext.set("cy", str(height_emu))
+    set_picture_rotation(inline, rotation)
 
     # Extract required elements
     docPr = inline.xpath("./wp:docPr")[0]
@@ -348,7 +494,7 @@ def add_floating_picture_pt(
 # ---------------------------------------------------------
 # image properties
 # ---------------------------------------------------------
-def add_image(p, image_path_or_stream, x_pos, y_pos, width, height):
+def add_image(p, image_path_or_stream, x_pos, y_pos, width, height, rotation=0):
     '''Add a floating image to a paragraph at a specific position.
 
     The image is inserted as a floating picture (not inline) using ``add_floating_picture_pt``,
@@ -361,6 +507,7 @@ def add_image(p, image_path_or_stream, x_pos, y_pos, width, height):
         y_pos (float): Vertical position of the image in Pt, relative to the page.
         width (float): Image width in Pt.
         height (float): Image height in Pt.
+        rotation (int, optional): Clockwise rotation angle, a multiple of 90. Defaults to 0.
     '''
     #docx_span = p.add_run()
     try:
@@ -372,6 +519,7 @@ def add_image(p, image_path_or_stream, x_pos, y_pos, width, height):
             y_pt=y_pos,      # 2 inches
             width_pt=width,  # 3 inches
             height_pt=height, # 2 inches
+            rotation=rotation,
         )
     except UnrecognizedImageError:
         print('Unrecognized Image.')
@@ -446,7 +594,7 @@ class _CT_Anchor(BaseOxmlElement):
 register_element_cls('wp:anchor', _CT_Anchor)
 
 
-def add_float_image(p, image_path_or_stream, width, pos_x=None, pos_y=None):
+def add_float_image(p, image_path_or_stream, width, pos_x=None, pos_y=None, rotation=0):
     '''Add float image behind text.
     
     Args:
@@ -455,13 +603,20 @@ def add_float_image(p, image_path_or_stream, width, pos_x=None, pos_y=None):
         width (float): Displaying width of picture, in unit Pt.
         pos_x (float): X-position (English Metric Units) to the top-left point of page valid region
         pos_y (float): Y-position (English Metric Units) to the top-left point of page valid region
+        rotation (int, optional): Clockwise rotation angle, a multiple of 90. Defaults to 0.
     '''
     run = p.add_run()
     # parameters for picture, e.g. id, name
     rId, image = run.part.get_or_add_image(image_path_or_stream)
-    cx, cy = image.scaled_dimensions(Pt(width), None)
+    if rotation % 180 == 0:
+        cx, cy = image.scaled_dimensions(Pt(width), None)
+        x, y = Pt(pos_x), Pt(pos_y)
+    else: # the displayed width is the height of picture frame
+        cx, cy = image.scaled_dimensions(None, Pt(width))
+        x, y, cx, cy = rotated_frame(Pt(pos_x), Pt(pos_y), cy, cx, rotation)
     shape_id, filename = run.part.next_id, image.filename
-    anchor = _CT_Anchor.new_pic_anchor(shape_id, rId, filename, cx, cy, Pt(pos_x), Pt(pos_y))
+    anchor = _CT_Anchor.new_pic_anchor(shape_id, rId, filename, cx, cy, x, y)
+    set_picture_rotation(anchor, rotation)
     run._r.add_drawing(anchor)
 
 
@@ -477,10 +632,45 @@ def indent_table(table, indent:float):
     '''
     tbl_pr = table._element.xpath('w:tblPr')
     if tbl_pr:
-        e = OxmlElement('w:tblInd')
-        e.set(qn('w:w'), str(20*indent)) # basic unit 1/20 pt for openxml 
-        e.set(qn('w:type'), 'dxa')
-        tbl_pr[0].append(e)
+        # basic unit 1/20 pt for openxml
+        tbl_pr[0].append(new_element('w:tblInd', {'w:w': str(20*indent), 'w:type': 'dxa'}))
+
+
+class TableGrid:
+    '''Cells grid of a ``python-docx`` table.
+
+    ``table.cell()``, ``table.rows[i]`` and ``table._cells`` walk through the whole table
+    xml for each call, which results in quadratic time for a large table. So the grid is
+    materialized once per table, and maintained when merging cells.
+    '''
+    def __init__(self, table):
+        '''
+        Args:
+            table (Table): ``python-docx`` Table object.
+        '''
+        self.rows = list(table.rows)
+        self.num_cols = table._column_count
+        self._cells = table._cells # type: list[_Cell]
+
+    def __len__(self): return len(self._cells)
+
+    def cell(self, i:int, j:int):
+        '''``python-docx`` cell at ``(i, j)``, same to ``table.cell(i, j)``.'''
+        return self._cells[i*self.num_cols + j]
+
+    def merge(self, cell:_Cell, other_cell:_Cell):
+        '''Merge the rectangular region defined by ``cell`` and ``other_cell`` as diagonal
+        corners, and point all grid positions in that region to the merged cell.
+
+        Returns:
+            _Cell: The merged cell.
+        '''
+        merged_cell = cell.merge(other_cell)
+        tc = merged_cell._tc
+        for i in range(tc.top, tc.bottom):
+            for j in range(tc.left, tc.right):
+                self._cells[i*self.num_cols + j] = merged_cell
+        return merged_cell
 
 
 def set_cell_margins(cell:_Cell, **kwargs):
@@ -501,14 +691,11 @@ def set_cell_margins(cell:_Cell, **kwargs):
     '''
     tc = cell._tc
     tcPr = tc.get_or_add_tcPr()
-    tcMar = OxmlElement('w:tcMar')
+    tcMar = new_element('w:tcMar')
  
     for m in ['top', 'start', 'bottom', 'end']:
         if m in kwargs:
-            node = OxmlElement("w:{}".format(m))
-            node.set(qn('w:w'), str(kwargs.get(m)))
-            node.set(qn('w:type'), 'dxa')
-            tcMar.append(node)
+            tcMar.append(new_element(f'w:{m}', {'w:w': str(kwargs.get(m)), 'w:type': 'dxa'}))
  
     tcPr.append(tcMar)
 
@@ -524,7 +711,7 @@ def set_cell_shading(cell:_Cell, srgb:int):
         srgb (int): RGB color value.
     '''
     c = hex(srgb)[2:].zfill(6)
-    cell._tc.get_or_add_tcPr().append(parse_xml(r'<w:shd {} w:fill="{}"/>'.format(nsdecls('w'), c)))
+    cell._tc.get_or_add_tcPr().append(new_element('w:shd', {'w:fill': c}))
 
 
 def set_cell_border(cell:_Cell, **kwargs):
@@ -554,7 +741,7 @@ def set_cell_border(cell:_Cell, **kwargs):
     # check for tag existence, if none found, then create one
     tcBorders = tcPr.first_child_found_in("w:tcBorders")
     if tcBorders is None:
-        tcBorders = OxmlElement('w:tcBorders')
+        tcBorders = new_element('w:tcBorders')
         tcPr.append(tcBorders)
 
     # list over all available tags
@@ -566,7 +753,7 @@ def set_cell_border(cell:_Cell, **kwargs):
             # check for tag existence, if none found, then create one
             element = tcBorders.find(qn(tag))
             if element is None:
-                element = OxmlElement(tag)
+                element = new_element(tag)
                 tcBorders.append(element)
 
             # looks like order of attributes is important
@@ -586,6 +773,4 @@ def set_vertical_cell_direction(cell:_Cell, direction:str='btLr'):
     '''
     tc = cell._tc
     tcPr = tc.get_or_add_tcPr()
-    textDirection = OxmlElement('w:textDirection')
-    textDirection.set(qn('w:val'), direction)  # btLr tbRl
-    tcPr.append(textDirection)
+    tcPr.append(new_element('w:textDirection', {'w:val': direction})) # btLr tbRl
@@ -0,0 +1,125 @@
+'''Conversion between ``PyMuPDF`` pixmap and ``numpy`` array / ``opencv`` image.
+
+``Pixmap.tobytes()`` encodes the pixel data to PNG image, and ``cv.imdecode()`` decodes it
+back, which is the major cost to get an ``opencv`` image of a rendered page. The functions
+here work on the samples of pixmap directly:
+
+* :py:func:`pixmap_to_array` wraps the samples as a ``numpy`` view without copying;
+* :py:func:`pixmap_to_cv_image` converts color space (and alpha) to ``opencv`` image, same
+  to decoding the PNG image with ``cv.imdecode()``; :py:func:`samples_to_cv_image` does it
+  on the array view, without calling ``PyMuPDF``;
+* :py:func:`array_to_pixmap` creates pixmap from ``numpy`` array / ``opencv`` image without
+  encoding.
+'''
+
+import fitz
+import numpy as np
+import cv2 as cv
+
+
+# lookup table to convert premultiplied color to straight color, created on first use
+_UNMULTIPLY_TABLE = None
+
+
+def pixmap_to_array(pixmap:fitz.Pixmap):
+    '''Wrap samples of pixmap as a ``numpy`` array view in shape ``(height, width, n)``,
+    where ``n`` counts the color components and alpha channel.
+
+    .. note::
+        The samples are not copied, so keep the pixmap alive when using the array.
+    '''
+    h, w, n = pixmap.height, pixmap.width, pixmap.n
+    arr = np.frombuffer(pixmap.samples_mv, np.uint8).reshape(h, pixmap.stride)
+    return arr[:, :w*n].reshape(h, w, n)
+
+
+def unmultiply_alpha(arr:np.ndarray):
+    '''Convert premultiplied color of array with alpha channel, e.g. samples of pixmap, to
+    straight color, in the same way as ``PyMuPDF`` does when writing PNG image.'''
+    global _UNMULTIPLY_TABLE
+    if _UNMULTIPLY_TABLE is None:
+        # table[alpha, color] = (color * inv_alpha + 128) >> 8
+        a = np.arange(256, dtype=np.int64)
+        inva = np.zeros(256, dtype=np.int64)
+        inva[1:] = 255 * 256 // a[1:]
+        table = (a[None, :] * inva[:, None] + 128) >> 8
+        table[0] = a  # keep color for fully transparent pixel
+        _UNMULTIPLY_TABLE = np.minimum(table, 255).astype(np.uint8)
+
+    alpha = arr[:, :, -1:]
+    color = _UNMULTIPLY_TABLE[alpha, arr[:, :, :-1]]
+    return np.concatenate((color, alpha), axis=2)
+
+
+def pixmap_to_cv_image(pixmap:fitz.Pixmap, flags:int=cv.IMREAD_COLOR):
+    '''Convert pixmap to ``opencv`` image, same to ``cv.imdecode(pixmap.tobytes(), flags)``
+    but without encoding and decoding.
+
+    Args:
+        pixmap (fitz.Pixmap): Pixmap in any color space, with alpha or not.
+        flags (int, optional): ``cv.IMREAD_COLOR`` for BGR image; ``cv.IMREAD_UNCHANGED``
+            for gray, BGR or BGRA image depending on the pixmap. Defaults to cv.IMREAD_COLOR.
+
+    Returns:
+        np.ndarray: ``opencv`` image, which doesn't share data with the pixmap.
+    '''
+    if pixmap.colorspace and pixmap.colorspace.n > 3: # e.g. CMYK
+        pixmap = fitz.Pixmap(fitz.csRGB, pixmap)
+    return samples_to_cv_image(pixmap_to_array(pixmap), pixmap.alpha, flags)
+
+
+def samples_to_cv_image(samples:np.ndarray, alpha:bool, flags:int=cv.IMREAD_COLOR):
+    '''Convert samples of gray or RGB pixmap, e.g. the array from :py:func:`pixmap_to_array`,
+    to ``opencv`` image. No ``PyMuPDF`` is called, so it's safe to run in other threads.
+
+    Args:
+        samples (np.ndarray): Samples in shape ``(height, width, n)``.
+        alpha (bool): Whether the last component is premultiplied alpha.
+        flags (int, optional): Same to :py:func:`pixmap_to_cv_image`.
+
+    Returns:
+        np.ndarray: ``opencv`` image, which doesn't share data with the samples.
+    '''
+    if alpha:
+        samples = unmultiply_alpha(samples)
+        if flags==cv.IMREAD_COLOR: samples = samples[:, :, :-1]
+
+    n = samples.shape[2]
+    if n==1:
+        return samples[:, :, 0].copy() if flags==cv.IMREAD_UNCHANGED \
+            else cv.cvtColor(samples[:, :, 0], cv.COLOR_GRAY2BGR)
+    if n==2: # gray with alpha
+        return np.dstack((cv.cvtColor(samples[:, :, 0], cv.COLOR_GRAY2BGR), samples[:, :, 1]))
+    return cv.cvtColor(samples, cv.COLOR_RGBA2BGRA if n==4 else cv.COLOR_RGB2BGR)
+
+
+def premultiply_alpha(arr:np.ndarray):
+    '''Convert straight color of array with alpha channel to premultiplied color, which is
+    required by samples of pixmap, in the same way as ``MuPDF`` does.'''
+    alpha = arr[:, :, -1:]
+    x = arr[:, :, :-1].astype(np.uint16) * alpha + 128 # fz_mul255
+    color = ((x + (x>>8)) >> 8).astype(np.uint8)
+    return np.concatenate((color, alpha), axis=2)
+
+
+def array_to_pixmap(arr:np.ndarray, bgr:bool=False):
+    '''Create pixmap from array without encoding.
+
+    Args:
+        arr (np.ndarray): Gray image in shape ``(height, width)`` or ``(height, width, 1)``;
+            gray with alpha in shape ``(height, width, 2)``; RGB / RGBA image in shape
+            ``(height, width, 3|4)``. The color is straight, i.e. not premultiplied by alpha.
+        bgr (bool, optional): Whether the color components are in BGR order, e.g.
+            ``opencv`` image. Defaults to False.
+
+    Returns:
+        fitz.Pixmap: Pixmap in gray or RGB color space, with alpha if the array has.
+    '''
+    if arr.ndim==2: arr = arr[:, :, None]
+    h, w, n = arr.shape
+    if bgr and n>=3:
+        arr = cv.cvtColor(arr, cv.COLOR_BGRA2RGBA if n==4 else cv.COLOR_BGR2RGB)
+    colorspace = fitz.csGRAY if n<=2 else fitz.csRGB
+    alpha = n in (2, 4)
+    if alpha: arr = premultiply_alpha(arr)
+    return fitz.Pixmap(colorspace, w, h, np.ascontiguousarray(arr).tobytes(), alpha)
@@ -1,8 +1,11 @@
 '''Common methods.'''
 
 from enum import Enum
+import os
 import random
+import threading
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from fitz.utils import getColorList, getColorInfoList
 
 
@@ -26,6 +29,23 @@ class RectType(Enum):
     SHADING = 1<<5
 
 
+class PageType(Enum):
+    '''Page type classified with counts of page contents.
+    * BLANK  : no text, image, drawing or link
+    * SCANNED: images covering the page, without text, drawing or link; rendered to one image
+    * TEXT   : text (and links) only, i.e. flow layout without image or drawing
+    * TABLE  : mostly iso-oriented drawings, e.g. table borders and shading
+    * VECTOR : mostly non-iso-oriented drawings, e.g. charts and diagrams
+    * MIXED  : any other page
+    '''
+    BLANK   = 0
+    SCANNED = 1
+    TEXT    = 2
+    TABLE   = 3
+    VECTOR  = 4
+    MIXED   = 5
+
+
 class TextDirection(Enum):
     '''Text direction.
     * LEFT_RIGHT: from left to right within a line, and lines go from top to bottom
@@ -58,6 +78,8 @@ class TextAlignment(Enum):
 
 class IText:
     '''Text related interface considering text direction.'''
+    __slots__ = ()
+
     @property
     def text_direction(self):
         '''Text direction is from left to right by default.'''
@@ -203,6 +225,26 @@ def rgb_value(components:list):
 # -------------------------
 # pdf plot
 # -------------------------
+_thread_pool = None
+_thread_pool_pid = None
+_thread_pool_lock = threading.Lock()
+
+
+def thread_pool():
+    '''Thread pool shared by the CPU-bound tasks releasing GIL, e.g. encoding images.
+
+    The pool is bounded by the count of CPU, however many threads submit tasks to it, e.g.
+    the parallel workers of pipeline. It's created per process, since the worker threads
+    don't exist in a forked process.
+    '''
+    global _thread_pool, _thread_pool_pid
+    with _thread_pool_lock:
+        if _thread_pool is None or _thread_pool_pid!=os.getpid():
+            _thread_pool = ThreadPoolExecutor(os.cpu_count())
+            _thread_pool_pid = os.getpid()
+        return _thread_pool
+
+
 def new_page(doc, width:float, height:float, title:str):
     '''Insert a new page with given title.
 
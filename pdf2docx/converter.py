@@ -2,15 +2,20 @@
 import json
 import logging
 import os
+import tempfile
 from multiprocessing import Pool, cpu_count
 from time import perf_counter
 from typing import AnyStr, IO, Union
 
 import fitz
-from docx import Document
 
 from .page.Page import Page
 from .page.Pages import Pages
+from .page.Checkpoint import Checkpoint
+from .font.Fonts import Fonts
+from .common.Element import Element
+from .common.Pipeline import Pipeline
+from .writer import (DocxWriter, StreamWriter)
 
 # check PyMuPDF version
 # 1.19.0 <= v <= 1.23.8, or v>=1.23.16
@@ -36,30 +41,35 @@ class Converter:
     '''
 
     def __init__(
-        self, pdf_file: str = None, password: str = None, stream: bytes = None
+        self, pdf_file: str = None, password: str = None, stream = None
     ):
         '''Initialize fitz object with given pdf file path.
 
         Args:
             pdf_file (str): pdf file path.
-            stream   (bytes): pdf file in memory.
+            stream   (bytes, buffer, file-like): pdf file in memory, e.g. ``bytes``, any object
+                supporting buffer protocol like ``memoryview`` and ``mmap``, which is opened
+                without copy, or a file-like object read from current position.
             password (str): Password for encrypted pdf. Default to None if not encrypted.
         '''
         # fitz object
         self.filename_pdf = pdf_file
         self.password = str(password or "")
+        self._stream = None  # pdf content in memory
+        self._tmp_pdf = None # temporary pdf file spilled from stream for multi-processing
 
-        if not pdf_file and not stream:
+        if not pdf_file and stream is None:
             raise ValueError("Either pdf_file or stream must be given.")
 
-        if stream:
-            self._fitz_doc = fitz.Document(stream=stream)
-
-        else:
+        if pdf_file:
             self._fitz_doc = fitz.Document(pdf_file)
+        else:
+            self._stream = self._stream_buffer(stream)
+            self._fitz_doc = fitz.Document(stream=self._stream)
 
         # initialize empty pages container
         self._pages = Pages()
+        self._checkpoint = None # type: Checkpoint
 
 
     @property
@@ -68,8 +78,60 @@ class Converter:
     @property
     def pages(self): return self._pages
 
+    @property
+    def _pdf_source(self):
+        '''Pdf file name, or pdf bytes in memory.'''
+        return self.filename_pdf or self._tmp_pdf or self._stream
+
+
+    def close(self):
+        self._fitz_doc.close()
+        self._remove_tmp_pdf()
+
+
+    def __enter__(self): return self
+
+    def __exit__(self, exc_type, exc_value, traceback): self.close()
+
+    def __del__(self): self._remove_tmp_pdf()
+
+
+    @staticmethod
+    def _stream_buffer(stream):
+        '''Pdf content in memory opened by PyMuPDF without copy, i.e. ``bytes`` or
+        ``memoryview``.
+
+        Args:
+            stream (bytes, buffer, file-like): pdf data, or file-like object read from
+                current position.
+        '''
+        if isinstance(stream, bytes): return stream
+        try:
+            return memoryview(stream)
+        except TypeError: # file-like object
+            return stream.read()
+
 
-    def close(self): self._fitz_doc.close()
+    @staticmethod
+    def _spill_stream(stream):
+        '''Write pdf stream to a temporary file, which is opened by each multi-processing
+        worker from disk through the shared OS page cache.
+
+        Args:
+            stream (bytes, memoryview): pdf data.
+
+        Returns:
+            str: Path of the temporary pdf file.
+        '''
+        fd, filename = tempfile.mkstemp(suffix='.pdf')
+        with os.fdopen(fd, 'wb') as f: f.write(stream)
+        return filename
+
+
+    def _remove_tmp_pdf(self):
+        tmp_pdf = getattr(self, '_tmp_pdf', None) # not set if failed to init
+        if tmp_pdf and os.path.exists(tmp_pdf): os.remove(tmp_pdf)
+        self._tmp_pdf = None
 
 
     @property
@@ -99,6 +161,10 @@ class Converter:
             'lines_right_aligned_threshold'  : 1.0,    # right aligned if d_x1 of two lines is lower than this value (Pt)
             'lines_center_aligned_threshold' : 2.0,    # center aligned if delta center of two lines is lower than this value
             'clip_image_res_ratio'           : 4.0,    # resolution ratio (to 72dpi) when clipping page image
+            'render_scratch_page'            : False,  # render page image from a copy of page, so as not to modify the source pdf
+            'image_max_dpi'                  : 0,      # downsample image to this effective dpi of displayed size; 0 to keep resolution
+            'image_format'                   : None,   # image format: None to keep, 'auto' to select png/jpeg by content, 'png' or 'jpeg'
+            'image_jpeg_quality'             : 85,     # [0,100] quality of jpeg image
             'min_svg_gap_dx'                 : 15.0,   # merge adjacent vector graphics if the horizontal gap is less than this value
             'min_svg_gap_dy'                 : 2.0,    # merge adjacent vector graphics if the vertical gap is less than this value
             'min_svg_w'                      : 2.0,    # ignore vector graphics if the bbox width is less than this value
@@ -109,6 +175,16 @@ class Converter:
             'delete_end_line_hyphen'         : False,  # delete hyphen at the end of a line
             'raw_exceptions'                 : False,  # Don't swallow exceptions
             'list_not_table'                 : True,   # Avoid treating bullet list as table.
+            'clip'                           : None,   # region (x0,y0,x1,y1) of un-rotated page to convert, or {page index: region}; None for entire page
+            'classify_pages'                 : False,  # classify page type, e.g. blank, scanned and text-only page, to skip needless stages
+            'writer'                         : 'python-docx', # docx writer: 'python-docx', or 'stream' for large document
+            'char_style'                     : False,  # share text format of runs by character styles if True
+            'split_every'                    : 0,      # split docx into volumes with this count of pages; 0 to create single docx
+            'split_manifest'                 : False,  # write a manifest listing page range of docx volumes if True
+            'checkpoint_dir'                 : None,   # store parsed pages to this directory, and resume from them when converting again
+            'pipeline'                       : False,  # overlap extracting, analyzing, parsing and creating pages in a pipeline
+            'pipeline_workers'               : (1, 1), # count of workers for analyzing and parsing pages in the pipeline
+            'pipeline_queue_size'            : 4,      # maximum count of pages queued before each pipeline stage
         }
 
     # -----------------------------------------------------------------------
@@ -151,14 +227,10 @@ class Converter:
             elif not self._fitz_doc.authenticate(self.password):
                 raise ConversionException('Incorrect password.')
 
-        # initialize empty pages
+        # initialize pages to parse only
         num = len(self._fitz_doc)
-        self._pages.reset([Page(id=i, skip_parsing=True) for i in range(num)])
-
-        # set pages to parse
         page_indexes = self._page_indexes(start, end, pages, num)
-        for i in page_indexes:
-            self._pages[i].skip_parsing = False
+        self._pages.load(num, page_indexes)
 
         return self
     
@@ -168,9 +240,26 @@ class Converter:
         header/footer and margin.'''
         logging.info(self._color_output('[2/4] Analyzing document...'))
         
+        self._restore_checkpoint(**kwargs)
         self._pages.parse(self.fitz_doc, **kwargs)
         return self
 
+
+    def _restore_checkpoint(self, **kwargs):
+        '''Restore pages parsed already from checkpoint directory, and skip parsing them.'''
+        directory = kwargs.get('checkpoint_dir', None)
+        if not directory:
+            self._checkpoint = None
+            return
+
+        self._checkpoint = Checkpoint.create(directory, self._pdf_source, kwargs)
+        num = 0
+        for page in self._pages:
+            if page.skip_parsing or not self._checkpoint.restore(page): continue
+            page.skip_parsing = True
+            num += 1
+        if num: logging.info('Resume %d pages from checkpoint.', num)
+
     
     def parse_pages(self, **kwargs):
         '''Step 3 of converting process: parse pages, e.g. paragraph, image and table.'''
@@ -183,6 +272,7 @@ class Converter:
             logging.info('(%d/%d) Page %d', i, num_pages, pid)
             try:
                 page.parse(**kwargs)
+                if self._checkpoint: self._checkpoint.save(page)
             except Exception as e:
                 if kwargs['raw_exceptions']:
                     raise
@@ -198,7 +288,8 @@ class Converter:
         '''Step 4 of converting process: create docx file with converted pages.
         
         Args:
-            filename_or_stream (str, file-like): docx file to write.
+            filename_or_stream (str, file-like): docx file to write. The streaming writer
+                writes it progressively, and supports non-seekable stream, e.g. socket.
             kwargs (dict, optional): Configuration parameters.
         '''
         logging.info(self._color_output('[4/4] Creating pages...'))
@@ -210,33 +301,122 @@ class Converter:
         if not parsed_pages:
             raise ConversionException('No parsed pages. Please parse page first.')
 
-        if not filename_or_stream:
-            if self.filename_pdf:
-                filename_or_stream = f'{self.filename_pdf[0:-len(".pdf")]}.docx'
-                # remove existing file
-                if os.path.exists(filename_or_stream): os.remove(filename_or_stream)
-            else:
-                raise ConversionException("Please specify a docx file name or a file-like object to write.")
-
-        # create page by page        
-        docx_file = Document() 
-        num_pages = len(parsed_pages)
-        for i, page in enumerate(parsed_pages, start=1):
-            if not page.finalized: continue # ignore unparsed pages
-            pid = page.id + 1
-            logging.info('(%d/%d) Page %d', i, num_pages, pid)
-            try:
-                page.make_docx(docx_file)
-            except Exception as e:
-                if kwargs['raw_exceptions']:
-                    raise
-                if not kwargs['debug'] and kwargs['ignore_page_error']:
-                    logging.error('Ignore page %d due to making page error: %s', pid, e)
-                else:
-                    raise MakedocxException(f'Error when make page {pid}: {e}')
+        filename_or_stream = self._docx_filename(filename_or_stream)
+
+        # split into volumes
+        if kwargs.get('split_every', 0):
+            self._make_docx_volumes(parsed_pages, filename_or_stream, **kwargs)
+        else:
+            self._make_docx(parsed_pages, filename_or_stream, **kwargs)
+
+
+    def _docx_filename(self, filename_or_stream):
+        '''Default docx filename, i.e. change extension of pdf file, if not specified.'''
+        if filename_or_stream: return filename_or_stream
+        if not self.filename_pdf:
+            raise ConversionException("Please specify a docx file name or a file-like object to write.")
+
+        filename = f'{self.filename_pdf[0:-len(".pdf")]}.docx'
+        # remove existing file
+        if os.path.exists(filename): os.remove(filename)
+        return filename
+
+
+    @staticmethod
+    def _make_docx(pages, filename_or_stream, num_pages:int=None, **kwargs):
+        '''Create docx file with parsed pages, which might be an iterator creating pages
+        progressively, e.g. the pipeline.'''
+        # create page by page
+        writer = kwargs.get('writer', 'python-docx')
+        char_style = kwargs.get('char_style', False)
+        if writer=='python-docx':
+            docx_writer = DocxWriter(char_style=char_style)
+        elif writer=='stream': # write images and the other parts progressively
+            docx_writer = StreamWriter(filename_or_stream, char_style=char_style)
+        else:
+            raise ConversionException(f'Unknown docx writer: {writer}')
+        if num_pages is None: num_pages = len(pages)
+        try:
+            for i, page in enumerate(pages, start=1):
+                if not page.finalized: continue # ignore unparsed pages
+                pid = page.id + 1
+                logging.info('(%d/%d) Page %d', i, num_pages, pid)
+                try:
+                    page.make_docx(docx_writer)
+                except Exception as e:
+                    if kwargs['raw_exceptions']:
+                        raise
+                    if not kwargs['debug'] and kwargs['ignore_page_error']:
+                        logging.error('Ignore page %d due to making page error: %s', pid, e)
+                    else:
+                        raise MakedocxException(f'Error when make page {pid}: {e}')
+
+            # save docx
+            docx_writer.save(filename_or_stream)
+
+        except BaseException:
+            # close the progressively written output and remove the truncated docx file
+            docx_writer.discard()
+            raise
+
+
+    def _make_docx_volumes(self, pages:list, docx_filename:str, **kwargs):
+        '''Create docx volumes with every ``split_every`` parsed pages, e.g. ``demo-001.docx``,
+        ``demo-002.docx``. The volumes are created in parallel processes, and a manifest file
+        ``demo-manifest.json`` listing page range of each volume is written if
+        ``split_manifest=True``.
+        '''
+        if not isinstance(docx_filename, str):
+            raise ConversionException('Please specify a docx file name to split into volumes.')
+
+        # page groups and volume names
+        n = kwargs['split_every']
+        groups = [pages[i:i+n] for i in range(0, len(pages), n)]
+        base = docx_filename[0:-len('.docx')] if docx_filename.endswith('.docx') else docx_filename
+        width = max(3, len(str(len(groups))))
+        filenames = [f'{base}-{i:0{width}d}.docx' for i in range(1, len(groups)+1)]
+
+        # create volumes per process, or from the pages in memory if single process
+        cpu = min(kwargs['cpu_count'] or cpu_count(), len(groups))
+        if cpu>1:
+            vectors = [([page.store() for page in group], filename, kwargs)
+                            for group, filename in zip(groups, filenames)]
+            with Pool(cpu) as pool:
+                pool.map(self._make_docx_per_volume, vectors, 1)
+        else:
+            for group, filename in zip(groups, filenames):
+                self._make_docx(group, filename, **kwargs)
+
+        # manifest: page range of each volume, counted from zero and excluding the end
+        if kwargs.get('split_manifest', False):
+            volumes = [{
+                'docx' : os.path.basename(filename),
+                'start': group[0].id,
+                'end'  : group[-1].id + 1,
+                'pages': len(group)
+            } for group, filename in zip(groups, filenames)]
+            data = {
+                'filename'   : os.path.basename(self.filename_pdf or ''),
+                'split_every': n,
+                'volumes'    : volumes
+            }
+            with open(f'{base}-manifest.json', 'w', encoding='utf-8') as f:
+                f.write(json.dumps(data, indent=4))
+
+
+    @staticmethod
+    def _make_docx_per_volume(vector):
+        '''Create a docx volume with parsed pages.
 
-        # save docx
-        docx_file.save(filename_or_stream)
+        Args:
+            vector (list): A list containing required parameters.
+                * 0  : parsed pages in dict format
+                * 1  : docx filename of the volume
+                * 2  : configuration parameters
+        '''
+        raw_pages, filename, kwargs = vector
+        pages = [Page().restore(raw_page) for raw_page in raw_pages]
+        Converter._make_docx(pages, filename, **kwargs)
 
 
     # -----------------------------------------------------------------------
@@ -246,21 +426,21 @@ class Converter:
     def store(self):
         '''Store parsed pages in dict format.'''
         return {
-            'filename': os.path.basename(self.filename_pdf),
-            'page_cnt': len(self._pages), # count of all pages
+            'filename': os.path.basename(self.filename_pdf or ''),
+            'page_cnt': self._pages.num_pages, # count of all pages
             'pages'   : [page.store() for page in self._pages if page.finalized], # parsed pages only
         }
 
 
     def restore(self, data:dict):
         '''Restore pages from parsed results.'''
-        # init empty pages if necessary
-        if not self._pages:
-            num = data.get('page_cnt', 100)
-            self._pages.reset([Page(id=i, skip_parsing=True) for i in range(num)])
+        # init empty pages to restore
+        raw_pages = data.get('pages', [])
+        self._pages.load(data.get('page_cnt', 100),
+                         [raw_page.get('id', -1) for raw_page in raw_pages], skip_parsing=True)
         
         # restore pages
-        for raw_page in data.get('pages', []):
+        for raw_page in raw_pages:
             idx = raw_page.get('id', -1)
             self._pages[idx].restore(raw_page)
 
@@ -351,6 +531,8 @@ class Converter:
         # convert page by page
         if settings['multi_processing']:
             self._convert_with_multi_processing(docx_filename, start, end, **settings)
+        elif settings['pipeline']:
+            self._convert_with_pipeline(docx_filename, start, end, pages, **settings)
         else:
             self.parse(start, end, pages, **settings).make_docx(docx_filename, **settings)
 
@@ -389,10 +571,20 @@ class Converter:
 
             https://pymupdf.readthedocs.io/en/latest/faq.html#multiprocessing
         '''
+        # workers open pdf by file name: spill pdf stream to a temporary file once, rather
+        # than pickling a copy for each process
+        if not self.filename_pdf and not self._tmp_pdf:
+            self._tmp_pdf = self._spill_stream(self._stream)
+        pdf_filename = self.filename_pdf or self._tmp_pdf
+
+        # create checkpoint before the workers restoring and storing pages with it
+        if kwargs.get('checkpoint_dir', None):
+            Checkpoint.create(kwargs['checkpoint_dir'], pdf_filename, kwargs)
+
         # make vectors of arguments for the processes
         cpu = min(kwargs['cpu_count'], cpu_count()) if kwargs['cpu_count'] else cpu_count()        
         prefix = 'pages' # json file writing parsed pages per process
-        vectors = [(i, cpu, start, end, self.filename_pdf, self.password, 
+        vectors = [(i, cpu, start, end, pdf_filename, self.password, 
                             kwargs, f'{prefix}-{i}.json') for i in range(cpu)]
 
         # start parsing processes
@@ -410,6 +602,91 @@ class Converter:
         self.make_docx(docx_filename, **kwargs)
 
 
+    def _convert_with_pipeline(self, docx_filename, start:int, end:int, pages:list, **kwargs):
+        '''Parse and create pages in a pipeline, where the stages of different pages overlap:
+        extracting page k+1, analyzing and parsing page k, and creating docx of page k-1.
+
+        * Bounded queues between stages limit the count of pages in memory.
+        * Extracting and creating docx run with one worker, since neither ``fitz.Document``
+          nor docx is thread-safe.
+        * Analyzing and parsing run with ``pipeline_workers`` threads. Pages are independent
+          in parallel threads, since the elements keep bbox cache per page, and the rotation
+          matrix of each page is set to the thread working on it.
+        * Document level analysis works on the pages in the pipeline individually.
+        '''
+        self.load_pages(start, end, pages)
+        self._restore_checkpoint(**kwargs)
+        all_pages = [page for page in self._pages if page.finalized or not page.skip_parsing]
+        pages = [page for page in all_pages if not page.skip_parsing]
+
+        # plotting layout to debug pdf isn't thread-safe
+        if kwargs['debug']:
+            logging.warning('Parse pages in sequence due to debug mode.')
+            self.parse_document(**kwargs).parse_pages(**kwargs).make_docx(docx_filename, **kwargs)
+            return
+
+        logging.info(self._color_output('Parsing and creating pages in pipeline...'))
+        fonts = Fonts.extract(self._fitz_doc, [page.id for page in pages])
+
+        # elements are created with the rotation matrix of current thread, so pass the matrix
+        # along with page and set it before working on the page in each stage
+        def extract(page):
+            raw_page = Pages.extract_page(page, self._fitz_doc, fonts, **kwargs)
+            return page, raw_page, self._fitz_doc[page.id].rotation_matrix
+
+        def analyze(args):
+            page, raw_page, matrix = args
+            Element.set_rotation_matrix(matrix)
+            Pages.analyze_page(page, raw_page, **kwargs)
+            return page, matrix
+
+        def parse(args):
+            page, matrix = args
+            Element.set_rotation_matrix(matrix)
+            page.parse(**kwargs)
+            if self._checkpoint: self._checkpoint.save(page)
+            return page
+
+        num_analyze, num_parse = kwargs['pipeline_workers']
+        pipeline = Pipeline([
+            ('extract', extract, 1),
+            ('analyze', analyze, num_analyze),
+            ('parse'  , parse,   num_parse)
+        ], maxsize=kwargs['pipeline_queue_size'], final='make_docx')
+
+        def parsed_pages():
+            results = pipeline.run(pages)
+            num = 0
+            for page in all_pages:
+                # pages restored from checkpoint
+                if page.skip_parsing:
+                    num += 1
+                    yield page
+                    continue
+                page, _, error = next(results)
+                if error is None:
+                    num += 1
+                    yield page
+                    continue
+                pid = page.id + 1
+                if kwargs['raw_exceptions']:
+                    raise error
+                if not kwargs['debug'] and kwargs['ignore_page_error']:
+                    logging.error('Ignore page %d due to parsing page error: %s', pid, error)
+                else:
+                    raise ConversionException(f'Error when parsing page {pid}: {error}')
+
+            # same to make_docx: no docx for nothing parsed
+            if not num: raise ConversionException('No parsed pages. Please parse page first.')
+
+        filename = self._docx_filename(docx_filename)
+        if kwargs.get('split_every', 0):
+            self._make_docx_volumes(list(parsed_pages()), filename, **kwargs)
+        else:
+            self._make_docx(parsed_pages(), filename, num_pages=len(all_pages), **kwargs)
+        pipeline.report()
+
+
     @staticmethod
     def _parse_pages_per_cpu(vector):
         '''Render a page range of a document.
@@ -427,10 +704,8 @@ class Converter:
         # recreate the arguments
         idx, cpu, s, e, pdf_filename, password, kwargs, json_filename = vector
 
-        # open pdf to get page count: all pages are marked to parse temporarily 
-        # since don't know which pages to parse for this moment
+        # open pdf to get page count
         cv = Converter(pdf_filename, password)
-        cv.load_pages()
 
         # the specified pages to process
         e = e or len(cv.fitz_doc)
@@ -445,13 +720,13 @@ class Converter:
         seg_to = min(seg_from + seg_size, num_pages)
         page_indexes = [all_indexes[i] for i in range(seg_from, seg_to)]
 
-        # now, mark the right pages
-        for page in cv.pages: page.skip_parsing = True
-        for i in page_indexes: 
-            cv.pages[i].skip_parsing = False
+        if not page_indexes:
+            cv.close()
+            return
 
         # parse pages and serialize data for further processing
-        cv.parse_document(**kwargs) \
+        cv.load_pages(pages=page_indexes) \
+            .parse_document(**kwargs) \
             .parse_pages(**kwargs) \
             .serialize(json_filename)
         cv.close()
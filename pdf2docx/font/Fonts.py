@@ -56,15 +56,21 @@ class Fonts(BaseCollection):
 
 
     @classmethod
-    def extract(cls, fitz_doc):
+    def extract(cls, fitz_doc, page_indexes:list=None):
         '''Extract fonts from PDF and get properties.
         * Only embedded fonts (v.s. the base 14 fonts) can be extracted.
         * The extracted fonts may be invalid due to reason from PDF file itself.
+
+        Args:
+            fitz_doc (fitz.Document): ``PyMuPDF`` Document instance.
+            page_indexes (list, optional): Extract fonts used by these pages only. Defaults to
+                None, i.e. all pages.
         '''
         # get unique font references
+        if page_indexes is None: page_indexes = range(len(fitz_doc))
         xrefs = set()
-        for page in fitz_doc:
-            for f in page.get_fonts(): xrefs.add(f[0])
+        for i in page_indexes:
+            for f in fitz_doc.get_page_fonts(i): xrefs.add(f[0])
 
         # process xref one by one
         fonts = []
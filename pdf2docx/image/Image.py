@@ -10,6 +10,7 @@ Data structure defined in link https://pymupdf.readthedocs.io/en/latest/textpage
         'width': w,
         'height': h,
         'image': b'',
+        'rotation': 0, # clockwise rotation angle to show the image, a multiple of 90
 
         # --- discard properties ---
         'ext': 'png',
@@ -19,8 +20,6 @@ Data structure defined in link https://pymupdf.readthedocs.io/en/latest/textpage
 '''
 
 import base64
-from io import BytesIO
-from ..common import docx
 from ..common.Element import Element
 
 
@@ -37,6 +36,7 @@ class Image(Element):
         # - base64 encoded string restored from json file -> encode to bytes and decode with base64 -> image bytes 
         image = raw.get('image', b'')
         self.image = image if isinstance(image, bytes) else base64.b64decode(image.encode())
+        self.rotation = raw.get('rotation', 0)
         
         super().__init__(raw)
 
@@ -56,6 +56,7 @@ class Image(Element):
         self.width = image.width
         self.height = image.height
         self.image = image.image
+        self.rotation = image.rotation
         self.update_bbox(image.bbox)
         return self
 
@@ -70,7 +71,8 @@ class Image(Element):
         res.update({
             'width': self.width,
             'height': self.height,
-            'image': base64.b64encode(self.image).decode() # serialize image with base64
+            'image': base64.b64encode(self.image).decode(), # serialize image with base64
+            'rotation': self.rotation
         })
 
         return res
@@ -88,7 +90,7 @@ class Image(Element):
         super().plot(page, stroke=color)
 
 
-    def make_docx(self, paragraph):
-        '''Add image span to a docx paragraph.'''
+    def make_docx(self, writer):
+        '''Add image span to last docx paragraph.'''
         # add image
-        docx.add_image(paragraph, BytesIO(self.image), self.bbox.x0, self.bbox.y0, self.bbox.x1-self.bbox.x0, self.bbox.y1-self.bbox.y0)
\ No newline at end of file
+        writer.add_image(self.image, self.bbox.x0, self.bbox.y0, self.bbox.x1-self.bbox.x0, self.bbox.y1-self.bbox.y0, self.rotation)
\ No newline at end of file
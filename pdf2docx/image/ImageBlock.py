@@ -5,13 +5,11 @@
 **The raw image block will be merged into TextBlock > Line > Span.**
 '''
 
-from io import BytesIO
 from ..text.Line import Line
 from ..text.TextBlock import TextBlock
 from .Image import Image
 from .ImageSpan import ImageSpan
 from ..common.Block import Block
-from ..common.docx import add_float_image
 
 
 class ImageBlock(Image, Block):
@@ -64,18 +62,17 @@ class ImageBlock(Image, Block):
         super().plot(page, color=(1,0,0))
 
 
-    def make_docx(self, p):
+    def make_docx(self, writer):
         '''Create floating image behind text. 
         
         Args:
-            p (Paragraph): ``python-docx`` paragraph instance.
+            writer (BaseWriter): Docx writer.
         
         .. note::
             Inline image is created within TextBlock.
         '''
         if self.is_float_image_block:
             x0, y0, x1, y1 = self.bbox
-            add_float_image(p, BytesIO(self.image), width=x1-x0, pos_x=x0, pos_y=y0)
+            writer.add_float_image(self.image, x0, y0, width=x1-x0, rotation=self.rotation)
         else:
-            super().make_docx(p)
-        return p
\ No newline at end of file
+            super().make_docx(writer)
\ No newline at end of file
@@ -0,0 +1,138 @@
+'''Output policy of extracted images: downsampling and format selection.
+
+Images are extracted at the source resolution, and vector graphics are clipped at a fixed
+resolution ratio, regardless of the displayed size in page. The policy stage works on the
+image raw dicts between extraction and creating docx:
+
+* downsample image to a maximum effective DPI, which is calculated from the image size in
+  pixel and the displayed size of the image bbox;
+* select JPEG or PNG format by content, e.g. photo in JPEG, while line art or image with
+  alpha channel in PNG.
+
+The images are decoded, resized and encoded with ``opencv``, which releases GIL, so the
+images of a page are processed in the thread pool shared in current process.
+'''
+
+import numpy as np
+import cv2 as cv
+from ..common.share import thread_pool
+
+
+class ImagePolicy:
+    '''Downsample and re-encode image raw dicts.'''
+
+    FORMATS = (None, 'auto', 'png', 'jpeg')
+
+    def __init__(self, max_dpi:float=0, image_format:str=None, jpeg_quality:int=85):
+        '''
+        Args:
+            max_dpi (float, optional): Downsample image if its effective DPI exceeds this value.
+                Defaults to 0, i.e. keep the source resolution.
+            image_format (str, optional): Output image format. ``None`` to keep the extracted
+                format; ``auto`` to select JPEG for photo and PNG for the others; ``png`` or
+                ``jpeg`` to use the specified format. Image with alpha channel is always
+                stored in PNG format. Defaults to None.
+            jpeg_quality (int, optional): JPEG quality in range [0, 100]. Defaults to 85.
+        '''
+        if image_format not in self.FORMATS:
+            raise ValueError(f'Unsupported image format: {image_format}')
+        self.max_dpi = max_dpi
+        self.image_format = image_format
+        self.jpeg_quality = jpeg_quality
+
+
+    @property
+    def is_active(self):
+        '''Whether the images are processed by this policy.'''
+        return bool(self.max_dpi) or self.image_format is not None
+
+
+    def apply(self, images:list):
+        '''Process image raw dicts in place.
+
+        Args:
+            images (list): A list of image raw dict, with keys ``bbox``, ``width``, ``height``
+                and ``image``.
+        '''
+        if not self.is_active or not images: return
+        if len(images)==1:
+            self.process(images[0])
+        else:
+            list(thread_pool().map(self.process, images))
+
+
+    def process(self, image:dict):
+        '''Downsample and re-encode an image raw dict in place. Keep the source image if
+        neither resolution nor format is changed, or the processed image is not smaller.'''
+        data = image['image']
+        src_format = self._image_format(data)
+        if src_format is None: return
+
+        img = cv.imdecode(np.frombuffer(data, np.uint8), cv.IMREAD_UNCHANGED)
+        if img is None: return
+        if img.dtype!=np.uint8: img = (img // 257).astype(np.uint8) # 16-bit channels
+
+        # downsample to the maximum effective DPI
+        h, w = img.shape[:2]
+        x0, y0, x1, y1 = image['bbox']
+        scale = self._scale(w, h, x1-x0, y1-y0)
+        if scale < 1.0:
+            size = (max(round(w*scale), 1), max(round(h*scale), 1))
+            img = cv.resize(img, size, interpolation=cv.INTER_AREA)
+
+        # select format
+        alpha = img.ndim==3 and img.shape[2]==4
+        if alpha:
+            dst_format = 'png'
+        elif self.image_format=='auto':
+            dst_format = 'jpeg' if src_format=='jpeg' or self._is_photo(img) else 'png'
+        else:
+            dst_format = self.image_format or src_format
+
+        if scale>=1.0 and dst_format==src_format: return
+
+        # encode
+        if dst_format=='jpeg':
+            _, buf = cv.imencode('.jpg', img, [cv.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        else:
+            _, buf = cv.imencode('.png', img, [cv.IMWRITE_PNG_COMPRESSION, 6])
+
+        # e.g. downsampled line art with more colors due to interpolation
+        if buf.nbytes >= len(data): return
+
+        image['image'] = buf.tobytes()
+        image['height'], image['width'] = img.shape[:2]
+
+
+    def _scale(self, w:int, h:int, width:float, height:float):
+        '''Scale factor to downsample image with pixel size ``(w, h)`` displayed in size
+        ``(width, height)`` in Pt. Take the longer side, so it's independent of rotation.'''
+        if not self.max_dpi: return 1.0
+        size = max(width, height) / 72.0 # inch
+        if size<=0: return 1.0
+        dpi = max(w, h) / size
+        return min(self.max_dpi/dpi, 1.0)
+
+
+    @staticmethod
+    def _image_format(data:bytes):
+        '''Format of image bytes: ``png``, ``jpeg`` or None if not supported.'''
+        if data[:8]==b'\x89PNG\r\n\x1a\n': return 'png'
+        if data[:3]==b'\xff\xd8\xff': return 'jpeg'
+        return None
+
+
+    @staticmethod
+    def _is_photo(img:np.ndarray, threshold:float=0.5):
+        '''Whether the image is a photo rather than line art, e.g. text, chart and diagram.
+
+        Line art consists of large flat regions, so most pixels have the same color as the
+        right neighbor; while it's rare for photo with continuous tone and noise.
+        '''
+        # sample at most 256 rows
+        step = max(img.shape[0]//256, 1)
+        sample = img[::step]
+        if sample.shape[1] < 2: return False
+        same = sample[:, 1:]==sample[:, :-1]
+        if same.ndim==3: same = same.all(axis=2)
+        return same.mean() < threshold
@@ -11,21 +11,77 @@ Both raster images and vector graphics are considered:
 import logging
 import math
 import fitz
+from docx.image.exceptions import UnrecognizedImageError
+from docx.image.image import Image as DocxImage
 from ..common.Collection import Collection
-from ..common.share import BlockType
+from ..common.share import BlockType, thread_pool
 from ..common.algorithm import recursive_xy_cut, inner_contours, xy_project_profile
+from ..common import raster
+from .RenderContext import RenderContext
+
+
+# JFIF APP0 marker: version 1.01, no density unit, 1:1 pixel aspect ratio, no thumbnail
+_JFIF_MARKER = b"\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+
+
+class PendingImage:
+    """Pixmap recorded in extraction, and encoded to PNG image in a deferred stage, i.e.
+    :py:meth:`ImagesExtractor.encode_images`.
+
+    ``PyMuPDF`` holds GIL when encoding pixmap, so the pixel data is encoded by ``opencv``
+    instead, which releases GIL and works in a thread pool.
+    """
+
+    __slots__ = ("_pixmap", "_samples", "_alpha", "rotation")
+
+    def __init__(self, pixmap: fitz.Pixmap, rotation: int = 0):
+        """
+        Args:
+            pixmap (fitz.Pixmap): Pixmap in gray or RGB color space, with alpha or not.
+            rotation (int, optional): Rotate image by this angle when encoding.
+        """
+        self._pixmap = pixmap  # keep pixmap alive since the samples are not copied
+        self._samples = raster.pixmap_to_array(pixmap)
+        self._alpha = bool(pixmap.alpha)
+        self.rotation = rotation
+
+    def encode(self):
+        """Encode pixmap to PNG image bytes. No ``PyMuPDF`` is called, so it's safe to run in
+        other threads."""
+        import cv2 as cv
+
+        if self.rotation:
+            # rotated image is in BGR color space without alpha channel
+            img = raster.samples_to_cv_image(self._samples, self._alpha, cv.IMREAD_COLOR)
+            img = ImagesExtractor._rotate_image(img, self.rotation)
+        else:
+            img = raster.samples_to_cv_image(self._samples, self._alpha, cv.IMREAD_UNCHANGED)
+
+        _, buf = cv.imencode(".png", img, [cv.IMWRITE_PNG_COMPRESSION, 3])
+        return buf.tobytes()
 
 
 class ImagesExtractor:
     """Extract images from PDF."""
 
-    def __init__(self, page: fitz.Page) -> None:
+    def __init__(
+        self, page: fitz.Page, context: RenderContext = None, clip: fitz.Rect = None
+    ) -> None:
         """Extract images from PDF page.
 
         Args:
             page (fitz.Page): pdf page to extract images.
+            context (RenderContext, optional): Render context shared by the extractors of
+                this page. Defaults to None, i.e. create a context restored after each
+                rendering.
+            clip (fitz.Rect, optional): Region of interest in un-rotated page CS. Images
+                out of this region are ignored, and page is rendered within this region.
+                Defaults to None, i.e. entire page.
         """
         self._page = page
+        self._clip = None if clip is None else fitz.Rect(clip)
+        self._own_context = context is None
+        self._context = context or RenderContext(page)
 
     def clip_page_to_pixmap(
         self, bbox: fitz.Rect = None, rm_image: bool = False, zoom: float = 3.0
@@ -42,11 +98,7 @@ class ImagesExtractor:
         Returns:
             fitz.Pixmap: The extracted pixmap.
         """
-        # hide text and images
-        stream_dict = self._hide_page_text_and_images(
-            self._page, rm_text=True, rm_image=rm_image
-        )
-
+        bbox = self._clip_bbox(bbox)
         if bbox is None:
             clip_bbox = self._page.rect
 
@@ -59,16 +111,16 @@ class ImagesExtractor:
 
         clip_bbox = self._page.rect & clip_bbox
 
-        # improve resolution
+        # render with text and images hidden, and improve resolution
         # - https://pymupdf.readthedocs.io/en/latest/faq.html#how-to-increase-image-resolution
         # - https://github.com/pymupdf/PyMuPDF/issues/181
-        matrix = fitz.Matrix(zoom, zoom)
-        pix = self._page.get_pixmap(clip=clip_bbox, matrix=matrix)  # type: fitz.Pixmap
+        pix = self._context.get_pixmap(
+            clip_bbox, zoom=zoom, rm_text=True, rm_image=rm_image
+        )  # type: fitz.Pixmap
 
-        # recovery page if hide text
-        doc = self._page.parent
-        for xref, stream in stream_dict.items():
-            doc.update_stream(xref, stream)
+        # recovery page if the context isn't shared
+        if self._own_context:
+            self._context.restore()
 
         return pix
 
@@ -77,6 +129,7 @@ class ImagesExtractor:
         bbox: fitz.Rect = None,
         rm_image: bool = False,
         clip_image_res_ratio: float = 3.0,
+        encode: bool = True,
     ):
         """Clip page pixmap (without text) according to ``bbox`` and convert to source image.
 
@@ -85,14 +138,26 @@ class ImagesExtractor:
             rm_image (bool): remove images or not.
             clip_image_res_ratio (float, optional): Resolution ratio of clipped bitmap.
                 Defaults to 3.0.
+            encode (bool, optional): Encode the image before returning. Defaults to True.
+                Otherwise, the image is pending to encode by :py:meth:`encode_images`.
 
         Returns:
-            list: A list of image raw dict.
+            dict: Image raw dict.
         """
+        bbox = self._clip_bbox(bbox)
         pix = self.clip_page_to_pixmap(
             bbox=bbox, rm_image=rm_image, zoom=clip_image_res_ratio
         )
-        return self._to_raw_dict(pix, bbox)
+        raw_dict = self._to_raw_dict(pix, bbox)
+        if encode:
+            self.encode_images([raw_dict])
+        return raw_dict
+
+    def _clip_bbox(self, bbox: fitz.Rect):
+        """Restrict ``bbox`` to the region of interest."""
+        if self._clip is None:
+            return bbox
+        return fitz.Rect(self._clip) if bbox is None else self._clip & bbox
 
     @staticmethod
     def _get_image_rotation(matrix) -> int:
@@ -112,12 +177,15 @@ class ImagesExtractor:
         angle_deg = round(math.degrees(angle_rad) / 90) * 90
         return int(angle_deg % 360)
 
-    def extract_images(self, clip_image_res_ratio: float = 3.0):
+    def extract_images(self, clip_image_res_ratio: float = 3.0, encode: bool = True):
         """Extract normal images with ``Page.get_images()``.
 
         Args:
             clip_image_res_ratio (float, optional): Resolution ratio of clipped bitmap.
                 Defaults to 3.0.
+            encode (bool, optional): Encode the images before returning. Defaults to True.
+                Otherwise, the images are pending to encode by :py:meth:`encode_images`, e.g.
+                along with the other images of the page.
 
         Returns:
             list: A list of extracted and recovered image raw dict.
@@ -152,6 +220,8 @@ class ImagesExtractor:
             except (TypeError, AttributeError):
                 pass
             unrotated_page_bbox = self._page.cropbox  # note the difference to page.rect
+            if self._clip is not None:
+                unrotated_page_bbox = unrotated_page_bbox & self._clip
             for i, bbox in enumerate(rects):
                 # ignore small images
                 if bbox.get_area() <= 4:
@@ -184,7 +254,7 @@ class ImagesExtractor:
                 for bbox, item, _ in group:
                     clip_bbox |= bbox
                 raw_dict = self.clip_page_to_dict(
-                    clip_bbox, False, clip_image_res_ratio
+                    clip_bbox, False, clip_image_res_ratio, encode=False
                 )
 
             else:
@@ -208,26 +278,37 @@ class ImagesExtractor:
                 # (22, 25, 1265, 1303, 8, 'DeviceGray', '', 'Im4', 'DCTDecode', 0)
                 # (23, 0, 1731, 1331, 8, 'DeviceGray', '', 'Im5', 'DCTDecode', 0)
                 if item[5] == "":
-                    raw_dict = self.clip_page_to_dict(bbox, False, clip_image_res_ratio)
+                    raw_dict = self.clip_page_to_dict(
+                        bbox, False, clip_image_res_ratio, encode=False
+                    )
 
                 # normal images
                 else:
-                    # recover image, e.g., handle image with mask, or CMYK color space
-                    pix = self._recover_pixmap(doc, item)
-
                     # rotate image: apply inverse of per-image transform, then page rotation
                     # (PyMuPDF matrix maps image->page; correct pixmap with inverse: apply -angle)
-                    raw_dict = self._to_raw_dict(pix, bbox)
                     total_rotation = (rotation or 0) - image_rotation
-                    if total_rotation:
-                        raw_dict["image"] = self._rotate_image(pix, total_rotation)
+
+                    # embed original JPEG stream, and rotate it in docx if necessary
+                    raw_dict = self._to_jpeg_raw_dict(doc, item, bbox, -total_rotation % 360)
+                    if raw_dict is None:
+                        # recover image, e.g., handle image with mask, or CMYK color space
+                        pix = self._recover_pixmap(doc, item)
+                        raw_dict = self._to_raw_dict(pix, bbox)
+                        raw_dict["image"].rotation = total_rotation
 
             images.append(raw_dict)
 
+        if encode:
+            self.encode_images(images)
         return images
 
     def detect_svg_contours(
-        self, min_svg_gap_dx: float, min_svg_gap_dy: float, min_w: float, min_h: float
+        self,
+        min_svg_gap_dx: float,
+        min_svg_gap_dy: float,
+        min_w: float,
+        min_h: float,
+        bbox: fitz.Rect = None,
     ):
         """Find contour of potential vector graphics.
 
@@ -236,6 +317,7 @@ class ImagesExtractor:
             min_svg_gap_dy (float): Merge svg if the vertical gap is less than this value.
             min_w (float): Ignore contours if the bbox width is less than this value.
             min_h (float): Ignore contours if the bbox height is less than this value.
+            bbox (fitz.Rect, optional): Target area to detect. Defaults to None, i.e. entire page.
 
         Returns:
             list: A list of potential svg region: (external_bbox, inner_bboxes:list).
@@ -243,8 +325,8 @@ class ImagesExtractor:
         import cv2 as cv
 
         # clip page and convert to opencv image
-        pixmap = self.clip_page_to_pixmap(rm_image=True, zoom=1.0)
-        src = self._pixmap_to_cv_image(pixmap)
+        pixmap = self.clip_page_to_pixmap(bbox=bbox, rm_image=True, zoom=1.0)
+        src = raster.pixmap_to_cv_image(pixmap)
 
         # gray and binary
         gray = cv.cvtColor(src, cv.COLOR_BGR2GRAY)
@@ -283,8 +365,35 @@ class ImagesExtractor:
             cv.imshow("img", src)
             cv.waitKey(0)
 
+        # shift to page pixels if clipped: the pixmap origin is the top-left corner of clip area
+        dx, dy = pixmap.x, pixmap.y
+        if dx or dy:
+            shift = lambda rect: (rect[0]+dx, rect[1]+dy, rect[2]+dx, rect[3]+dy)
+            groups = [(shift(bbox), [shift(rect) for rect in inner_bboxes])
+                        for bbox, inner_bboxes in groups]
+
         return groups
 
+    @staticmethod
+    def encode_images(images: list):
+        """Encode the pending pixmaps of image raw dicts to PNG images in place, with the
+        thread pool shared in current process, i.e. :py:func:`~pdf2docx.common.share.thread_pool`.
+
+        The pixmaps are recorded in extraction, e.g. :py:meth:`extract_images` and
+        :py:meth:`clip_page_to_dict`, so that all images of a page are encoded concurrently.
+
+        Args:
+            images (list): A list of image raw dict.
+        """
+        pending = [raw for raw in images if isinstance(raw["image"], PendingImage)]
+        if len(pending) > 1:
+            data = list(thread_pool().map(lambda raw: raw["image"].encode(), pending))
+        else:
+            data = [raw["image"].encode() for raw in pending]
+
+        for raw, image in zip(pending, data):
+            raw["image"] = image
+
     @staticmethod
     def _to_raw_dict(image: fitz.Pixmap, bbox: fitz.Rect):
         """Store Pixmap ``image`` to raw dict.
@@ -294,7 +403,7 @@ class ImagesExtractor:
             bbox (fitz.Rect): Boundary box the pixmap.
 
         Returns:
-            dict: Raw dict of the pixmap.
+            dict: Raw dict of the pixmap, where the image is pending to encode.
         """
         """
         if image.colorspace.n > 3: # must convert: we only support PNG image with alpha channel
@@ -327,24 +436,96 @@ class ImagesExtractor:
             "bbox": tuple(bbox),
             "width": image.width,
             "height": image.height,
-            "image": image.tobytes(),
+            "image": PendingImage(image),
+        }
+
+    @staticmethod
+    def _to_jpeg_raw_dict(doc: fitz.Document, item: list, bbox: fitz.Rect, rotation: int):
+        """Store the original JPEG stream of an image to raw dict, which avoids decoding and
+        re-encoding the image to PNG.
+
+        Only the JPEG image shown as it is applies, i.e. no soft mask, no ``/Mask`` (stencil
+        or color key masking), no ``/Decode`` array and a gray or RGB color space; besides,
+        the JPEG header must be supported by ``python-docx``. The rotation is kept in the raw
+        dict and applied by the docx drawing.
+
+        Args:
+            doc (fitz.Document): pdf document.
+            item (list): image instance of ``page.get_images()``.
+            bbox (fitz.Rect): Boundary box of the image.
+            rotation (int): Clockwise rotation angle, a multiple of 90, to show the image.
+
+        Returns:
+            dict: Raw dict of the image, or None if the original stream doesn't apply.
+        """
+        # (xref, smask, width, height, bpc, colorspace, alt. colorspace, name, filter, ...)
+        xref, smask, cs, filter_ = item[0], item[1], item[5], item[8]
+        if smask or filter_ != "DCTDecode" or cs not in ("DeviceGray", "DeviceRGB", "ICCBased"):
+            return None
+
+        if doc.xref_get_key(xref, "Mask")[0] != "null" or \
+            doc.xref_get_key(xref, "Decode")[0] != "null" or \
+            doc.xref_get_key(xref, "DecodeParms")[0] != "null":
+            return None
+
+        image = doc.extract_image(xref)
+        if not image or image["ext"] != "jpeg" or image["colorspace"] not in (1, 3):
+            return None
+
+        data = ImagesExtractor._add_jfif_marker(image["image"], image["colorspace"])
+        if data is None:
+            return None
+
+        return {
+            "type": BlockType.IMAGE.value,
+            "bbox": tuple(bbox),
+            "width": image["width"],
+            "height": image["height"],
+            "image": data,
+            "rotation": rotation,
         }
 
     @staticmethod
-    def _rotate_image(pixmap: fitz.Pixmap, rotation: int):
-        """Rotate image represented by image bytes.
+    def _add_jfif_marker(data: bytes, n: int):
+        """Make JPEG image recognizable by ``python-docx``, which requires a JFIF or Exif
+        marker after the SOI marker.
+
+        A JFIF marker is inserted to JPEG image with Adobe marker only, which is common in
+        PDF, as long as JFIF is consistent with the color transform, i.e. gray or YCbCr.
 
         Args:
-            pixmap (fitz.Pixmap): Image to rotate.
+            data (bytes): JPEG image.
+            n (int): Count of color components.
+
+        Returns:
+            bytes: JPEG image recognized by ``python-docx``, or None if not supported.
+        """
+        # SOI + APP14: FFD8 FFEE length(2) "Adobe" version(2) flags0(2) flags1(2) transform(1)
+        if data[2:4] == b"\xff\xee" and data[6:11] == b"Adobe":
+            transform = data[17] if len(data) > 17 else -1
+            if n == 3 and transform != 1:
+                return None
+            data = data[:2] + _JFIF_MARKER + data[2:]
+
+        try:
+            DocxImage.from_blob(data)
+        except UnrecognizedImageError:
+            return None
+        return data
+
+    @staticmethod
+    def _rotate_image(img, rotation: int):
+        """Rotate opencv image.
+
+        Args:
+            img (numpy.ndarray): Opencv image to rotate.
             rotation (int): Rotation angle.
 
-        Return: image bytes.
+        Return: rotated opencv image.
         """
         import cv2 as cv
         import numpy as np
 
-        # convert to opencv image
-        img = ImagesExtractor._pixmap_to_cv_image(pixmap)
         h, w = img.shape[:2]  # get image height, width
 
         # calculate the center of the image
@@ -369,68 +550,7 @@ class ImagesExtractor:
         matrix[1, 2] += (H / 2) - y0
 
         # perform the rotation holding at the center
-        rotated_img = cv.warpAffine(img, matrix, (W, H))
-
-        # convert back to bytes
-        _, im_png = cv.imencode(".png", rotated_img)
-        return im_png.tobytes()
-
-    @staticmethod
-    def _hide_page_text_and_images(page: fitz.Page, rm_text: bool, rm_image: bool):
-        """Hide page text and images."""
-        # NOTE: text might exist in both content stream and form object stream
-        # - content stream, i.e. direct page content
-        # - form object, i.e. contents referenced by this page
-        xref_list = [xref for (xref, name, invoker, bbox) in page.get_xobjects()]
-        xref_list.extend(page.get_contents())
-
-        # (1) hide text
-        # render Tr: set the text rendering mode
-        # - 3: neither fill nor stroke the text -> invisible
-        # read more:
-        # - https://github.com/pymupdf/PyMuPDF/issues/257
-        # - https://www.adobe.com/content/dam/acom/en/devnet/pdf/pdfs/pdf_reference_archives/PDFReference.pdf
-        def hide_text(stream):
-            res = stream
-            found = False
-            # set 3 Tr to text block
-            for k in ["BT", "Tm", "Td", "2 Tr"]:
-                bk = k.encode()
-                if bk in stream:
-                    found = True
-                    res = res.replace(bk, f"{k} 3 Tr".encode())
-            return res, found
-
-        # (2) hide image
-        # https://github.com/pymupdf/PyMuPDF/issues/338
-        def hide_images(stream):
-            res = stream
-            found = False
-            # image names, e.g. [[270, 0, 261, 115, 8, 'DeviceRGB', '', 'Im1', 'DCTDecode']]
-            img_names = [item[7] for item in page.get_images(full=True)]
-            for k in img_names:
-                bk = f"/{k} Do".encode()
-                if bk in stream:
-                    found = True
-                    res = res.replace(bk, b"")
-            return res, found
-
-        doc = page.parent  # type: fitz.Document
-        source = {}
-        for xref in xref_list:
-            src = doc.xref_stream(xref)
-
-            # try to hide text
-            stream, found_text = hide_text(src) if rm_text else (src, False)
-
-            # try to hide images
-            stream, found_images = hide_images(stream) if rm_image else (stream, False)
-
-            if found_text or found_images:
-                doc.update_stream(xref, stream)
-                source[xref] = src  # save original stream
-
-        return source
+        return cv.warpAffine(img, matrix, (W, H))
 
     @staticmethod
     def _recover_pixmap(doc: fitz.Document, item: list):
@@ -481,16 +601,3 @@ class ImagesExtractor:
             pix = fitz.Pixmap(fitz.csRGB, pix)
 
         return pix
-
-    @staticmethod
-    def _pixmap_to_cv_image(pixmap: fitz.Pixmap):
-        """Convert fitz Pixmap to opencv image.
-
-        Args:
-            pixmap (fitz.Pixmap): PyMuPDF Pixmap.
-        """
-        import cv2 as cv
-        import numpy as np
-
-        img_byte = pixmap.tobytes()
-        return cv.imdecode(np.frombuffer(img_byte, np.uint8), cv.IMREAD_COLOR)
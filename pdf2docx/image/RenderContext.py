@@ -0,0 +1,143 @@
+'''Render page with text and/or images hidden, e.g. clip vector graphics to bitmap.
+
+Text and images are hidden by modifying the content streams of page and its form objects:
+
+* text: set text rendering mode ``3 Tr``, i.e. neither fill nor stroke the text;
+* image: remove the image drawing operator, e.g. ``/Im1 Do``.
+
+A page is rendered several times when parsing, e.g. image groups, alpha-only images and
+vector graphics. So the source and modified streams are calculated once and cached per
+page, and the modified streams are kept applied until the render mode changes or the
+context is restored. Optionally, render from a scratch copy of page, so that the source
+document is never modified.
+
+References:
+
+* https://github.com/pymupdf/PyMuPDF/issues/257
+* https://github.com/pymupdf/PyMuPDF/issues/338
+'''
+
+import fitz
+
+
+class RenderContext:
+    '''Render context of a page, caching content streams with text and/or images hidden.'''
+
+    def __init__(self, page:fitz.Page, scratch:bool=False):
+        '''
+        Args:
+            page (fitz.Page): Source pdf page.
+            scratch (bool, optional): Render from a copy of page in a new document if True,
+                so the source document is never modified. Defaults to False.
+        '''
+        self._page = page
+        self._scratch = scratch
+        self._render_page = None # page to render, i.e. source page or the scratch copy
+        self._sources = None     # {xref: source stream}
+        self._streams = {}       # {(rm_text, rm_image): {xref: modified stream}}
+        self._applied = None     # render mode of the applied streams
+
+
+    @property
+    def page(self):
+        '''The page to render, i.e. the source page, or a copy of it in scratch mode.'''
+        if self._render_page is None:
+            if self._scratch:
+                doc = fitz.Document()
+                doc.insert_pdf(self._page.parent, from_page=self._page.number,
+                                    to_page=self._page.number)
+                self._render_page = doc[0]
+            else:
+                self._render_page = self._page
+        return self._render_page
+
+
+    def get_pixmap(self, clip:fitz.Rect, zoom:float=3.0, rm_text:bool=True,
+                        rm_image:bool=False):
+        '''Render page pixmap with text and/or images hidden.
+
+        Args:
+            clip (fitz.Rect): Target area in the final page, i.e. with rotation considered.
+            zoom (float, optional): Improve resolution by this rate. Defaults to 3.0.
+            rm_text (bool, optional): Hide text or not. Defaults to True.
+            rm_image (bool, optional): Hide images or not. Defaults to False.
+
+        Returns:
+            fitz.Pixmap: The rendered pixmap.
+        '''
+        self._apply((rm_text, rm_image))
+        matrix = fitz.Matrix(zoom, zoom)
+        return self.page.get_pixmap(clip=clip, matrix=matrix)
+
+
+    def restore(self):
+        '''Restore the source streams of page, or release the scratch copy of page.'''
+        if self._scratch:
+            if self._render_page is not None: self._render_page.parent.close()
+            self._render_page, self._sources, self._streams = None, None, {}
+            self._applied = None
+        else:
+            self._apply(None)
+
+
+    def _apply(self, mode:tuple):
+        '''Update page with the cached streams of the render mode, or the source streams if
+        ``mode`` is None.'''
+        if mode==self._applied: return
+        doc = self.page.parent
+        current = self._streams.get(self._applied, {})
+        target = self._modified_streams(mode) if mode else {}
+
+        # restore streams modified by current mode only, then apply the target mode
+        for xref in current:
+            if xref not in target: doc.update_stream(xref, self._sources[xref])
+        for xref, stream in target.items():
+            doc.update_stream(xref, stream)
+        self._applied = mode
+
+
+    def _modified_streams(self, mode:tuple):
+        '''Calculate the modified streams of the render mode once.'''
+        if mode in self._streams: return self._streams[mode]
+
+        page = self.page
+        if self._sources is None:
+            # NOTE: text might exist in both content stream and form object stream
+            # - content stream, i.e. direct page content
+            # - form object, i.e. contents referenced by this page
+            xref_list = [xref for (xref, name, invoker, bbox) in page.get_xobjects()]
+            xref_list.extend(page.get_contents())
+            doc = page.parent
+            self._sources = {xref: doc.xref_stream(xref) for xref in xref_list}
+
+        rm_text, rm_image = mode
+        if rm_image:
+            # image names, e.g. [[270, 0, 261, 115, 8, 'DeviceRGB', '', 'Im1', 'DCTDecode']]
+            names = [f'/{item[7]} Do'.encode() for item in page.get_images(full=True)]
+
+        streams = {}
+        for xref, src in self._sources.items():
+            if not src: continue
+            stream = src
+            if rm_text: stream = self._hide_text(stream)
+            if rm_image: stream = self._hide_images(stream, names)
+            if stream is not src: streams[xref] = stream
+
+        self._streams[mode] = streams
+        return streams
+
+
+    @staticmethod
+    def _hide_text(stream:bytes):
+        '''Set ``3 Tr`` to text blocks.'''
+        for k in (b'BT', b'Tm', b'Td', b'2 Tr'):
+            if k in stream: stream = stream.replace(k, k + b' 3 Tr')
+        return stream
+
+
+    @staticmethod
+    def _hide_images(stream:bytes, names:list):
+        '''Remove the image drawing operators, e.g. ``/Im1 Do``.'''
+        for k in names:
+            if k in stream: stream = stream.replace(k, b'')
+        return stream
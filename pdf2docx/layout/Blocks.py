@@ -5,12 +5,10 @@ and a combination of ``Line`` and ``TableBlock`` during parsing process.
 '''
 
 import logging
-from docx.shared import Pt
 from ..common import constants
 from ..common.Collection import ElementCollection
 from ..common.share import (BlockType, lower_round, rgb_value, is_list_item)
 from ..common.Block import Block
-from ..common.docx import (reset_paragraph_format, delete_paragraph)
 from ..text.TextBlock import TextBlock
 from ..text.TextSpan import TextSpan
 from ..text.Line import Line
@@ -299,11 +297,12 @@ class Blocks(ElementCollection):
         self._parse_line_spacing()
 
 
-    def make_docx(self, doc):
+    def make_docx(self, writer):
         '''Create page based on parsed block structure. 
         
         Args:
-            doc (Document, _Cell): The container to make docx content.
+            writer (BaseWriter): Docx writer, with the container to make docx content, i.e.
+                document body or table cell.
         '''
         def make_table(table_block, pre_table):
             # create dummy paragraph if table before space is set
@@ -311,23 +310,19 @@ class Blocks(ElementCollection):
             # - but tow adjacent tables will be combined automatically, so adding a minimum dummy paragraph is required
             if table_block.before_space>=constants.MIN_LINE_SPACING or pre_table:
                 h = lower_round(table_block.before_space, 1) # round(x,1), but to lower bound
-                p = doc.add_paragraph()
-                reset_paragraph_format(p, line_spacing=Pt(h))
+                writer.add_paragraph()
+                writer.set_paragraph_format(line_spacing=h, exact=True)
 
-            # new table            
-            table = doc.add_table(rows=table_block.num_rows, cols=table_block.num_cols)
-            table.autofit = False
-            table.allow_autofit  = False
-            table_block.make_docx(table)
+            # new table
+            table_block.make_docx(writer)
 
         pre_table = False
-        cell_layout = isinstance(self.parent, Cell)
         for block in self._instances:
             # make paragraphs
             if block.is_text_image_block:                
                 # new paragraph
-                p = doc.add_paragraph()
-                block.make_docx(p)
+                writer.add_paragraph()
+                block.make_docx(writer)
 
                 pre_table = False # mark block type
             
@@ -335,12 +330,6 @@ class Blocks(ElementCollection):
             elif block.is_table_block:
                 make_table(block, pre_table)
                 pre_table = True # mark block type
-
-                # NOTE: within a cell, there is always an empty paragraph after table,
-                # so, delete it right here.
-                # https://github.com/dothinking/pdf2docx/issues/76 
-                if cell_layout:
-                    delete_paragraph(doc.paragraphs[-1])
        
         # NOTE: If a table is at the end of a page, a new paragraph will be automatically 
         # added by the rending engine, e.g. MS Word, which resulting in an unexpected
@@ -355,8 +344,8 @@ class Blocks(ElementCollection):
             if not block.is_table_block: break
 
             # otherwise, add a small paragraph
-            p = doc.add_paragraph()
-            reset_paragraph_format(p, Pt(constants.MIN_LINE_SPACING)) # a small line height
+            writer.add_paragraph()
+            writer.set_paragraph_format(line_spacing=constants.MIN_LINE_SPACING, exact=True) # a small line height
 
   
     def plot(self, page):
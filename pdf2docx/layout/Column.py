@@ -40,10 +40,10 @@ class Column(Layout):
         self.assign_shapes(shapes)
 
 
-    def make_docx(self, doc):
+    def make_docx(self, writer):
         '''Create Section Column in docx.
 
         Args:
-            doc (Document): ``python-docx`` document object
+            writer (BaseWriter): Docx writer.
         '''
-        self.blocks.make_docx(doc)
+        self.blocks.make_docx(writer)
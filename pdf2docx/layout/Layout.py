@@ -34,6 +34,7 @@ from ..shape.Shapes import Shapes
 
 class Layout(Element, ABC):
     '''Blocks and shapes structure and formats.'''
+    __slots__ = ('blocks', 'shapes', '_table_parser')
 
     def __init__(self, bbox=None):
         ''' Initialize layout. Note that layout bbox must be set explicitly,
@@ -21,7 +21,6 @@ to distinguish these different layouts.
 '''
 
 from docx.enum.section import WD_SECTION
-from ..common.docx import set_columns
 from ..common.Collection import BaseCollection
 from .Column import Column
 
@@ -76,22 +75,21 @@ class Section(BaseCollection):
         return self
     
 
-    def make_docx(self, doc):
+    def make_docx(self, writer):
         '''Create section in docx. 
 
         Args:
-            doc (Document): ``python-docx`` document object
+            writer (BaseWriter): Docx writer.
         '''
         # set section column
-        section = doc.sections[-1]
         width_list = [c.bbox[2]-c.bbox[0] for c in self]
-        set_columns(section, width_list, self.space)
+        writer.set_columns(width_list, self.space)
 
         # add create each column
         for column in self:
             # column break to start new column
             if column != self[0]: 
-                doc.add_section(WD_SECTION.NEW_COLUMN)
+                writer.add_section(WD_SECTION.NEW_COLUMN)
 
             # make doc
-            column.make_docx(doc)
\ No newline at end of file
+            column.make_docx(writer)
\ No newline at end of file
@@ -4,9 +4,7 @@
 '''
 
 from docx.enum.section import WD_SECTION
-from docx.shared import Pt
 from ..common.Collection import BaseCollection
-from ..common.docx import reset_paragraph_format
 from .Section import Section
 from ..common import constants
 
@@ -28,18 +26,15 @@ class Sections(BaseCollection):
         return self
 
 
-    def make_docx(self, doc):
+    def make_docx(self, writer):
         '''Create sections in docx.'''        
         if not self: return
 
-        # mark paragraph index before creating current page
-        n = len(doc.paragraphs)
-
         def create_dummy_paragraph_for_section(section):
-            p = doc.add_paragraph()
             line_height = min(section.before_space, 11)
-            pf = reset_paragraph_format(p, line_spacing=Pt(line_height))
-            pf.space_after = Pt(section.before_space-line_height)
+            writer.add_paragraph()
+            writer.set_paragraph_format(line_spacing=line_height, exact=True,
+                                        space_after=section.before_space-line_height)
 
         # ---------------------------------------------------
         # first section
@@ -51,36 +46,26 @@ class Sections(BaseCollection):
         
         # create first section
         if section.num_cols==2: 
-            doc.add_section(WD_SECTION.CONTINUOUS)
-        section.make_docx(doc)
+            writer.add_section(WD_SECTION.CONTINUOUS)
+        section.make_docx(writer)
 
         # ---------------------------------------------------
         # more sections
         # ---------------------------------------------------
         for section in self[1:]:
-            # create new section symbol
-            doc.add_section(WD_SECTION.CONTINUOUS)
-
-            # set after space of last paragraph to define the vertical
-            # position of current section
-            # NOTE: the after space doesn't work if last paragraph is 
-            # image only (without any text). In this case, set after
-            # space for the section break.
-            p = doc.paragraphs[-2] # -1 is the section break
-            if not p.text.strip() and 'graphicData' in p._p.xml:
-                p = doc.paragraphs[-1]
-            pf = p.paragraph_format
-            pf.space_after = Pt(section.before_space)
+            # create new section symbol, and set after space of last paragraph to define
+            # the vertical position of current section
+            writer.add_section(WD_SECTION.CONTINUOUS, space_before=section.before_space)
             
             # section content
-            section.make_docx(doc)
+            section.make_docx(writer)
 
         # ---------------------------------------------------
         # create floating images
         # ---------------------------------------------------
         # lazy: assign all float images to first paragraph of current page
         for image in self.parent.float_images:
-            image.make_docx(doc.paragraphs[n])
+            image.make_docx(writer)
 
 
     def plot(self, page):
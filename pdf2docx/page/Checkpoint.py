@@ -0,0 +1,121 @@
+'''Checkpoint of parsed pages for resuming long conversions.
+
+Each parsed page is stored in the checkpoint directory as soon as it's finalized, e.g.
+``page-12.json``. A conversion started with the same checkpoint directory restores these pages
+rather than parsing them again, if the pdf and parsing settings are the same; otherwise, the
+stale checkpoint is cleared. The pdf is identified by a hash of its content, so a different pdf
+never restores pages from the checkpoint, even with the same file name or metadata.
+
+::
+
+    checkpoint_dir/
+        checkpoint.json  # {"fingerprint": ...}
+        page-0.json      # Page.store()
+        page-1.json
+        ...
+'''
+
+import glob
+import hashlib
+import json
+import logging
+import os
+from .Page import Page
+
+
+class Checkpoint:
+    '''Store and restore parsed pages in a directory.'''
+
+    # settings which don't change the parsed pages
+    IGNORED_SETTINGS = ('debug_doc', 'debug_filename', 'checkpoint_dir', 'multi_processing',
+                        'cpu_count', 'pipeline', 'pipeline_workers', 'pipeline_queue_size',
+                        'raw_exceptions', 'ignore_page_error', 'writer', 'char_style',
+                        'split_every', 'split_manifest')
+
+    def __init__(self, directory:str, fingerprint:str):
+        '''
+        Args:
+            directory (str): Checkpoint directory.
+            fingerprint (str): Fingerprint of pdf and parsing settings.
+        '''
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+        # clear stale checkpoint
+        filename = os.path.join(directory, 'checkpoint.json')
+        data = self._load(filename) or {}
+        if data.get('fingerprint')!=fingerprint:
+            stale = glob.glob(os.path.join(directory, 'page-*.json'))
+            if stale: logging.warning('Clear %d pages in stale checkpoint.', len(stale))
+            for name in stale: os.remove(name)
+            self._dump({'fingerprint': fingerprint}, filename)
+
+
+    @classmethod
+    def create(cls, directory:str, source, settings:dict):
+        '''Create checkpoint with the fingerprint of pdf and parsing settings.
+
+        Args:
+            directory (str): Checkpoint directory.
+            source (str, bytes): Pdf file name, or pdf content in memory.
+            settings (dict): Parsing parameters.
+        '''
+        data = {
+            'pdf'     : cls._digest(source),
+            'settings': {k: v for k, v in settings.items() if k not in cls.IGNORED_SETTINGS}
+        }
+        text = json.dumps(data, sort_keys=True, default=str)
+        return cls(directory, hashlib.sha1(text.encode()).hexdigest())
+
+
+    def restore(self, page:Page):
+        '''Restore page from checkpoint.
+
+        Returns:
+            bool: True if the page is restored.
+        '''
+        data = self._load(self._filename(page))
+        if data is None: return False
+        page.restore(data)
+        return True
+
+
+    def save(self, page:Page):
+        '''Store parsed page to checkpoint.'''
+        self._dump(page.store(), self._filename(page))
+
+
+    @staticmethod
+    def _digest(source, chunk_size:int=1<<20):
+        '''Hash of pdf content, read from file in chunks if file name is given.'''
+        sha1 = hashlib.sha1()
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                for chunk in iter(lambda: f.read(chunk_size), b''): sha1.update(chunk)
+        else:
+            sha1.update(source)
+        return sha1.hexdigest()
+
+
+    def _filename(self, page:Page):
+        return os.path.join(self.directory, f'page-{page.id}.json')
+
+
+    @staticmethod
+    def _load(filename:str):
+        '''Load json file, or None if not exist or broken.'''
+        if not os.path.exists(filename): return None
+        try:
+            with open(filename, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except ValueError:
+            return None
+
+
+    @staticmethod
+    def _dump(data:dict, filename:str):
+        '''Write json file atomically, so a broken file is never left if interrupted.'''
+        tmp = f'{filename}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(data))
+        os.replace(tmp, filename)
@@ -39,13 +39,12 @@ Page elements structure:
 
 '''
 
-from docx.shared import Pt
-from docx.enum.section import WD_SECTION
 from ..common.Collection import BaseCollection
 from ..common.share import debug_plot
 from .BasePage import BasePage
 from ..layout.Sections import Sections
 from ..image.ImageBlock import ImageBlock
+from ..writer import (BaseWriter, DocxWriter)
 
 
 class Page(BasePage):
@@ -92,6 +91,9 @@ class Page(BasePage):
         # floating images are separate node under page
         self.float_images = float_images or BaseCollection()
 
+        # parsing stages skipped according to page type, e.g. tables
+        self.skipped_stages = ()
+
         self._finalized = False
 
 
@@ -142,6 +144,8 @@ class Page(BasePage):
     @debug_plot('Final Layout')
     def parse(self, **settings):
         '''Parse page layout.'''
+        if 'tables' in self.skipped_stages:
+            settings = dict(settings, parse_lattice_table=False, parse_stream_table=False)
         self.sections.parse(**settings)
         self._finalized = True
         return self.sections # for debug plot
@@ -171,7 +175,7 @@ class Page(BasePage):
         return tables
 
 
-    def make_docx(self, doc):
+    def make_docx(self, writer):
         '''Set page size, margin, and create page. 
 
         .. note::
@@ -179,27 +183,15 @@ class Page(BasePage):
             page or restored from parsed data.
         
         Args:
-            doc (Document): ``python-docx`` document object
+            writer (BaseWriter): Docx writer, or ``python-docx`` document object.
         '''
-        # new page
-        if doc.paragraphs:
-            section = doc.add_section(WD_SECTION.NEW_PAGE)
-        else:
-            section = doc.sections[0] # a default section is there when opening docx
-
-        # page size
-        section.page_width  = Pt(self.width)
-        section.page_height = Pt(self.height)
-
-        # page margin
-        left,right,top,bottom = self.margin
-        section.left_margin = Pt(left)
-        section.right_margin = Pt(right)
-        section.top_margin = Pt(top)
-        section.bottom_margin = Pt(bottom)
+        if not isinstance(writer, BaseWriter): writer = DocxWriter(writer)
+
+        # new page with page size and margin
+        writer.add_page(self.width, self.height, self.margin)
 
         # create flow layout: sections
-        self.sections.make_docx(doc)
+        self.sections.make_docx(writer)
 
  
     def _restore_float_images(self, raws:list):
@@ -3,14 +3,73 @@
 '''Collection of :py:class:`~pdf2docx.page.Page` instances.'''
 
 import logging
+from bisect import bisect_left
 
+from .Page import Page
 from .RawPageFactory import RawPageFactory
 from ..common.Collection import BaseCollection
 from ..font.Fonts import Fonts
 
 
 class Pages(BaseCollection):
-    '''A collection of ``Page``.'''
+    '''A sparse collection of ``Page``: only the selected pages of document are materialized
+    by :py:meth:`load`, so the cost is independent of the count of all pages. Page is accessed
+    by page index like a list of all pages, where any page not loaded is a detached empty page.
+    '''
+    def __init__(self, instances:list=None, parent=None):
+        self._num = 0 # count of all pages in document
+        super().__init__(instances, parent)
+
+
+    @property
+    def num_pages(self):
+        '''Count of all pages in document, no matter materialized or not.'''
+        return max(self._num, self._instances[-1].id+1 if self._instances else 0)
+
+
+    def load(self, num:int, page_indexes:list, skip_parsing:bool=False):
+        '''Initialize pages to parse, or add empty pages to restore parsed data.
+
+        Args:
+            num (int): Count of all pages in document.
+            page_indexes (list): Indexes of pages to parse, or to restore if ``skip_parsing``.
+            skip_parsing (bool, optional): Add pages to restore and keep the loaded pages if
+                True, otherwise reset to the pages to parse. Defaults to False.
+
+        Returns:
+            Pages: self
+        '''
+        if not skip_parsing:
+            self._num = num
+            ids = sorted(set(self._to_page_id(i) for i in page_indexes))
+            return self.reset([Page(id=i, skip_parsing=False) for i in ids])
+
+        self._num = self.num_pages or num
+        pages = {page.id: page for page in self._instances}
+        for i in map(self._to_page_id, page_indexes):
+            if i not in pages: pages[i] = Page(id=i, skip_parsing=True)
+        return self.reset([pages[i] for i in sorted(pages)])
+
+
+    def __getitem__(self, idx):
+        '''Get page by page index, or a list of pages by slice. A detached empty page is
+        returned if the page is not loaded.'''
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(self.num_pages))]
+        idx = self._to_page_id(idx)
+        ids = [page.id for page in self._instances]
+        pos = bisect_left(ids, idx)
+        if pos<len(ids) and ids[pos]==idx: return self._instances[pos]
+        return Page(id=idx, skip_parsing=True)
+
+
+    def _to_page_id(self, idx:int):
+        num = self.num_pages
+        page_id = idx+num if idx<0 else idx
+        if not 0<=page_id<num:
+            raise IndexError(f'Page index {idx} out of range.')
+        return page_id
+
 
     def parse(self, fitz_doc, **settings):
         '''Analyze document structure, e.g. page section, header, footer.
@@ -22,41 +81,33 @@ class Pages(BaseCollection):
         # ---------------------------------------------
         # 0. extract fonts properties, especially line height ratio
         # ---------------------------------------------
-        fonts = Fonts.extract(fitz_doc)
+        fonts = Fonts.extract(fitz_doc, [page.id for page in self if not page.skip_parsing])
 
         # ---------------------------------------------
         # 1. extract and then clean up raw page
         # ---------------------------------------------
         pages, raw_pages = [], []
         words_found = False
+        page_types = {} # count of pages per type
         for page in self:
             if page.skip_parsing: continue
-
-            # init and extract data from PDF
-            raw_page = RawPageFactory.create(page_engine=fitz_doc[page.id], backend='PyMuPDF')
-            raw_page.restore(**settings)
+            raw_page = Pages.extract_page(page, fitz_doc, fonts, **settings)
 
             # check if any words are extracted since scanned pdf may be directed
             if not words_found and raw_page.raw_text.strip():
                 words_found = True
 
-            # process blocks and shapes based on bbox
-            raw_page.clean_up(**settings)
-
-            # process font properties
-            raw_page.process_font(fonts)            
-
-            # after this step, we can get some basic properties
-            # NOTE: floating images are detected when cleaning up blocks, so collect them here
-            page.width = raw_page.width
-            page.height = raw_page.height
-            page.float_images.reset().extend(raw_page.blocks.floating_image_blocks)
+            page_type = raw_page.page_type
+            if page_type: page_types[page_type.name] = page_types.get(page_type.name, 0) + 1
 
             raw_pages.append(raw_page)
             pages.append(page)
 
+        if page_types:
+            logging.info('Page types: %s', ', '.join(f'{k.lower()}={v}' for k,v in page_types.items()))
+
         # show message if no words found
-        if not words_found:
+        if raw_pages and not words_found:
             logging.warning('Words count: 0. It might be a scanned pdf, which is not supported yet.')
 
         
@@ -72,15 +123,62 @@ class Pages(BaseCollection):
         # ---------------------------------------------
         # 3. parse structure in page level, e.g. page margin, section
         # ---------------------------------------------
-        # parse sections
         for page, raw_page in zip(pages, raw_pages):
-            # page margin
-            margin = raw_page.calculate_margin(**settings)
-            raw_page.margin = page.margin = margin
+            Pages.analyze_page(page, raw_page, **settings)
+
 
-            # page section
-            sections = raw_page.parse_section(**settings)
-            page.sections.extend(sections)
+    @staticmethod
+    def extract_page(page:Page, fitz_doc, fonts:Fonts, **settings):
+        '''Extract source contents of page and then clean up, i.e. step 1 of document
+        analysis.
+
+        Args:
+            page (Page): Page to parse.
+            fitz_doc (fitz.Document): ``PyMuPDF`` Document instance.
+            fonts (Fonts): Fonts extracted from document.
+            settings (dict): Parsing parameters.
+
+        Returns:
+            RawPage: The raw page with contents extracted.
+        '''
+        # init and extract data from PDF
+        raw_page = RawPageFactory.create(page_engine=fitz_doc[page.id], backend='PyMuPDF')
+        clip = settings.get('clip', None)
+        raw_page.clip = clip.get(page.id, None) if isinstance(clip, dict) else clip
+        if settings.get('classify_pages', False):
+            page_type = raw_page.classify()
+            page.skipped_stages = raw_page.skipped_stages
+            if page.skipped_stages:
+                logging.info('Page %d: %s page, skip stages: %s', page.id+1,
+                                page_type.name.lower(), ', '.join(page.skipped_stages))
+        raw_page.restore(**settings)
+
+        # process blocks and shapes based on bbox
+        raw_page.clean_up(**settings)
+
+        # process font properties
+        raw_page.process_font(fonts)            
+
+        # after this step, we can get some basic properties
+        # NOTE: floating images are detected when cleaning up blocks, so collect them here
+        page.width = raw_page.width
+        page.height = raw_page.height
+        page.float_images.reset().extend(raw_page.blocks.floating_image_blocks)
+
+        return raw_page
+
+
+    @staticmethod
+    def analyze_page(page:Page, raw_page, **settings):
+        '''Parse structure in page level, e.g. page margin, section, i.e. step 3 of
+        document analysis.'''
+        # page margin
+        margin = raw_page.calculate_margin(**settings)
+        raw_page.margin = page.margin = margin
+
+        # page section
+        sections = raw_page.parse_section(**settings)
+        page.sections.extend(sections)
     
 
     @staticmethod
@@ -15,7 +15,7 @@ from ..shape.Shapes import Shapes
 from ..layout.Blocks import Blocks
 from ..font.Fonts import Fonts
 from ..text.TextSpan import TextSpan
-from ..common.share import debug_plot
+from ..common.share import (PageType, debug_plot)
 from ..common import constants
 from ..common.Collection import Collection
 
@@ -23,6 +23,14 @@ from ..common.Collection import Collection
 class RawPage(BasePage, ABC):
     '''A wrapper of page engine.'''
 
+    # stages skipped for page type, since they can't find anything on such pages;
+    # note the images of scanned page are replaced with one image rendered from the page
+    SKIPPED_STAGES = {
+        PageType.BLANK  : ('text', 'images', 'shapes', 'hyperlinks', 'tables'),
+        PageType.SCANNED: ('text', 'shapes', 'hyperlinks', 'tables'),
+        PageType.TEXT   : ('images', 'shapes', 'tables'),
+    }
+
     def __init__(self, page_engine=None):
         ''' Initialize page layout.
 
@@ -33,6 +41,14 @@ class RawPage(BasePage, ABC):
         self.page_engine = page_engine
         self.blocks = Blocks(parent=self)
         self.shapes = Shapes(parent=self)
+        self.page_type = None # type: PageType
+        self.clip = None # region of interest in un-rotated page CS; None for the entire page
+
+
+    @property
+    def skipped_stages(self):
+        '''Parsing stages skipped according to the classified page type.'''
+        return RawPage.SKIPPED_STAGES.get(self.page_type, ())
 
 
     @abstractmethod
@@ -49,6 +65,12 @@ class RawPage(BasePage, ABC):
         '''
 
 
+    def classify(self):
+        '''Classify page type with counts of page contents, so as to skip the stages that
+        can't succeed. Return None if not supported by the page engine.'''
+        return None
+
+
     @property
     def text(self):
         '''All extracted text in this page, with images considered as ``<image>``.
@@ -8,16 +8,100 @@ import fitz
 import logging
 from .RawPage import RawPage
 from ..image.ImagesExtractor import ImagesExtractor
+from ..image.ImagePolicy import ImagePolicy
+from ..image.RenderContext import RenderContext
 from ..shape.Paths import Paths
-from ..common.constants import FACTOR_A_HALF
+from ..common.constants import (FACTOR_A_HALF, FACTOR_MOST)
 from ..common.Element import Element
-from ..common.share import (RectType, debug_plot)
+from ..common.share import (RectType, PageType, debug_plot)
 from ..common.algorithm import get_area
 
 
 class RawPageFitz(RawPage):
     '''A wrapper of ``fitz.Page`` to extract source contents.'''
 
+    def __init__(self, page_engine=None):
+        super().__init__(page_engine)
+        self._raw_paths = None # drawings extracted when classifying page
+        self._textpage = None  # text page created when classifying page
+        self._render_context = None # shared by all rendering of this page
+
+
+    def classify(self):
+        '''Classify page type with counts of text, drawings, images and links, which are much
+        cheaper than parsing the contents. The text page and drawings are extracted once and
+        reused by extracting the contents.
+
+        Returns:
+            PageType: The page type, which is also set to ``page_type``.
+        '''
+        page = self.page_engine
+        has_text = bool(page.get_text('text', textpage=self._get_textpage()).strip())
+        has_link = bool(self._get_links())
+        images = page.get_images()
+
+        # iso-oriented and the other drawing commands
+        self._raw_paths = self._get_drawings()
+        num_iso, num_non_iso = 0, 0
+        for path in self._raw_paths:
+            if path['type'] in ('clip', 'group'): continue
+            for item in path['items']:
+                if item[0] in ('re', 'qu'):
+                    num_iso += 1
+                elif item[0]=='l' and (abs(item[1][0]-item[2][0])<1e-3 or \
+                                       abs(item[1][1]-item[2][1])<1e-3):
+                    num_iso += 1
+                else:
+                    num_non_iso += 1
+        num_drawings = num_iso + num_non_iso
+
+        # region of interest in un-rotated page CS, same to the image rects
+        region = page.rect * page.derotation_matrix
+        if self.clip is not None: region &= fitz.Rect(self.clip)
+
+        if not (has_text or has_link or images or num_drawings):
+            page_type = PageType.BLANK
+
+        elif not (has_text or has_link or num_drawings) and \
+            self._image_area(images, region) >= FACTOR_MOST*region.get_area():
+            page_type = PageType.SCANNED
+
+        elif not (images or num_drawings):
+            page_type = PageType.TEXT
+
+        elif num_drawings and num_non_iso >= FACTOR_A_HALF*num_drawings:
+            page_type = PageType.VECTOR
+
+        elif num_drawings:
+            page_type = PageType.TABLE
+
+        else:
+            page_type = PageType.MIXED
+
+        self.page_type = page_type
+        return page_type
+
+
+    def _image_area(self, images:list, region:fitz.Rect):
+        '''Area of region covered by images, without considering overlap.'''
+        page = self.page_engine
+        area = 0.0
+        for item in images:
+            for rect in page.get_image_rects(item[0]):
+                area += (rect & region).get_area()
+        return area
+
+
+    def _get_textpage(self):
+        '''Text page of the region of interest, shared by classifying page and extracting
+        text.'''
+        if self._textpage is None:
+            self._textpage = self.page_engine.get_textpage(
+                clip=self.clip,
+                flags=fitz.TEXT_MEDIABOX_CLIP | fitz.TEXT_CID_FOR_UNKNOWN_UNICODE)
+        return self._textpage
+
+
     def extract_raw_dict(self, **settings):
         raw_dict = {}
         if not self.page_engine: return raw_dict
@@ -28,21 +112,39 @@ class RawPageFitz(RawPage):
         raw_dict.update({ 'width' : w, 'height': h })
         self.width, self.height = w, h
 
-        # pre-processing layout elements. e.g. text, images and shapes
-        text_blocks = self._preprocess_text(**settings)
+        # pre-processing layout elements. e.g. text, images and shapes;
+        # skip stages which can't find anything according to page type
+        skipped = self.skipped_stages
+        text_blocks = [] if 'text' in skipped else self._preprocess_text(**settings)
         raw_dict['blocks'] = text_blocks
 
-        image_blocks = self._preprocess_images(**settings)
-        raw_dict['blocks'].extend(image_blocks)
-        
-        shapes, images =  self._preprocess_shapes(**settings)
-        raw_dict['shapes'] = shapes
-        raw_dict['blocks'].extend(images)
+        # page is rendered with text and images hidden when extracting images and shapes;
+        # the modified streams are shared, and the source streams are restored at last
+        self._render_context = RenderContext(self.page_engine,
+                                             settings.get('render_scratch_page', False))
+        try:
+            if self.page_type==PageType.SCANNED:
+                image_blocks = self._preprocess_page_image(**settings)
+            else:
+                image_blocks = [] if 'images' in skipped else self._preprocess_images(**settings)
+            raw_dict['blocks'].extend(image_blocks)
+            
+            shapes, images = ([], []) if 'shapes' in skipped else \
+                                self._preprocess_shapes(**settings)
+            raw_dict['shapes'] = shapes
+            raw_dict['blocks'].extend(images)
+        finally:
+            self._render_context.restore()
+            self._render_context = None
+
+        # image output policy, e.g. downsampling and format selection
+        self._postprocess_images(image_blocks + images, **settings)
 
-        hyperlinks = self._preprocess_hyperlinks()
+        hyperlinks = [] if 'hyperlinks' in skipped else self._preprocess_hyperlinks()
         raw_dict['shapes'].extend(hyperlinks)        
        
-        # Element is a base class processing coordinates, so set rotation matrix globally
+        # Element is a base class processing coordinates, so set rotation matrix of this page
+        # for the current thread
         Element.set_rotation_matrix(self.page_engine.rotation_matrix)
 
         return raw_dict
@@ -64,12 +166,11 @@ class RawPageFitz(RawPage):
         sort = settings.get('sort')
         raw = self.page_engine.get_text(
                 'rawdict',
-                flags=0
-                    | fitz.TEXT_MEDIABOX_CLIP
-                    | fitz.TEXT_CID_FOR_UNKNOWN_UNICODE
-                    ,
+                textpage=self._get_textpage(),
+                clip=self.clip,
                 sort=sort,
                 )
+        self._textpage = None
         text_blocks = raw.get('blocks', [])
 
         # potential UnicodeDecodeError issue when trying to filter hidden text:
@@ -125,7 +226,31 @@ class RawPageFitz(RawPage):
         # ignore image if ocr-ed pdf: get ocr-ed text only
         if settings['ocr']==2: return []
         
-        return ImagesExtractor(self.page_engine).extract_images(settings['clip_image_res_ratio'])
+        return ImagesExtractor(self.page_engine, self._render_context, self.clip) \
+                    .extract_images(settings['clip_image_res_ratio'], encode=False)
+
+
+    def _preprocess_page_image(self, **settings):
+        '''Render scanned page to one image, rather than extracting each image, e.g. the strips
+        forming a scanned page. The region of interest is rendered if specified.
+        '''
+        if settings['ocr']==2: return []
+
+        page = self.page_engine
+        bbox = page.rect * page.derotation_matrix # un-rotated page CS
+        return [ImagesExtractor(page, self._render_context, self.clip) \
+                    .clip_page_to_dict(bbox, False, settings['clip_image_res_ratio'], encode=False)]
+
+
+    @staticmethod
+    def _postprocess_images(images:list, **settings):
+        '''Encode extracted images, then downsample and re-encode them according to the
+        image policy.'''
+        ImagesExtractor.encode_images(images)
+        policy = ImagePolicy(settings.get('image_max_dpi', 0),
+                             settings.get('image_format', None),
+                             settings.get('image_jpeg_quality', 85))
+        policy.apply(images)
 
 
     def _preprocess_shapes(self, **settings):
@@ -136,14 +261,43 @@ class RawPageFitz(RawPage):
             settings['min_svg_gap_dy'], 
             settings['min_svg_w'], 
             settings['min_svg_h'], 
-            settings['clip_image_res_ratio'])
+            settings['clip_image_res_ratio'],
+            self._render_context)
     
 
     @debug_plot('Source Paths')
     def _init_paths(self, **settings):
         '''Initialize Paths based on drawings extracted with PyMuPDF.'''
-        raw_paths = self.page_engine.get_cdrawings()
+        raw_paths = self._raw_paths
+        if raw_paths is None: raw_paths = self._get_drawings()
         return Paths(parent=self).restore(raw_paths)
+
+
+    def _get_drawings(self):
+        '''Get drawings intersected with the region of interest, along with the clipping paths
+        applied to them. Note drawings extracted by ``PyMuPDF`` are in un-rotated page CS, the
+        same as the region of interest.'''
+        raw_paths = self.page_engine.get_cdrawings(extended=True)
+        if self.clip is None: return raw_paths
+        clip = fitz.Rect(self.clip)
+        return [raw for raw in raw_paths \
+                    if raw['type'] in ('clip', 'group') or clip.intersects(raw['rect'])]
+
+
+    def _get_links(self):
+        '''Get links intersected with the region of interest.'''
+        links = self.page_engine.get_links()
+        clip = self._real_clip
+        if clip is None: return links
+        return [link for link in links if clip.intersects(link['from'])]
+
+
+    @property
+    def _real_clip(self):
+        '''Region of interest in real page CS, i.e. with rotation considered, which is the CS
+        of links.'''
+        if self.clip is None: return None
+        return fitz.Rect(self.clip) * self.page_engine.rotation_matrix
     
 
     def _preprocess_hyperlinks(self):
@@ -153,7 +307,7 @@ class RawPageFitz(RawPage):
             list: A list of source hyperlink dict.
         """
         hyperlinks = []
-        for link in self.page_engine.get_links():
+        for link in self._get_links():
             if link['kind']!=2: continue # consider internet address only
             hyperlinks.append({
                 'type': RectType.HYPERLINK.value,
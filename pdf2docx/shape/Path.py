@@ -29,6 +29,7 @@ References:
 '''
 
 import fitz
+import numpy as np
 from ..common.share import rgb_value
 from ..common import constants
 
@@ -141,60 +142,46 @@ class Segments:
             line = L(item)
             if line.length>1e-3: self._instances.append(line)
 
+        # geometry is calculated once with the array of connected points, since it's checked
+        # repeatedly when classifying paths
+        self.points = [point for segment in self._instances for point in segment.points]
+        self.bbox, self.area = self._calculate_geometry(self.points)
 
-    def __iter__(self): return (instance for instance in self._instances)
+        # ISO-oriented criterion: the ratio of real area to bbox exceeds 0.9
+        bbox_area = self.bbox.get_area()
+        self.is_iso_oriented = bbox_area==0 or self.area/bbox_area>=constants.FACTOR_MOST
 
 
-    @property
-    def points(self):
-        '''Connected points of segments.'''
-        points = []
-        for segment in self._instances:
-            points.extend(segment.points)
-        return points
+    def __iter__(self): return (instance for instance in self._instances)
 
 
-    @property
-    def is_iso_oriented(self):
-        '''ISO-oriented criterion: the ratio of real area to bbox exceeds 0.9.'''
-        bbox_area = self.bbox.get_area()
-        return bbox_area==0 or self.area/bbox_area>=constants.FACTOR_MOST
+    @staticmethod
+    def _calculate_geometry(points:list):
+        '''Calculate bbox and area of connected points.
 
+        * The area is calculated with Green formulas. Note the boundary of Bezier curve is
+          simplified with its control points. https://en.wikipedia.org/wiki/Shoelace_formula
+        * The area of open curve is 0.
 
-    @property
-    def area(self):
-        '''Calculate segments area with Green formulas. Note the boundary of Bezier curve
-        is simplified with its control points.
-
-        * https://en.wikipedia.org/wiki/Shoelace_formula
+        Returns:
+            tuple: (bbox, area).
         '''
-        points = self.points
-        start, end = points[0], points[-1]
-        if abs(start[0]-end[0])+abs(start[1]-end[1])>1e-3:
-            return 0.0 # open curve
-
-        # closed curve
-        area = 0.0
-        for i in range(len(points)-1):
-            x0, y0 = points[i]
-            x1, y1 = points[i+1]
-            area += x0*y1 - x1*y0
-
-        return abs(area/2.0)
+        if not points: return fitz.Rect(), 0.0
+        xy = np.array(points, dtype=float).reshape(-1, 2)
 
+        # bbox: `round()` is required to avoid float error
+        x0, y0 = xy.min(axis=0)
+        x1, y1 = xy.max(axis=0)
+        bbox = fitz.Rect(round(x0, 2), round(y0, 2), round(x1, 2), round(y1, 2))
 
-    @property
-    def bbox(self):
-        '''Calculate segments bbox. '''
-        points = self.points
-        x0 = min(points, key=lambda point: point[0])[0]
-        y0 = min(points, key=lambda point: point[1])[1]
-        x1 = max(points, key=lambda point: point[0])[0]
-        y1 = max(points, key=lambda point: point[1])[1]
+        # area of closed curve
+        x, y = xy[:, 0], xy[:, 1]
+        if abs(x[0]-x[-1])+abs(y[0]-y[-1])>1e-3:
+            area = 0.0 # open curve
+        else:
+            area = abs(float(np.dot(x[:-1], y[1:]) - np.dot(x[1:], y[:-1])) / 2.0)
 
-        # bbox: `round()` is required to avoid float error
-        return fitz.Rect(
-            round(x0, 2), round(y0, 2), round(x1, 2), round(y1, 2))
+        return bbox, area
 
 
     def to_strokes(self, width:float, color:list):
@@ -253,10 +240,18 @@ class Path:
             self.items.append(S)
 
             # update bbox: note iso-oriented line segments -> S.bbox.get_area()==0
-            rect = S.bbox
+            rect = fitz.Rect(S.bbox)
             if rect.get_area()==0: rect += (-w, -w, w, w)
             self.bbox |= rect
 
+        # it is iso-oriented when all contained segments are iso-oriented
+        self.is_iso_oriented = all(segments.is_iso_oriented for segments in self.items)
+
+        # page area covered by this path, with stroke width considered, e.g. a horizontal line
+        # leaves ink though its rect is empty; the clipping path is applied by parent collection
+        self.visible_bbox = fitz.Rect(raw['rect']) if 'rect' in raw else fitz.Rect(self.bbox)
+        if self.is_stroke and w: self.visible_bbox += (-w/2, -w/2, w/2, w/2)
+
 
     @staticmethod
     def _group_segments(items):
@@ -310,11 +305,28 @@ class Path:
     def is_fill(self): return 'f' in self.path_type
 
     @property
-    def is_iso_oriented(self):
-        '''It is iso-oriented when all contained segments are iso-oriented.'''
-        for segments in self.items:
-            if not segments.is_iso_oriented: return False
-        return True
+    def is_visible(self):
+        '''Whether the path leaves ink on white page, i.e. not clipped out, and stroked or
+        filled with non-white color.'''
+        if self.visible_bbox.is_empty: return False
+        if self.is_stroke and self._has_ink(self.raw.get('color'), self.raw.get('stroke_opacity')):
+            return True
+        return self.is_fill and self._has_ink(self.raw.get('fill'), self.raw.get('fill_opacity'))
+
+
+    @staticmethod
+    def _has_ink(color:tuple, opacity:float=None):
+        '''Whether the color is darker than the threshold of white, i.e. 253, in gray level.'''
+        if not color: return False
+        if len(color)==3: # RGB
+            gray = 0.299*color[0] + 0.587*color[1] + 0.114*color[2]
+        elif len(color)==4: # CMYK
+            c, m, y, k = color
+            gray = 0.299*(1-c)*(1-k) + 0.587*(1-m)*(1-k) + 0.114*(1-y)*(1-k)
+        else: # gray
+            gray = color[0]
+        if opacity is not None: gray = 1.0 - opacity*(1.0-gray) # blending with white page
+        return gray*255 <= 253
 
 
     def to_shapes(self):
@@ -12,6 +12,8 @@ import fitz
 from ..image.ImagesExtractor import ImagesExtractor
 from ..common.share import lazyproperty
 from ..common.Collection import  Collection
+from ..common.algorithm import group_rects_by_connectivity
+from ..common import constants
 from .Path import Path
 
 
@@ -19,12 +21,25 @@ class Paths(Collection):
     '''A collection of paths.'''
 
     def restore(self, raws:list):
-        '''Initialize paths from raw data get by ``page.get_drawings()``.'''
+        '''Initialize paths from raw data get by ``page.get_drawings(extended=True)``, where
+        the clipping paths are applied to the visible bbox of the paths under them.'''
         rect = (0, 0, self.parent.width, self.parent.height)
+        scissors = [] # stack of (level, clipping rect)
         for raw in raws:
+            # a clipping path applies to the following items with higher level
+            level = raw.get('level', 0)
+            while scissors and scissors[-1][0]>=level: scissors.pop()
+            if raw['type']=='clip':
+                scissor = fitz.Rect(raw['scissor'])
+                if scissors: scissor &= scissors[-1][1]
+                scissors.append((level, scissor))
+                continue
+            if raw['type']=='group': continue
+
             path = Path(raw)
             # ignore path out of page
             if not path.bbox.intersects(rect): continue
+            if scissors: path.visible_bbox &= scissors[-1][1]
             self.append(path)
 
         return self
@@ -76,13 +91,18 @@ class Paths(Collection):
                              min_svg_gap_dy:float=15,
                              min_w:float=2,
                              min_h:float=2,
-                             clip_image_res_ratio:float=3.0):
+                             clip_image_res_ratio:float=3.0,
+                             render_context=None):
         '''Convert paths to iso-oriented shapes or images. The semantic type of path is either
         table/text style or vector graphic. This method is to:
         * detect svg regions -> exist at least one non-iso-oriented path
         * convert svg to bitmap by clipping page
         * convert the rest paths to iso-oriented shapes for further table/text style parsing
 
+        The svg regions are detected from path geometry first, i.e. group connected paths and
+        classify each group; the page is rasterized to detect contours only for the ambiguous
+        groups.
+
         Args:
             min_svg_gap_dx (float): Merge svg if the horizontal gap is less than this value.
             min_svg_gap_dy (float): Merge svg if the vertical gap is less than this value.
@@ -90,9 +110,12 @@ class Paths(Collection):
             min_h (float): Ignore contours if the bbox height is less than this value.
             clip_image_res_ratio (float, optional): Resolution ratio of clipped bitmap.
                 Defaults to 3.0.
+            render_context (RenderContext, optional): Render context shared by this page.
+                Defaults to None.
 
         Returns:
-            tuple: (list of shape raw dict, list of image raw dict).
+            tuple: (list of shape raw dict, list of image raw dict), where the images are
+            pending to encode by ``ImagesExtractor.encode_images()``.
         '''
         # convert all paths to shapes if no non-iso-orientated path exists
         iso_shapes = []
@@ -100,16 +123,151 @@ class Paths(Collection):
             iso_shapes.extend(self.to_shapes())
             return iso_shapes, []
 
-        # detect svg with python opencv
+        ie = ImagesExtractor(self.parent.page_engine, render_context, self.parent.clip)
+        svg_bboxes = []
+        for paths in self._group_by_visible_connectivity(min_svg_gap_dx, min_svg_gap_dy):
+            # all iso-oriented paths -> it's a table or text style
+            if paths.is_iso_oriented:
+                iso_shapes.extend(paths.to_shapes())
+                continue
+
+            # otherwise, check the layout of graphic regions
+            iso_paths, bboxes = paths._split_svg_regions(min_svg_gap_dx, min_svg_gap_dy)
+
+            # iso paths surround graphic regions -> a table with svg in cell
+            if iso_paths is not None:
+                iso_shapes.extend(iso_paths.to_shapes())
+                svg_bboxes.extend(bboxes)
+
+            # graphic regions cover most of this group -> a vector graphic, e.g. a chart
+            elif sum(fitz.Rect(bbox).get_area() for bbox in bboxes) >= \
+                    constants.FACTOR_A_HALF * paths.bbox.get_area():
+                svg_bboxes.append(paths.bbox)
+
+            # ambiguous -> detect svg with python opencv in this region
+            else:
+                groups = ie.detect_svg_contours(min_svg_gap_dx, min_svg_gap_dy, min_w, min_h,
+                                                bbox=paths.bbox)
+                shapes, bboxes = paths._classify_by_contours(groups)
+                iso_shapes.extend(shapes)
+                svg_bboxes.extend(bboxes)
+
+        # the region detected from page bitmap might cover the other groups, e.g. parts of a
+        # chart separated by blank; so remove svg regions and shapes contained in other region
+        svg_bboxes = [fitz.Rect(bbox) for bbox in svg_bboxes]
+        svg_bboxes = [bbox for i, bbox in enumerate(svg_bboxes) if not any(
+            j!=i and other.contains(bbox) and (other!=bbox or j<i) \
+                for j, other in enumerate(svg_bboxes))]
+        def shape_bbox(shape): # fill or stroke
+            return fitz.Rect(shape['bbox'] if 'bbox' in shape else (*shape['start'], *shape['end']))
+        iso_shapes = [shape for shape in iso_shapes if not any(
+            bbox.contains(shape_bbox(shape)) for bbox in svg_bboxes)]
+
+        # convert svg to bitmap by clipping page
         images = []
-        ie = ImagesExtractor(self.parent.page_engine)
-        groups = ie.detect_svg_contours(min_svg_gap_dx, min_svg_gap_dy, min_w, min_h)
-
-        # `bbox` is the external bbox of current region, while `inner_bboxes` are the inner contours
-        # of level-2 hierarchy, i.e. contours under table cell.
-        # * it a table (or text style) if paths contained in `bbox` but excluded from `inner_bboxes`
-        #   are all iso-oriented -> export iso-shapes, clip page image based on `inner_bboxes`;
-        # * otherwise, it's a vector graphic -> clip page image (without any text) based on `bbox`
+        clip = self.parent.clip
+        for bbox in svg_bboxes:
+            if bbox.width<min_w or bbox.height<min_h: continue
+            if clip is not None and not bbox.intersects(clip): continue # out of region of interest
+            images.append(ie.clip_page_to_dict(bbox=bbox,
+                                               rm_image=True,
+                                               clip_image_res_ratio=clip_image_res_ratio,
+                                               encode=False))
+
+        return iso_shapes, images
+
+
+    def _group_by_visible_connectivity(self, dx:float, dy:float):
+        '''Group visible paths by connectivity, i.e. the regions leaving ink on page. An
+        invisible path, e.g. white filling, joins the group intersected with it if iso-oriented;
+        otherwise it's ignored.
+
+        Args:
+            dx (float): Connected if the horizontal gap is less than this value.
+            dy (float): Connected if the vertical gap is less than this value.
+
+        Returns:
+            list: A list of ``Paths``.
+        '''
+        visible_paths, hidden_paths = [], []
+        for path in self._instances:
+            if path.is_visible:
+                visible_paths.append(path)
+            elif path.is_iso_oriented:
+                hidden_paths.append(path)
+
+        # the tolerance is applied to both rects when checking connectivity
+        groups = group_rects_by_connectivity([path.visible_bbox for path in visible_paths],
+                                             dx/2, dy/2)
+        groups = [[visible_paths[i] for i in group] for group in groups]
+        bboxes = []
+        for group in groups:
+            bbox = fitz.Rect()
+            for path in group: bbox |= path.bbox
+            bboxes.append(bbox)
+
+        for path in hidden_paths:
+            for group, bbox in zip(groups, bboxes):
+                if path.bbox.intersects(bbox):
+                    group.append(path)
+                    break
+
+        return [Paths(group) for group in groups]
+
+
+    def _split_svg_regions(self, dx:float, dy:float):
+        '''Split graphic regions, i.e. connected non-iso-oriented paths, from the iso-oriented
+        paths of this group.
+
+        Args:
+            dx (float): Connected if the horizontal gap is less than this value.
+            dy (float): Connected if the vertical gap is less than this value.
+
+        Returns:
+            tuple: (iso-oriented ``Paths`` outside graphic regions, list of graphic region bbox).
+            The first item is None if any iso-oriented path crosses the boundary of graphic
+            region, i.e. the layout can't be decided by geometry.
+        '''
+        svg_rects, iso_paths = [], Paths()
+        for path in self._instances:
+            if path.is_iso_oriented:
+                iso_paths.append(path)
+            else:
+                svg_rects.append(path.visible_bbox)
+
+        svg_bboxes = []
+        for group in group_rects_by_connectivity(svg_rects, dx/2, dy/2):
+            bbox = fitz.Rect()
+            for i in group: bbox |= svg_rects[i]
+            svg_bboxes.append(bbox)
+
+        # iso-oriented paths contained in graphic region belong to that graphic
+        outside_paths = Paths()
+        for path in iso_paths:
+            for bbox in svg_bboxes:
+                if bbox.contains(path.bbox): break
+                if bbox.intersects(path.bbox): return None, svg_bboxes
+            else:
+                outside_paths.append(path)
+
+        return outside_paths, svg_bboxes
+
+
+    def _classify_by_contours(self, groups:list):
+        '''Classify paths of this group with contours detected from page bitmap.
+
+        `bbox` is the external bbox of current region, while `inner_bboxes` are the inner contours
+        of level-2 hierarchy, i.e. contours under table cell.
+        * it a table (or text style) if paths contained in `bbox` but excluded from `inner_bboxes`
+          are all iso-oriented -> export iso-shapes, clip page image based on `inner_bboxes`;
+        * otherwise, it's a vector graphic -> clip page image (without any text) based on `bbox`
+
+        Args:
+            groups (list): A list of potential svg region: (external_bbox, inner_bboxes:list).
+
+        Returns:
+            tuple: (list of shape raw dict, list of svg bbox to clip).
+        '''
         def contained_in_inner_contours(path:Path, contours:list):
             for bbox in contours:
                 if fitz.Rect(bbox).contains(path.bbox): return True
@@ -124,19 +282,15 @@ class Paths(Collection):
                     break
 
         # check each group
-        for (bbox, inner_bboxes), paths in zip(groups, group_paths): 
+        iso_shapes, svg_bboxes = [], []
+        for (bbox, inner_bboxes), paths in zip(groups, group_paths):
             # all iso-oriented paths -> it's a table, but might contain svg in cell as well
             if paths.is_iso_oriented:
                 iso_shapes.extend(paths.to_shapes())
-                for svg_bbox in inner_bboxes:
-                    images.append(ie.clip_page_to_dict(bbox=fitz.Rect(svg_bbox),
-                                                        rm_image=True,
-                                                        clip_image_res_ratio=clip_image_res_ratio))
+                svg_bboxes.extend(inner_bboxes)
 
             # otherwise, it's a svg
             else:
-                images.append(ie.clip_page_to_dict(bbox=fitz.Rect(bbox),
-                                                   rm_image=True,
-                                                   clip_image_res_ratio=clip_image_res_ratio))
+                svg_bboxes.append(bbox)
 
-        return iso_shapes, images
+        return iso_shapes, svg_bboxes
@@ -53,6 +53,8 @@ from ..common import constants
 
 class Shape(Element):
     ''' Shape object.'''
+    __slots__ = ('color', '_type', '_potential_type')
+
     def __init__(self, raw:dict=None):        
         raw = raw or {}
         self.color = raw.get('color', 0)
@@ -141,6 +143,8 @@ class Stroke(Shape):
     ''' Horizontal or vertical stroke of a path. 
         The semantic meaning may be table border, or text style line like underline and strike-through.
     '''
+    __slots__ = ('_start', '_end', 'width')
+
     def __init__(self, raw:dict=None):
         raw = raw or {}
         # NOTE: real page CS
@@ -269,6 +273,7 @@ class Fill(Shape):
     ''' Rectangular (bbox) filling area of a closed path. 
         The semantic meaning may be table shading, or text style like highlight.
     '''
+    __slots__ = ()
 
     def to_stroke(self, max_border_width:float):
         '''Convert to Stroke instance based on width criterion.
@@ -338,6 +343,7 @@ class Hyperlink(Shape):
     explicitly. To reuse the process that identifying applied text of text style shape (e.g. underline and 
     highlight), hyperlink is also abstracted to be a ``Shape``.
     '''
+    __slots__ = ('uri',)
 
     def __init__(self, raw:dict=None):
         '''Initialize from raw dict. Note the type must be determined in advance.'''
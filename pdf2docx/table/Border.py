@@ -32,6 +32,8 @@ from ..common.Collection import BaseCollection
 
 class Border:
     '''Border for stream table.'''
+    __slots__ = ('border_type', 'finalized', 'is_reference', 'LRange', 'URange',
+                '_LBorder', '_UBorder', '_value', 'width', 'color')
 
     def __init__(self, border_type='hi', border_range:tuple=None, borders:tuple=None, reference:bool=False):
         '''Border for stream table.
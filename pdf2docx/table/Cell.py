@@ -1,13 +1,13 @@
 '''Table Cell object.'''
 
-from docx.shared import Pt
 from ..common.Element import Element
 from ..layout.Layout import Layout
-from ..common import docx
 
 
 class Cell(Layout):
     '''Cell object.'''
+    __slots__ = ('bg_color', 'border_color', 'border_width', 'merged_cells')
+
     def __init__(self, raw:dict=None):
         raw = raw or {}
         super().__init__()
@@ -70,15 +70,15 @@ class Cell(Layout):
         self.blocks.plot(page)
 
 
-    def make_docx(self, table, indexes):
+    def make_docx(self, writer, indexes):
         '''Set cell style and assign contents.
 
         Args:
-            table (Table): ``python-docx`` table instance.
+            writer (BaseWriter): Docx writer.
             indexes (tuple): Row and column indexes, ``(i, j)``.
         '''
-        # set cell style, e.g. border, shading, cell width
-        self._set_style(table, indexes)
+        # set cell style, e.g. border, shading
+        self._set_style(writer, indexes)
 
         # ignore merged cells
         if not bool(self):  return
@@ -86,44 +86,34 @@ class Cell(Layout):
         # merge cells
         n_row, n_col = self.merged_cells
         i, j = indexes
-        docx_cell = table.cell(i, j)
-        if n_row*n_col != 1 and ((i+n_row-1) * table._column_count + j+n_col-1) < len(table._cells): # check whether index is over length of cells
-            _cell = table.cell(i+n_row-1, j+n_col-1)
-            try:
-                docx_cell.merge(_cell)
-            except Exception as e:
-                def show(c):
-                    return f'[_tc.top={c._tc.top} _tc.bottom={c._tc.bottom}]'
-                raise Exception(f'Failed to merge docx_cell={show(docx_cell)} _cell={show(_cell)}. {i=} {j=} {n_row=} {n_col=}') from e
+        if n_row*n_col != 1: writer.merge_cells(i, j, n_row, n_col)
 
         # ---------------------
         # cell width (cell height is set by row height)
         # ---------------------
         # experience: width of merged cells may change if not setting width for merged cells
         x0, y0, x1, y1 = self.bbox
-        docx_cell.width = Pt(x1-x0)
+        writer.set_cell_width(i, j, x1-x0)
 
         # insert contents
         # NOTE: there exists an empty paragraph already in each cell, which should be deleted
-        # first to avoid unexpected layout. `docx_cell._element.clear_content()` works here.
-        # But, docx requires at least one paragraph in each cell, otherwise resulting in a
-        # repair error.
+        # first to avoid unexpected layout. But, docx requires at least one paragraph in each
+        # cell, otherwise resulting in a repair error. So clear it only if any contents.
         if self.blocks:
-            docx_cell._element.clear_content()
-            self.blocks.make_docx(docx_cell)
+            writer.start_cell(i, j)
+            self.blocks.make_docx(writer)
+            writer.end_cell()
 
 
-    def _set_style(self, table, indexes):
-        '''Set ``python-docx`` cell style, e.g. border, shading, width, row height,
-        based on cell block parsed from PDF.
+    def _set_style(self, writer, indexes):
+        '''Set docx cell style, e.g. border, shading, text direction, based on cell block
+        parsed from PDF.
 
         Args:
-            table (Table): ``python-docx`` table object.
+            writer (BaseWriter): Docx writer.
             indexes (tuple): ``(i, j)`` index of current cell in table.
         '''
         i, j = indexes
-        docx_cell = table.cell(i, j)
-        n_row, n_col = self.merged_cells
 
         # ---------------------
         # border style
@@ -141,25 +131,9 @@ class Cell(Layout):
                 'sz': 8*w, 'val': 'single', 'color': hex_c.upper()
             }
 
-        # merged cells are assumed to have same borders with the main cell
-        for m in range(i, i+n_row):
-            for n in range(j, j+n_col):
-                if len(table._cells) > m * table._column_count + n: # check whether index is over length of cells
-                    docx.set_cell_border(table.cell(m, n), **kwargs)
-
-        # ---------------------
-        # cell bg-color
-        # ---------------------
-        if self.bg_color is not None:
-            docx.set_cell_shading(docx_cell, self.bg_color)
-
-        # ---------------------
-        # clear cell margin
-        # ---------------------
-        # NOTE: the start position of a table is based on text in cell, rather than
-        # left border of table. They're almost aligned if left-margin of cell is zero.
-        docx.set_cell_margins(docx_cell, start=0, end=0)
-
-        # set vertical direction if contained text blocks are in vertical direction
-        if self.blocks.is_vertical_text:
-            docx.set_vertical_cell_direction(docx_cell)
+        # merged cells are assumed to have same borders with the main cell; the cell margins
+        # are cleared, since the start position of a table is based on text in cell, rather
+        # than left border of table. They're almost aligned if left-margin of cell is zero.
+        # Set vertical direction if contained text blocks are in vertical direction.
+        writer.set_cell_style(i, j, kwargs, self.bg_color, self.blocks.is_vertical_text,
+                              self.merged_cells)
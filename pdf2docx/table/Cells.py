@@ -23,5 +23,6 @@ class Cells(ElementCollection):
     def append(self, cell:Cell):
         '''Override. Append a cell (allow empty cell, i.e. merged cells) and update bbox accordingly.'''
         self._instances.append(cell)
+        self._include_bbox(cell)
         self._update_bbox(cell)
         cell.parent = self._parent # set parent
@@ -3,8 +3,6 @@
 '''Row in a table.
 '''
 
-from docx.enum.table import WD_ROW_HEIGHT
-from docx.shared import Pt
 from .Cells import Cells
 from ..common.Element import Element
 
@@ -53,26 +51,19 @@ class Row(Element):
         return res
 
 
-    def make_docx(self, table, idx_row:int):
+    def make_docx(self, writer, idx_row:int):
         '''Create row of docx table.
         
         Args:
-            table (Table): ``python-docx`` table instance.
+            writer (BaseWriter): Docx writer.
             idx_row (int): Current row index.
         '''  
-        # set row height
-        docx_row = table.rows[idx_row]
-
-        # to control the layout precisely, set `exact` value, rather than `at least` value
-        # the associated steps in MS word: Table Properties -> Row -> Row height -> exactly
-        docx_row.height_rule = WD_ROW_HEIGHT.EXACTLY
-
         if self.height < 0: # to prevent negative height validation
             self.height = 0
 
         # NOTE: row height is counted from center-line of top border to center line of bottom border
-        docx_row.height = Pt(self.height)
+        writer.set_row_height(idx_row, self.height)
 
         # set cell style and contents
-        for idx_col in range(len(table.columns)):
-            self._cells[idx_col].make_docx(table, (idx_row, idx_col))
\ No newline at end of file
+        for idx_col, cell in enumerate(self._cells):
+            cell.make_docx(writer, (idx_row, idx_col))
\ No newline at end of file
@@ -34,7 +34,6 @@ Data Structure::
 from .Row import Row
 from .Rows import Rows
 from ..common.Block import Block
-from ..common import docx
 
 
 class TableBlock(Block):
@@ -160,15 +159,16 @@ class TableBlock(Block):
                 cell.plot(page)
 
 
-    def make_docx(self, table):
+    def make_docx(self, writer):
         '''Create docx table.
         
         Args:
-            table (Table): ``python-docx`` table instance.
+            writer (BaseWriter): Docx writer.
         '''
-        # set left indent
-        docx.indent_table(table, self.left_space)
+        # new table with left indent
+        writer.start_table(self.num_rows, self.num_cols, self.left_space)
 
         # set format and contents row by row
-        for idx_row in range(len(table.rows)):
-            self._rows[idx_row].make_docx(table, idx_row)
\ No newline at end of file
+        for idx_row, row in enumerate(self._rows):
+            row.make_docx(writer, idx_row)
+        writer.end_table()
\ No newline at end of file
@@ -9,9 +9,16 @@ Data structure refer to this `link <https://pymupdf.readthedocs.io/en/latest/tex
         'c'     : str, 
         'origin': (x,y)
     }
+
+To save memory and construction time, chars are generally stored in ``TextSpan`` as packed arrays,
+i.e. a string of all char codes plus ``(n,4)`` bbox and ``(n,2)`` origin arrays, and ``Char``
+instances are created on demand as views of the packed data. The helper functions below work on
+these arrays directly, with results identical to the per-``Char`` operations.
 '''
 
 
+import fitz
+import numpy as np
 from ..common.constants import INVALID_CHARS
 from ..common.Element import Element
 from ..shape.Shape import Shape
@@ -19,6 +26,8 @@ from ..shape.Shape import Shape
 
 class Char(Element):
     '''Object representing a character.'''
+    __slots__ = ('c', 'origin')
+
     def __init__(self, raw:dict=None):
         if raw is None: raw = {}
 
@@ -31,6 +40,14 @@ class Char(Element):
         super().__init__(raw) # NOTE: ignore parent element for Char instance
 
 
+    @classmethod
+    def from_packed(cls, c:str, bbox, origin):
+        '''Create a char view from packed data, where bbox is in real page CS already.'''
+        char = cls({'c': c, 'origin': None if np.isnan(origin[0]) else tuple(origin)})
+        char.update_bbox(bbox)
+        return char
+
+
     def contained_in_rect(self, rect:Shape, horizontal:bool=True):
         """Detect whether it locates in a rect.
 
@@ -62,4 +79,136 @@ class Char(Element):
             'origin': self.origin
         })
 
-        return res
\ No newline at end of file
+        return res
+
+
+def pack_chars(raws:list):
+    """Pack raw chars into a text string and arrays of bbox and origin.
+
+    Args:
+        raws (list): Raw dicts of chars extracted from ``PyMuPDF``.
+
+    Returns:
+        tuple: ``(text, bboxes, origins)``, where ``bboxes`` is converted to real page CS and
+        rounded as ``Element.update_bbox`` does.
+
+    .. note::
+        Control characters and replacement character ``\\ufffd`` (see issue#256) are ignored, so
+        each char in the text string maps to one row of the arrays.
+    """
+    raws = [raw for raw in raws \
+                if raw.get('c', '') not in INVALID_CHARS and raw['c']!='\ufffd']
+    text = ''.join(raw['c'] for raw in raws)
+    if not raws: return text, np.empty((0,4)), np.empty((0,2))
+
+    bboxes = _transform_bboxes([raw['bbox'] for raw in raws], Element.rotation_matrix())
+    bboxes = np.array([round(x,1) for x in bboxes.ravel().tolist()]).reshape(-1,4)
+    origins = np.array([raw.get('origin') or (np.nan, np.nan) for raw in raws], dtype=float)
+    return text, bboxes, origins
+
+
+def union_bboxes(bboxes:np.ndarray):
+    """Union of char bboxes, with empty ones ignored. Same to joining ``fitz.Rect`` one by one.
+
+    Args:
+        bboxes (np.ndarray): Char bboxes in shape ``(n,4)``.
+
+    Returns:
+        fitz.Rect: The union bbox.
+    """
+    bboxes = bboxes[_non_empty(bboxes)]
+    if not len(bboxes): return fitz.Rect()
+    res = (*bboxes[:,:2].min(axis=0), *bboxes[:,2:].max(axis=0))
+
+    # joined with float precision since the second rect
+    if len(bboxes)>1: res = np.array(res, dtype=np.float32)
+    return fitz.Rect(np.asarray(res, dtype=float).tolist())
+
+
+def contained_in_rect(bboxes:np.ndarray, rect:Shape, horizontal:bool=True):
+    """Vectorized version of ``Char.contained_in_rect``.
+
+    Args:
+        bboxes (np.ndarray): Char bboxes in shape ``(n,4)``.
+        rect (Shape): Target rect to check.
+        horizontal (bool, optional): Text direction is horizontal if True. Defaults to True.
+
+    Returns:
+        np.ndarray: Bool array indicating whether each char locates in target rect.
+    """
+    x0, y0, x1, y1 = bboxes.T
+    X0, Y0, X1, Y1 = rect.bbox
+
+    # char in rect?
+    contained = (X0<=x0) & (x0<=x1) & (x1<=X1) & (Y0<=y0) & (y0<=y1) & (y1<=Y1)
+
+    # intersection?
+    s = _intersect(bboxes, rect.bbox)
+    if horizontal:
+        res = s[:,2]-s[:,0] > 0.5*np.maximum(x1-x0, 0)
+    else:
+        res = s[:,3]-s[:,1] > 0.5*np.maximum(y1-y0, 0)
+    return contained | (_non_empty(s) & res)
+
+
+def main_in_rect(bboxes:np.ndarray, rect, threshold:float=0.95):
+    """Vectorized version of ``Char.get_main_bbox``, i.e. whether the intersection with target
+    rect exceeds the threshold.
+
+    Args:
+        bboxes (np.ndarray): Char bboxes in shape ``(n,4)``.
+        rect (fitz.Rect): Target rect.
+        threshold (float, optional): Intersection rate. Defaults to 0.95.
+
+    Returns:
+        np.ndarray: Bool array.
+    """
+    rect = fitz.Rect(rect)
+    s = _intersect(bboxes, rect)
+    valid = _non_empty(s)
+    a1 = _area(bboxes)
+    a2 = rect.get_area()
+    a = _area(s)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor = a / np.minimum(a1, a2)
+    return valid & (factor >= threshold)
+
+
+def _non_empty(bboxes:np.ndarray):
+    return (bboxes[:,0]<bboxes[:,2]) & (bboxes[:,1]<bboxes[:,3])
+
+
+def _area(bboxes:np.ndarray):
+    return np.maximum(bboxes[:,2]-bboxes[:,0], 0) * np.maximum(bboxes[:,3]-bboxes[:,1], 0)
+
+
+def _intersect(bboxes:np.ndarray, rect:fitz.Rect):
+    """Intersection of each bbox with ``rect``, following ``fitz.Rect.intersect``, i.e. intersected
+    with float precision, or the empty one of the two rects."""
+    if rect.is_empty: return np.tile(np.array(tuple(rect), dtype=float), (len(bboxes),1))
+    res = np.concatenate((np.maximum(bboxes[:,:2], tuple(rect)[:2]),
+                        np.minimum(bboxes[:,2:], tuple(rect)[2:])), axis=1)
+    res = res.astype(np.float32).astype(float)
+    empty = ~_non_empty(bboxes)
+    res[empty] = bboxes[empty]
+    return res
+
+
+def _transform_bboxes(bboxes:list, matrix:fitz.Matrix):
+    """Transform bboxes with float precision, i.e. ``fitz.Rect(bbox) * matrix`` for each bbox."""
+    a, b, c, d, e, f = (np.float32(v) for v in matrix)
+    eps = np.finfo(np.float32).eps
+    x0, y0, x1, y1 = np.array(bboxes, dtype=np.float32).reshape(-1,4).T
+
+    # rectilinear matrix, e.g. page rotation 0/90/180/270 degrees
+    if abs(b)<eps and abs(c)<eps:
+        if a<0: x0, x1 = x1, x0
+        if d<0: y0, y1 = y1, y0
+    elif abs(a)<eps and abs(d)<eps:
+        if b<0: x0, x1 = x1, x0
+        if c<0: y0, y1 = y1, y0
+    else:
+        return np.array([tuple(fitz.Rect(bbox)*matrix) for bbox in bboxes], dtype=float)
+
+    res = (x0*a+y0*c+e, x0*b+y0*d+f, x1*a+y1*c+e, x1*b+y1*d+f)
+    return np.stack(res, axis=1).astype(float)
@@ -30,6 +30,8 @@ from ..image.ImageSpan import ImageSpan
 
 class Line(Element):
     '''Object representing a line in text block.'''
+    __slots__ = ('wmode', 'dir', 'line_break', 'tab_stop', 'spans')
+
     def __init__(self, raw:dict=None):
         if raw is None: raw = {}
 
@@ -164,16 +166,16 @@ class Line(Element):
         return line
 
 
-    def make_docx(self, p):
-        '''Create docx line, i.e. a run in ``python-docx``.'''
+    def make_docx(self, writer):
+        '''Create docx line, i.e. runs in last paragraph.'''
         # tab stop before this line to ensure horizontal position
         # Note it might need more than one tabs if multi-tabs are set for current paragraph
         if self.tab_stop: 
-            for _ in range(self.tab_stop): p.add_run().add_tab()
+            for _ in range(self.tab_stop): writer.add_tab()
 
         # create span -> run in paragraph
-        for span in self.spans: span.make_docx(p)            
+        for span in self.spans: span.make_docx(writer)            
 
         # line break
-        if self.line_break: p.add_run('\n')
+        if self.line_break: writer.add_line_break()
             
@@ -128,28 +128,22 @@ class Lines(ElementCollection):
         for i, line in enumerate(self._instances[:-1]):
             # last char in this line
             end_span = line.spans[-1]
-            if not isinstance(end_span, TextSpan): continue
-            end_chars = end_span.chars
-            if not end_chars: continue 
-            end_char = end_chars[-1]
+            if not isinstance(end_span, TextSpan) or not end_span.num_chars: continue
+            end_c = end_span.text[-1]
 
             # first char in next line
             start_span = self._instances[i+1].spans[0]
-            if not isinstance(start_span, TextSpan): continue
-            start_chars = start_span.chars
-            if not start_chars: continue 
-            next_start_char = start_chars[0]            
+            if not isinstance(start_span, TextSpan) or not start_span.num_chars: continue
+            next_start_c = start_span.text[0]
 
             # delete hyphen if next line starts with lower case letter
-            if delete_end_line_hyphen and \
-                end_char.c.endswith('-') and next_start_char.c.islower(): 
-                end_char.c = '' # delete hyphen in a tricky way
-
+            if delete_end_line_hyphen and end_c=='-' and next_start_c.islower():
+                end_span.pop_char()
 
             # add a space if both the last char and the first char in next line are alphabet,  
             # number, or English punctuation (excepting hyphen)
-            if is_end_of_english_word(end_char.c) and is_end_of_english_word(next_start_char.c):
-                end_char.c += ' ' # add blank in a tricky way
+            elif is_end_of_english_word(end_c) and is_end_of_english_word(next_start_c):
+                end_span.append_blank()
 
 
     def parse_text_format(self, shape):
@@ -17,7 +17,9 @@ class Spans(ElementCollection):
                 span = ImageSpan(raw_span)
             else:
                 span = TextSpan(raw_span)
-                if not span.text.strip() and not span.style: 
+                # ignore blank span extracted from pdf, but keep the stored one, e.g. the
+                # blank between words, since it's a part of parsed layout
+                if 'chars' in raw_span and not span.text.strip() and not span.style:
                     span = None
 
             self.append(span)
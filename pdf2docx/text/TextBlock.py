@@ -25,7 +25,6 @@ Data structure based on this `link <https://pymupdf.readthedocs.io/en/latest/tex
     }
 '''
 
-from docx.shared import (Pt,Inches)
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from .Lines import Lines
 from ..image.ImageSpan import ImageSpan
@@ -33,7 +32,6 @@ from ..common.share import (RectType, TextAlignment, lower_round)
 from ..common.Block import Block
 from ..common.share import (rgb_component_from_name, lower_round)
 from ..common import constants
-from ..common import docx
 
 
 class TextBlock(Block):
@@ -285,8 +283,8 @@ class TextBlock(Block):
             self.before_space = 0.0
 
 
-    def make_docx(self, p):
-        '''Create paragraph for a text block.
+    def make_docx(self, writer):
+        '''Set format of last paragraph for a text block, and add the lines.
 
         Refer to ``python-docx`` doc for details on text format:
 
@@ -294,26 +292,22 @@ class TextBlock(Block):
         * https://python-docx.readthedocs.io/en/latest/api/enum/WdAlignParagraph.html#wdparagraphalignment
         
         Args:
-            p (Paragraph): ``python-docx`` paragraph instance.
+            writer (BaseWriter): Docx writer.
 
         .. note::
             The left position of paragraph is set by paragraph indent, rather than ``TAB`` stop.
         '''
-        pf = docx.reset_paragraph_format(p)
-
         # ------------------------------------
         # vertical spacing
         # ------------------------------------
         before_spacing = max(round(self.before_space, 1), 0.0)
         after_spacing = max(round(self.after_space, 1), 0.0)
-        pf.space_before = Pt(before_spacing)
-        pf.space_after = Pt(after_spacing)        
 
         # line spacing
         if self.line_space_type==0: # exact line spacing
-            pf.line_spacing = Pt(round(self.line_space, 1))
+            line_spacing, exact = round(self.line_space, 1), True
         else: # relative line spacing
-            pf.line_spacing = round(self.line_space, 2)
+            line_spacing, exact = round(self.line_space, 2), False
 
         # ------------------------------------
         # horizontal alignment
@@ -324,48 +318,46 @@ class TextBlock(Block):
         if self.first_line_space<0: # in case hanging
             left_space -= self.first_line_space           
         
-        pf.left_indent  = Pt(left_space)
-        pf.right_indent  = Pt(self.right_space)
-        pf.first_line_indent = Pt(self.first_line_space)
+        left_indent, right_indent = left_space, self.right_space
+        tab_stops = ()
 
         # (2) set alignment mode and adjust indentation:
         # round indention on the opposite side to lower bound (inches), so it saves more space to 
         # avoid unexpected line break
         if self.alignment==TextAlignment.LEFT:
-            pf.alignment = WD_ALIGN_PARAGRAPH.LEFT            
+            alignment = WD_ALIGN_PARAGRAPH.LEFT            
             # set tab stops to ensure line position
-            for pos in self.tab_stops:
-                pf.tab_stops.add_tab_stop(Pt(self.left_space + pos))
+            tab_stops = [self.left_space + pos for pos in self.tab_stops]
             
             # adjust right indent
-            d = lower_round(self.right_space/constants.ITP, 1)
-            pf.right_indent = Inches(d)
+            right_indent = lower_round(self.right_space/constants.ITP, 1) * constants.ITP
 
         elif self.alignment==TextAlignment.RIGHT:
-            pf.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+            alignment = WD_ALIGN_PARAGRAPH.RIGHT
             
             # adjust left indent
-            d = lower_round(left_space/constants.ITP, 1)
-            pf.left_indent = Inches(d)
+            left_indent = lower_round(left_space/constants.ITP, 1) * constants.ITP
 
         elif self.alignment==TextAlignment.CENTER:
-            pf.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            alignment = WD_ALIGN_PARAGRAPH.CENTER
 
             # adjust both left and right indent
-            d = lower_round(left_space/constants.ITP, 1)
-            pf.left_indent = Inches(d)
-            d = lower_round(self.right_space/constants.ITP, 1)
-            pf.right_indent = Inches(d)
+            left_indent = lower_round(left_space/constants.ITP, 1) * constants.ITP
+            right_indent = lower_round(self.right_space/constants.ITP, 1) * constants.ITP
 
         else:
-            pf.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
+            alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
+
+        writer.set_paragraph_format(
+            line_spacing=line_spacing, exact=exact,
+            space_before=before_spacing, space_after=after_spacing,
+            left_indent=left_indent, right_indent=right_indent,
+            first_line_indent=self.first_line_space, alignment=alignment, tab_stops=tab_stops)
 
         # ------------------------------------
         # add lines
         # ------------------------------------
-        for line in self.lines: line.make_docx(p)
-
-        return p
+        for line in self.lines: line.make_docx(writer)
 
 
 
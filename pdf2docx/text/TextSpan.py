@@ -27,28 +27,29 @@ this `link <https://pymupdf.readthedocs.io/en/latest/textpage.html>`_::
     }
 '''
 
+import copy
 import fitz
-from docx.shared import Pt, RGBColor
-from docx.oxml.ns import qn
-from .Char import Char
+import numpy as np
+from .Char import (Char, pack_chars, union_bboxes, contained_in_rect, main_in_rect)
 from ..common.Element import Element
-from ..common.share import (RectType, rgb_value, rgb_component, decode)
+from ..common.share import (RectType, rgb_value, decode)
 from ..common import constants
-from ..common import docx
 from ..shape.Shape import Shape
 
 
 class TextSpan(Element):
     '''Object representing text span.'''
+    __slots__ = ('color', 'flags', '_c', '_char_bboxes', '_char_origins', '_text', 'font', 'size',
+                'ascender', 'descender', 'line_height', 'style', 'char_spacing')
+
     def __init__(self, raw:dict=None):
         raw = raw or {}
         self.color = raw.get('color', 0)
         self.flags = raw.get('flags', 0)
 
-        # filter empty chars
-        chars = [Char(c) for c in raw.get('chars', [])] # type: list[Char]
-        # ignore replacement character, see issue#256
-        self.chars = [char for char in chars if char.c not in ('', '\ufffd')]
+        # packed chars: char codes, and bbox/origin arrays in same order
+        # NOTE: never change the arrays in place since they might be shared by copied spans
+        self._c, self._char_bboxes, self._char_origins = pack_chars(raw.get('chars', []))
         self._text = raw.get('text', '') # not an original key from PyMuPDF
 
         # font metrics
@@ -73,14 +74,43 @@ class TextSpan(Element):
         super().__init__(raw)
 
         # in rare case, the font is unamed, so change font and update bbox accordingly
-        if self.chars and 'UNNAMED' in self.font.upper():
+        if self._c and 'UNNAMED' in self.font.upper():
             self._change_font_and_update_bbox(constants.DEFAULT_FONT_NAME)
 
 
+    def __deepcopy__(self, memo:dict):
+        '''Copy span with the packed chars shared, since they're never changed in place, e.g.
+        slicing chars creates new arrays (views). Only ``bbox`` and ``style`` are copied.'''
+        span = self.__class__.__new__(self.__class__)
+        memo[id(self)] = span
+        for name in TextSpan.__slots__: setattr(span, name, getattr(self, name))
+        span.bbox = fitz.Rect(self.bbox)
+        span._parent = copy.deepcopy(self._parent, memo)
+        span.style = copy.deepcopy(self.style, memo)
+        return span
+
+
+    @property
+    def chars(self):
+        '''Char instances created from the packed data. Note they're views only, i.e. changing
+        a char doesn't affect this span; set ``chars`` with new instances instead.'''
+        return [Char.from_packed(c, bbox, origin) for c, bbox, origin in zip(
+            self._c, self._char_bboxes.tolist(), self._char_origins.tolist())]
+
+    @chars.setter
+    def chars(self, chars:list):
+        self._c = ''.join(char.c for char in chars)
+        self._char_bboxes = np.array([tuple(char.bbox) for char in chars], dtype=float).reshape(-1,4)
+        self._char_origins = np.array([char.origin or (np.nan, np.nan) for char in chars],
+                                    dtype=float).reshape(-1,2)
+
+    @property
+    def num_chars(self): return len(self._c)
+
     @property
     def text(self):
         '''Get span text. Note joining chars is in a higher priority.'''
-        return ''.join([char.c for char in self.chars]) if self.chars else self._text
+        return self._c if self._c else self._text
 
     @text.setter
     def text(self, value):
@@ -89,9 +119,7 @@ class TextSpan(Element):
 
     def cal_bbox(self):
         '''Calculate bbox based on contained instances.'''
-        bbox = fitz.Rect()
-        for char in self.chars: bbox |= char.bbox
-        return bbox
+        return union_bboxes(self._char_bboxes)
 
     @property
     def is_valid_line_height(self): return self.line_height!=-1
@@ -126,7 +154,7 @@ class TextSpan(Element):
         x0, y0, x1, y1 = self.bbox
         tw = fitz.TextWriter((0, 0, x1, y1))
         rect, _ = tw.append(
-            self.chars[0].origin, # the bottom left point of the first character
+            tuple(self._char_origins[0]), # the bottom left point of the first character
             self.text,
             font=font,
             fontsize=self.size
@@ -141,17 +169,36 @@ class TextSpan(Element):
         self.update_bbox((x0, y0, x1, y1))
 
         # update contained char bbox
-        for char in self.chars:
-            x0, _, x1, _ = char.bbox
-            char.update_bbox((x0, y0, x1, y1))
+        bboxes = self._char_bboxes.copy()
+        bboxes[:,1], bboxes[:,3] = round(y0,1), round(y1,1)
+        self._char_bboxes = bboxes
 
 
     def add(self, char:Char):
         '''Add char and update bbox accordingly.'''
-        self.chars.append(char)
+        self.chars = self.chars + [char]
         self.union_bbox(char)
 
 
+    def pop_char(self):
+        '''Remove the last char, but keep span bbox as it is.'''
+        self._slice_chars(0, -1)
+
+
+    def append_blank(self):
+        '''Append a blank char locating at the last char, so span bbox keeps the same.'''
+        self._c += ' '
+        self._char_bboxes = np.concatenate((self._char_bboxes, self._char_bboxes[-1:]))
+        self._char_origins = np.concatenate((self._char_origins, self._char_origins[-1:]))
+
+
+    def _slice_chars(self, start:int, stop:int=None):
+        '''Keep chars in range ``[start, stop)`` only.'''
+        self._c = self._c[start:stop]
+        self._char_bboxes = self._char_bboxes[start:stop]
+        self._char_origins = self._char_origins[start:stop]
+
+
     def lstrip(self):
         '''Remove blanks at the left side, but keep one blank.'''
         original_text = self.text
@@ -159,7 +206,7 @@ class TextSpan(Element):
 
         # keep one blank
         num_blanks = len(original_text) - len(original_text.lstrip())
-        self.chars = self.chars[num_blanks-1:]
+        self._slice_chars(num_blanks-1)
         self.update_bbox(rect=self.cal_bbox())
         return True
 
@@ -171,7 +218,7 @@ class TextSpan(Element):
 
         # keep one blank
         num_blanks = len(original_text) - len(original_text.rstrip())
-        self.chars = self.chars[:1-num_blanks]
+        self._slice_chars(0, 1-num_blanks)
         self.update_bbox(rect=self.cal_bbox())
         return True
 
@@ -228,12 +275,10 @@ class TextSpan(Element):
             intsec.x1 = self.bbox.x1
 
         # calculate chars in the format rectangle
-        # combine an index with enumerate(), so the second element is the char
-        f = lambda items: items[1].contained_in_rect(rect, horizontal)
-        index_chars = list(filter(f, enumerate(self.chars)))
+        index_chars = np.flatnonzero(contained_in_rect(self._char_bboxes, rect, horizontal))
 
         # then we get target chars in a sequence
-        pos = index_chars[0][0] if index_chars else -1 # start index -1 if nothing found
+        pos = int(index_chars[0]) if len(index_chars) else -1 # start index -1 if nothing found
         length = len(index_chars)
         pos_end = max(pos+length, 0) # max() is used in case: pos=-1, length=0
 
@@ -245,25 +290,25 @@ class TextSpan(Element):
             else:
                 bbox = (self.bbox.x0, intsec.y1, self.bbox.x1, self.bbox.y1)
             split_span = self.copy().update_bbox(bbox)
-            split_span.chars = self.chars[0:pos]
+            split_span._slice_chars(0, pos)
             split_spans.append(split_span)
 
         # middle intersection part if exists
         if length > 0:
             bbox = (intsec.x0, intsec.y0, intsec.x1, intsec.y1)
             split_span = self.copy().update_bbox(bbox)
-            split_span.chars = self.chars[pos:pos_end]            
+            split_span._slice_chars(pos, pos_end)
             split_span._parse_text_format(rect, horizontal)  # update style
             split_spans.append(split_span)
 
         # right part if exists
-        if pos_end < len(self.chars):
+        if pos_end < self.num_chars:
             if horizontal:
                 bbox = (intsec.x1, self.bbox.y0, self.bbox.x1, self.bbox.y1)
             else:
                 bbox = (self.bbox.x0, self.bbox.y0, self.bbox.x1, intsec.y0)
             split_span = self.copy().update_bbox(bbox)
-            split_span.chars = self.chars[pos_end:]
+            split_span._slice_chars(pos_end)
             split_spans.append(split_span)
 
         return split_spans
@@ -345,21 +390,20 @@ class TextSpan(Element):
         if not rect.intersects(self.bbox):
             return TextSpan()
 
-        # further check chars in span
+        # further check chars in span: contains at least a half part
         span = self.copy()
-        span.chars.clear()
-        span.update_bbox((0.0,0.0,0.0,0.0))
-
-        for char in self.chars:
-            if char.get_main_bbox(rect, constants.FACTOR_A_HALF): # contains at least a half part
-                span.chars.append(char)
-                span.union_bbox(char)
+        index_chars = np.flatnonzero(
+            main_in_rect(self._char_bboxes, rect, constants.FACTOR_A_HALF))
+        span._c = ''.join(self._c[i] for i in index_chars)
+        span._char_bboxes = self._char_bboxes[index_chars]
+        span._char_origins = self._char_origins[index_chars]
+        span.update_bbox(span.cal_bbox())
 
         return span
 
 
-    def make_docx(self, paragraph):
-        '''Add text span to a docx paragraph, and set text style, e.g.
+    def make_docx(self, writer):
+        '''Add text span to last docx paragraph, and set text style, e.g.
         font, color, underline, hyperlink, etc.
 
         .. note::
@@ -370,21 +414,11 @@ class TextSpan(Element):
         # Create hyperlink in particular, otherwise add a run directly
         for style in self.style:
             if style['type']==RectType.HYPERLINK.value and self.text.strip():
-                docx_run = docx.add_hyperlink(paragraph, style['uri'], self.text)
+                hyperlink = style['uri']
                 break
         else:
-            docx_run = paragraph.add_run(self.text)
+            hyperlink = None
 
-        # set text style, e.g. font, underline and highlight
-        self._set_text_format(docx_run)
-
-        # set charters spacing
-        if self.char_spacing:
-            docx.set_char_spacing(docx_run, self.char_spacing)
-
-
-    def _set_text_format(self, docx_run):
-        '''Set text format for ``python-docx.run`` object.'''
         # set style
         # https://python-docx.readthedocs.io/en/latest/api/text.html#docx.text.run.Font
 
@@ -395,45 +429,39 @@ class TextSpan(Element):
         # bit 2: serifed (2^2)
         # bit 3: monospaced (2^3)
         # bit 4: bold (2^4)
-        docx_run.superscript = bool(self.flags & 2**0)
-        docx_run.italic = bool(self.flags & 2**1)
-        docx_run.bold = bool(self.flags & 2**4)
-
-        # font name
-        font_name = self.font
-        docx_run.font.name = font_name
-        docx_run._element.rPr.rFonts.set(qn('w:eastAsia'), font_name) # for CJK characters
-        docx_run.font.color.rgb = RGBColor(*rgb_component(self.color))
+        italic = bool(self.flags & 2**1)
+        bold = bool(self.flags & 2**4)
 
         # font size
         # NOTE: only x.0 and x.5 is accepted in docx, so set character scaling accordingly
         # if the font size doesn't meet this condition.
         font_size = round(self.size*2)/2.0
-        docx_run.font.size = Pt(font_size)
 
         # adjust by set scaling
         scale = self.size / (font_size or self.size or 1)
-        if abs(scale-1.0)>=0.01:
-            docx.set_char_scaling(docx_run, scale)
+        if abs(scale-1.0)<0.01: scale = None
 
         # font style parsed from PDF rectangles:
         # e.g. highlight, underline, strike-through-line
+        effects = []
         for style in self.style:
 
             t = style['type']
             # Built-in method is provided to set highlight in python-docx,but supports only
             # limited colors; so, set character shading instead if out of highlight color scope.
             if t==RectType.HIGHLIGHT.value:
-                docx.set_char_shading(docx_run, style['color'])
+                effects.append(('highlight', style['color']))
 
             # underline set with built-in method `font.underline` has a same color with text.
             # so, try to set a different color with xml if necessary
             elif t==RectType.UNDERLINE.value:
-                if self.color==style['color']:
-                    docx_run.font.underline = True
-                else:
-                    docx.set_char_underline(docx_run, style['color'])
+                color = None if self.color==style['color'] else style['color']
+                effects.append(('underline', color))
 
             # same color with text for strike line
             elif t==RectType.STRIKE.value:
-                docx_run.font.strike = True
+                effects.append(('strike', None))
+
+        writer.add_run(self.text, self.font, font_size, self.color, bold=bold, italic=italic,
+                       scale=scale, spacing=self.char_spacing, effects=effects,
+                       hyperlink=hyperlink)
@@ -0,0 +1,233 @@
+'''Docx writer interface, i.e. the docx contents emitted by the layout elements.
+
+The layout elements, e.g. :py:class:`~pdf2docx.page.Page` and
+:py:class:`~pdf2docx.text.TextBlock`, describe the docx contents with the events of a writer:
+page and section, paragraph and run, image, and table and cell. A writer serializes the events
+to a docx package, e.g. :py:class:`~pdf2docx.writer.DocxWriter` with ``python-docx`` and
+:py:class:`~pdf2docx.writer.StreamWriter` with lightweight xml elements.
+
+.. note::
+    Lengths are in Pt. Paragraphs and tables are added to the current container, i.e. the
+    document body, or the table cell started by :py:meth:`BaseWriter.start_cell`. Runs and
+    images are added to the last added paragraph, while the cell events refer to the last
+    started table.
+'''
+
+from abc import (ABC, abstractmethod)
+from ..common.docx import CharStyles
+
+
+class BaseWriter(ABC):
+    '''Base class of docx writers.'''
+
+    def __init__(self, document, char_style:bool=False):
+        '''
+        Args:
+            document (Document): ``python-docx`` document, which provides the styles.
+            char_style (bool, optional): Share text format of runs by character styles.
+                Defaults to False.
+        '''
+        self._document = document
+        self._char_styles = CharStyles(document.styles) if char_style else None
+
+
+    def _char_style_id(self, font:str, size:float, color:int, bold:bool, italic:bool):
+        '''Id of the character style for the basic font format, or None if the format is set
+        as direct formatting of run.'''
+        if self._char_styles is None: return None
+        return self._char_styles.style_id(font, color, size, bold, italic)
+
+
+    # -----------------------------------------------
+    # page and section
+    # -----------------------------------------------
+    @abstractmethod
+    def add_page(self, width:float, height:float, margin:tuple):
+        '''Start a new page, i.e. a new section starting from next page unless the document
+        is empty.
+
+        Args:
+            width (float): Page width.
+            height (float): Page height.
+            margin (tuple): Page margin ``(left, right, top, bottom)``.
+        '''
+
+    @abstractmethod
+    def add_section(self, start_type, space_before:float=None):
+        '''Start a new section in current page.
+
+        Args:
+            start_type (WD_SECTION): Section start type, e.g. ``CONTINUOUS``, ``NEW_COLUMN``.
+            space_before (float, optional): Vertical space before the new section, which is
+                set to the after space of last paragraph. Defaults to None.
+        '''
+
+    @abstractmethod
+    def set_columns(self, width_list:list, space:float=0):
+        '''Set columns of current section.
+
+        Args:
+            width_list (list): Width of each column.
+            space (float, optional): Space between adjacent columns. Defaults to 0.
+        '''
+
+
+    # -----------------------------------------------
+    # paragraph and run
+    # -----------------------------------------------
+    @abstractmethod
+    def add_paragraph(self):
+        '''Add an empty paragraph without any properties.'''
+
+    @abstractmethod
+    def set_paragraph_format(self, line_spacing:float=1.05, exact:bool=False,
+                            space_before:float=0.0, space_after:float=0.0,
+                            left_indent:float=0.0, right_indent:float=0.0,
+                            first_line_indent:float=None, alignment=None, tab_stops:list=()):
+        '''Set format of last paragraph. The spacing between Chinese and Latin/number isn't
+        adjusted.
+
+        Args:
+            line_spacing (float, optional): Line spacing in Pt if ``exact``, otherwise relative
+                to single line. Defaults to 1.05.
+            exact (bool, optional): Exact line spacing. Defaults to False.
+            space_before (float, optional): Space before paragraph. Defaults to 0.0.
+            space_after (float, optional): Space after paragraph. Defaults to 0.0.
+            left_indent (float, optional): Left indent. Defaults to 0.0.
+            right_indent (float, optional): Right indent. Defaults to 0.0.
+            first_line_indent (float, optional): First line indent, hanging if negative.
+                Defaults to None, i.e. not set.
+            alignment (WD_ALIGN_PARAGRAPH, optional): Alignment. Defaults to None.
+            tab_stops (list, optional): Position of the left aligned tab stops.
+        '''
+
+    @abstractmethod
+    def add_run(self, text:str, font:str, size:float, color:int, bold:bool=False,
+                italic:bool=False, scale:float=None, spacing:float=0.0, effects:list=(),
+                hyperlink:str=None):
+        '''Add a text run to last paragraph.
+
+        Args:
+            text (str): Text. ``\\t`` and ``\\n`` are converted to tab and line break.
+            font (str): Font name.
+            size (float): Font size, a multiple of 0.5.
+            color (int): Font color.
+            bold (bool, optional): Bold font. Defaults to False.
+            italic (bool, optional): Italic font. Defaults to False.
+            scale (float, optional): Character scaling, e.g. ``1.2``. Defaults to None.
+            spacing (float, optional): Character spacing, expand if positive else condense.
+                Defaults to 0.0.
+            effects (list, optional): ``(name, color)`` of text effects in order, where name
+                is ``highlight``, ``underline`` or ``strike``. The color of underline is None
+                if same to the text.
+            hyperlink (str, optional): Url of hyperlink. Defaults to None.
+        '''
+
+    @abstractmethod
+    def add_tab(self):
+        '''Add a tab to last paragraph.'''
+
+    @abstractmethod
+    def add_line_break(self):
+        '''Add a line break to last paragraph.'''
+
+
+    # -----------------------------------------------
+    # image
+    # -----------------------------------------------
+    @abstractmethod
+    def add_image(self, image:bytes, x:float, y:float, width:float, height:float,
+                  rotation:int=0):
+        '''Add an image to last paragraph, positioned relative to the page.
+
+        Args:
+            image (bytes): Image bytes.
+            x (float): Horizontal position.
+            y (float): Vertical position.
+            width (float): Displayed width.
+            height (float): Displayed height.
+            rotation (int, optional): Clockwise rotation angle, a multiple of 90.
+        '''
+
+    @abstractmethod
+    def add_float_image(self, image:bytes, x:float, y:float, width:float, rotation:int=0):
+        '''Add an image behind text, to the first paragraph of current page.
+
+        Args:
+            image (bytes): Image bytes.
+            x (float): Horizontal position relative to the page.
+            y (float): Vertical position relative to the page.
+            width (float): Displayed width, while the height is scaled accordingly.
+            rotation (int, optional): Clockwise rotation angle, a multiple of 90.
+        '''
+
+
+    # -----------------------------------------------
+    # table and cell
+    # -----------------------------------------------
+    @abstractmethod
+    def start_table(self, num_rows:int, num_cols:int, indent:float=0.0):
+        '''Add a table with fixed layout, whose cells are referred by the following cell events.
+
+        Args:
+            num_rows (int): Count of rows.
+            num_cols (int): Count of columns.
+            indent (float, optional): Left indent. Defaults to 0.0.
+        '''
+
+    @abstractmethod
+    def end_table(self):
+        '''End last started table.'''
+
+    @abstractmethod
+    def set_row_height(self, i:int, height:float):
+        '''Set exact height of the i-th row.'''
+
+    @abstractmethod
+    def set_cell_style(self, i:int, j:int, borders:dict, bg_color:int=None,
+                       vertical:bool=False, span:tuple=(1, 1)):
+        '''Set style of cell ``(i, j)``. The cell margins on both sides are cleared, so the text
+        is aligned to the table border.
+
+        Args:
+            i (int): Row index.
+            j (int): Column index.
+            borders (dict): Border style of edges, e.g. ``{'top': {'sz': 8, 'val': 'single',
+                'color': '#000000'}}``. It applies to all the cells in ``span``.
+            bg_color (int, optional): Background color. Defaults to None.
+            vertical (bool, optional): Vertical text direction. Defaults to False.
+            span (tuple, optional): ``(n_row, n_col)`` of the merged region. Defaults to (1, 1).
+
+        .. note::
+            Like the grid of ``python-docx`` table, ``(i, j)`` is the ``i*num_cols+j``-th
+            position of the grid, and ignored if out of the grid.
+        '''
+
+    @abstractmethod
+    def merge_cells(self, i:int, j:int, n_row:int, n_col:int):
+        '''Merge the region of ``n_row`` rows and ``n_col`` columns from cell ``(i, j)``.
+        Ignored if the region is out of the grid.'''
+
+    @abstractmethod
+    def set_cell_width(self, i:int, j:int, width:float):
+        '''Set width of cell ``(i, j)``.'''
+
+    @abstractmethod
+    def start_cell(self, i:int, j:int):
+        '''Clear contents of cell ``(i, j)`` and take it as the container of the following
+        paragraphs and tables, until :py:meth:`end_cell`.'''
+
+    @abstractmethod
+    def end_cell(self):
+        '''End last started cell.'''
+
+
+    # -----------------------------------------------
+    # output
+    # -----------------------------------------------
+    @abstractmethod
+    def save(self, filename_or_stream=None):
+        '''Save docx package to file or stream.'''
+
+    def discard(self):
+        '''Close the writer without saving, e.g. when failed to make pages.'''
@@ -0,0 +1,236 @@
+'''Docx writer with ``python-docx``, the reference implementation of docx writer.'''
+
+from io import BytesIO
+from docx import Document
+from docx.enum.section import WD_SECTION
+from docx.enum.table import WD_ROW_HEIGHT
+from docx.shared import Pt, RGBColor
+from docx.table import _Cell
+from ..common import docx
+from ..common.share import rgb_component
+from .BaseWriter import BaseWriter
+
+
+class DocxWriter(BaseWriter):
+    '''Docx writer creating a ``python-docx`` document.'''
+
+    def __init__(self, document=None, char_style:bool=False):
+        '''
+        Args:
+            document (Document, optional): ``python-docx`` document to write. Defaults to
+                None, i.e. a new document.
+            char_style (bool, optional): Share text format of runs by character styles.
+                Defaults to False.
+        '''
+        super().__init__(document or Document(), char_style)
+        self._section = None
+        self._page_start = None # the last paragraph before current page
+        self._containers = [self._document] # document and started cells
+        self._tables = [] # cells grid of started tables
+        self._p = None # last paragraph
+
+
+    # -----------------------------------------------
+    # page and section
+    # -----------------------------------------------
+    def add_page(self, width:float, height:float, margin:tuple):
+        # cells and tables left open by a failed page
+        doc = self._document
+        self._containers = [doc]
+        self._tables = []
+        if docx.last_paragraph(doc) is not None:
+            section = doc.add_section(WD_SECTION.NEW_PAGE)
+        else:
+            section = doc.sections[0] # a default section is there when opening docx
+
+        # page size
+        section.page_width  = Pt(width)
+        section.page_height = Pt(height)
+
+        # page margin
+        left, right, top, bottom = margin
+        section.left_margin = Pt(left)
+        section.right_margin = Pt(right)
+        section.top_margin = Pt(top)
+        section.bottom_margin = Pt(bottom)
+
+        self._section = section
+        self._page_start = docx.last_paragraph(doc)
+
+
+    def add_section(self, start_type, space_before:float=None):
+        doc = self._document
+        self._section = doc.add_section(start_type)
+        if space_before is None: return
+
+        # NOTE: the after space doesn't work if last paragraph is image only (without any
+        # text). In this case, set after space for the section break.
+        p = docx.last_paragraph(doc, 2) # -1 is the section break
+        if not p.text.strip() and 'graphicData' in p._p.xml:
+            p = docx.last_paragraph(doc)
+        p.paragraph_format.space_after = Pt(space_before)
+
+
+    def set_columns(self, width_list:list, space:float=0):
+        docx.set_columns(self._section, width_list, space)
+
+
+    # -----------------------------------------------
+    # paragraph and run
+    # -----------------------------------------------
+    def add_paragraph(self):
+        self._p = self._containers[-1].add_paragraph()
+
+
+    def set_paragraph_format(self, line_spacing:float=1.05, exact:bool=False,
+                            space_before:float=0.0, space_after:float=0.0,
+                            left_indent:float=0.0, right_indent:float=0.0,
+                            first_line_indent:float=None, alignment=None, tab_stops:list=()):
+        pf = docx.reset_paragraph_format(self._p, Pt(line_spacing) if exact else line_spacing)
+        pf.space_before = Pt(space_before)
+        pf.space_after = Pt(space_after)
+        pf.left_indent = Pt(left_indent)
+        pf.right_indent = Pt(right_indent)
+        if first_line_indent is not None:
+            pf.first_line_indent = Pt(first_line_indent)
+        if alignment is not None:
+            pf.alignment = alignment
+        for pos in tab_stops:
+            pf.tab_stops.add_tab_stop(Pt(pos))
+
+
+    def add_run(self, text:str, font:str, size:float, color:int, bold:bool=False,
+                italic:bool=False, scale:float=None, spacing:float=0.0, effects:list=(),
+                hyperlink:str=None):
+        if hyperlink:
+            docx_run = docx.add_hyperlink(self._p, hyperlink, text)
+        else:
+            docx_run = self._p.add_run(text)
+
+        # basic font style is shared by character style, or set directly
+        style_id = self._char_style_id(font, size, color, bold, italic)
+        if style_id is None:
+            docx_run.italic = italic
+            docx_run.bold = bold
+            docx.set_char_font(docx_run, font)
+            docx_run.font.color.rgb = RGBColor(*rgb_component(color))
+            docx_run.font.size = Pt(size)
+
+        if scale: docx.set_char_scaling(docx_run, scale)
+
+        for name, effect_color in effects:
+            if name=='highlight':
+                docx.set_char_shading(docx_run, effect_color)
+            elif name=='underline':
+                if effect_color is None:
+                    docx_run.font.underline = True
+                else:
+                    docx.set_char_underline(docx_run, effect_color)
+            elif name=='strike':
+                docx_run.font.strike = True
+
+        if spacing: docx.set_char_spacing(docx_run, spacing)
+
+        # refer to character style at last, since it's the first run property
+        if style_id: docx.set_char_style(docx_run, style_id)
+
+
+    def add_tab(self): self._p.add_run().add_tab()
+
+
+    def add_line_break(self): self._p.add_run('\n')
+
+
+    # -----------------------------------------------
+    # image
+    # -----------------------------------------------
+    def add_image(self, image:bytes, x:float, y:float, width:float, height:float,
+                  rotation:int=0):
+        docx.add_image(self._p, BytesIO(image), x, y, width, height, rotation)
+
+
+    def add_float_image(self, image:bytes, x:float, y:float, width:float, rotation:int=0):
+        p = docx.next_paragraph(self._document, self._page_start)
+        docx.add_float_image(p, BytesIO(image), width=width, pos_x=x, pos_y=y, rotation=rotation)
+
+
+    # -----------------------------------------------
+    # table and cell
+    # -----------------------------------------------
+    def start_table(self, num_rows:int, num_cols:int, indent:float=0.0):
+        container = self._containers[-1]
+        table = container.add_table(rows=num_rows, cols=num_cols)
+        table.autofit = False
+        docx.indent_table(table, indent)
+        self._tables.append(docx.TableGrid(table))
+
+
+    def end_table(self):
+        self._tables.pop()
+
+        # NOTE: within a cell, there is always an empty paragraph after table, so delete it
+        # right here. https://github.com/dothinking/pdf2docx/issues/76
+        container = self._containers[-1]
+        if isinstance(container, _Cell):
+            docx.delete_paragraph(docx.last_paragraph(container))
+
+
+    def set_row_height(self, i:int, height:float):
+        # to control the layout precisely, set `exact` value, rather than `at least` value
+        # the associated steps in MS word: Table Properties -> Row -> Row height -> exactly
+        row = self._tables[-1].rows[i]
+        row.height_rule = WD_ROW_HEIGHT.EXACTLY
+        row.height = Pt(height)
+
+
+    def _cell(self, i:int, j:int):
+        '''Cell at grid position ``(i, j)``, or None if out of the grid.'''
+        grid = self._tables[-1]
+        return grid.cell(i, j) if len(grid) > i*grid.num_cols + j else None
+
+
+    def set_cell_style(self, i:int, j:int, borders:dict, bg_color:int=None,
+                       vertical:bool=False, span:tuple=(1, 1)):
+        n_row, n_col = span
+        for m in range(i, i+n_row):
+            for n in range(j, j+n_col):
+                cell = self._cell(m, n)
+                if cell is not None: docx.set_cell_border(cell, **borders)
+
+        cell = self._cell(i, j)
+        if bg_color is not None:
+            docx.set_cell_shading(cell, bg_color)
+        docx.set_cell_margins(cell, start=0, end=0)
+        if vertical:
+            docx.set_vertical_cell_direction(cell)
+
+
+    def merge_cells(self, i:int, j:int, n_row:int, n_col:int):
+        cell, other_cell = self._cell(i, j), self._cell(i+n_row-1, j+n_col-1)
+        if other_cell is None: return
+        try:
+            self._tables[-1].merge(cell, other_cell)
+        except Exception as e:
+            def show(c):
+                return f'[_tc.top={c._tc.top} _tc.bottom={c._tc.bottom}]'
+            raise Exception(f'Failed to merge docx_cell={show(cell)} _cell={show(other_cell)}. {i=} {j=} {n_row=} {n_col=}') from e
+
+
+    def set_cell_width(self, i:int, j:int, width:float):
+        self._cell(i, j).width = Pt(width)
+
+
+    def start_cell(self, i:int, j:int):
+        cell = self._cell(i, j)
+        cell._element.clear_content()
+        self._containers.append(cell)
+
+
+    def end_cell(self): self._containers.pop()
+
+
+    # -----------------------------------------------
+    # output
+    # -----------------------------------------------
+    def save(self, filename_or_stream=None):
+        self._document.save(filename_or_stream)
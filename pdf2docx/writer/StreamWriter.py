@@ -0,0 +1,655 @@
+'''Streaming docx writer.
+
+``python-docx`` keeps the whole document as an ``lxml`` tree, and each operation, e.g.
+inserting a paragraph, goes through the python proxy objects of the ``lxml`` elements.
+It's the major cost when making docx for a document with many pages.
+
+:py:class:`StreamWriter` creates lightweight xml elements for ``word/document.xml`` from
+the writer events, and serializes the elements page by page to a temporary file when a
+new page starts. So only the content of last two pages is kept in memory. The attribute
+values are converted with ``python-docx`` simple types, and the child elements are inserted
+with the same rules as ``python-docx``, so the created xml is same to
+:py:class:`~pdf2docx.writer.DocxWriter`. The other package parts, e.g. styles, images and
+relationships, are still managed by a ``python-docx`` document.
+
+If the output is specified when creating the writer, the zip package is written
+progressively: each image is written to the output once added, and the serialized
+``word/document.xml`` and the other parts are written at last when saving. Writing zip
+entries sequentially requires no seeking, so the output can be any writable file-like
+object, e.g. socket or pipe. If it fails to make pages, :py:meth:`StreamWriter.discard`
+closes the output and removes the partially written file.
+'''
+
+import logging
+import os
+import shutil
+import tempfile
+import zipfile
+from io import BytesIO
+from docx import Document
+from docx.enum.section import WD_SECTION
+from docx.enum.table import WD_ROW_HEIGHT
+from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_COLOR_INDEX, WD_LINE_SPACING, \
+    WD_TAB_ALIGNMENT, WD_UNDERLINE
+from docx.image.exceptions import UnrecognizedImageError
+from docx.image.image import Image as DocxImage
+from docx.opc.constants import CONTENT_TYPE as CT, NAMESPACE, RELATIONSHIP_TYPE as RT
+from docx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI, PackURI
+from docx.oxml.ns import nsmap, qn
+from docx.oxml.simpletypes import ST_HexColor, ST_HpsMeasure, ST_OnOff, \
+    ST_SignedTwipsMeasure, ST_String, ST_TwipsMeasure
+from docx.parts.image import ImagePart
+from docx.shared import Emu, Inches, Pt, RGBColor, Twips
+from lxml import etree
+from ..common import docx
+from ..common.share import rgb_component
+from .BaseWriter import BaseWriter
+from .Table import Table
+from .oxml import Element, RawElement, escape_attr, from_lxml, text_element
+
+
+def set_attr(e:Element, name:str, value, simple_type):
+    '''Set attribute value converted by ``python-docx`` simple type.'''
+    e.set(name, simple_type.to_xml(value))
+
+
+def set_on_off(parent:Element, tag:str, value:bool):
+    '''Set on-off property, e.g. ``w:b``: ``<w:b/>`` if True; otherwise ``<w:b w:val="0"/>``.'''
+    e = parent.get_or_add(tag)
+    if value: e.unset('w:val')
+    else: e.set('w:val', ST_OnOff.to_xml(value))
+
+
+def add_run_content(r:Element, text:str):
+    '''Append run content for text, same to ``python-docx``: ``\\t`` to ``w:tab``,
+    ``\\r`` and ``\\n`` to ``w:br``, and other characters to ``w:t``.'''
+    def add_t(chars):
+        t = text_element('w:t', chars)
+        if len(chars.strip()) < len(chars): t.set('xml:space', 'preserve')
+        r.append(t)
+
+    start = 0
+    for i, c in enumerate(text):
+        if c not in '\t\r\n': continue
+        if i > start: add_t(text[start:i])
+        r.append(Element('w:tab' if c=='\t' else 'w:br'))
+        start = i + 1
+    if start < len(text): add_t(text[start:])
+
+
+def is_image_only(p:Element):
+    '''Whether the paragraph has images but no text, where the text of run is counted from
+    ``w:t`` elements like ``python-docx``.'''
+    runs = p.findall('w:r')
+    text = ''.join(t.text or '' for r in runs for t in r.findall('w:t'))
+    return not text.strip() and any(r.find('w:drawing') is not None for r in runs)
+
+
+def package_parts(package):
+    '''Parts of ``python-docx`` package, by walking the relationships from the package.'''
+    parts, visited = [], set()
+    def walk(source):
+        for rel in source.rels.values():
+            if rel.is_external or rel.target_part in visited: continue
+            part = rel.target_part
+            visited.add(part)
+            parts.append(part)
+            walk(part)
+    walk(package)
+    return parts
+
+
+def content_types(parts:list):
+    '''Xml of ``[Content_Types].xml``: the images and generic xml parts are typed by
+    extension, while the other parts by part name.'''
+    defaults = {'rels': CT.OPC_RELATIONSHIPS, 'xml': CT.XML}
+    overrides = {}
+    for part in parts:
+        ext, content_type = part.partname.ext.lower(), part.content_type
+        if content_type.startswith('image/'):
+            defaults[ext] = content_type
+        elif defaults.get(ext)!=content_type:
+            overrides[part.partname] = content_type
+    xml = ["<?xml version='1.0' encoding='UTF-8' standalone='yes'?>\n",
+           f'<Types xmlns="{NAMESPACE.OPC_CONTENT_TYPES}">']
+    xml.extend(f'<Default Extension="{k}" ContentType="{v}"/>' for k, v in sorted(defaults.items()))
+    xml.extend(f'<Override PartName="{k}" ContentType="{v}"/>' for k, v in sorted(overrides.items()))
+    xml.append('</Types>')
+    return ''.join(xml).encode('utf-8')
+
+
+_ANCHOR = '<wp:anchor xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" ' \
+    'xmlns:pic="http://schemas.openxmlformats.org/drawingml/2006/picture" {dist}simplePos="0" ' \
+    'relativeHeight="0" behindDoc="{behind}" locked="0" layoutInCell="1" allowOverlap="1">' \
+    '<wp:simplePos x="0" y="0"/>' \
+    '<wp:positionH relativeFrom="page"><wp:posOffset>{x}</wp:posOffset></wp:positionH>' \
+    '<wp:positionV relativeFrom="page"><wp:posOffset>{y}</wp:posOffset></wp:positionV>' \
+    '<wp:extent cx="{cx}" cy="{cy}"/><wp:wrapNone/>' \
+    '<wp:docPr id="{id}" name="Picture {id}"/>' \
+    '<wp:cNvGraphicFramePr><a:graphicFrameLocks noChangeAspect="1"/></wp:cNvGraphicFramePr>' \
+    '<a:graphic><a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/picture">' \
+    '<pic:pic><pic:nvPicPr><pic:cNvPr id="0" name="{name}"/><pic:cNvPicPr/></pic:nvPicPr>' \
+    '<pic:blipFill><a:blip r:embed="{rId}"/><a:stretch><a:fillRect/></a:stretch></pic:blipFill>' \
+    '<pic:spPr><a:xfrm{rot}><a:off x="0" y="0"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>' \
+    '<a:prstGeom prst="rect"/></pic:spPr></pic:pic></a:graphicData></a:graphic></wp:anchor>'
+
+
+class StreamWriter(BaseWriter):
+    '''Docx writer serializing lightweight xml elements page by page.'''
+
+    def __init__(self, path_or_stream=None, char_style:bool=False):
+        '''
+        Args:
+            path_or_stream (str, file-like, optional): Output docx file, which is written
+                progressively. Defaults to None, i.e. specify it when saving.
+            char_style (bool, optional): Share text format of runs by character styles.
+                Defaults to False.
+        '''
+        # python-docx document for the package parts except the main document body
+        super().__init__(Document(), char_style)
+        self._output = path_or_stream
+        self._zipf = None if path_or_stream is None else \
+            zipfile.ZipFile(path_or_stream, 'w', compression=zipfile.ZIP_DEFLATED)
+        self._images = {} # sha1 -> image part written to zip file
+        self._shape_id = 0
+
+        # convert the template body to lightweight elements
+        qname = {uri: prefix for prefix, uri in nsmap.items()}
+        self._body = Element('w:body')
+        for e in self._document.element.body:
+            if e.tag==qn('w:sectPr'):
+                self._sentinel = from_lxml(e, qname)
+            else:
+                self._body.append(from_lxml(e, qname))
+        self._has_paragraph = self._body.find('w:p') is not None
+
+        self._containers = [self._body] # body and started cells
+        self._tables = [] # type: list[Table]
+        self._p = None # last paragraph
+
+        # serialized content
+        self._spool = tempfile.SpooledTemporaryFile(max_size=2**24)
+        self._page_start = 0 # index of the first body element in current page
+        self._float_start = 0 # float images are added to the first paragraph from here
+
+
+    # -----------------------------------------------
+    # page and section
+    # -----------------------------------------------
+    def add_page(self, width:float, height:float, margin:tuple):
+        # cells and tables left open by a failed page
+        self._containers = [self._body]
+        self._tables = []
+        if self._has_paragraph:
+            # keep the content of last page and serialize the others
+            self._flush(self._page_start)
+            self._page_start = len(self._body)
+            self._add_section_break(WD_SECTION.NEW_PAGE)
+
+        sectPr = self._sentinel
+        pgSz = sectPr.get_or_add('w:pgSz')
+        set_attr(pgSz, 'w:w', Pt(width), ST_TwipsMeasure)
+        set_attr(pgSz, 'w:h', Pt(height), ST_TwipsMeasure)
+
+        left, right, top, bottom = margin
+        pgMar = sectPr.get_or_add('w:pgMar')
+        set_attr(pgMar, 'w:left', Pt(left), ST_TwipsMeasure)
+        set_attr(pgMar, 'w:right', Pt(right), ST_TwipsMeasure)
+        set_attr(pgMar, 'w:top', Pt(top), ST_SignedTwipsMeasure)
+        set_attr(pgMar, 'w:bottom', Pt(bottom), ST_SignedTwipsMeasure)
+
+        self._float_start = len(self._body)
+
+
+    def add_section(self, start_type, space_before:float=None):
+        self._add_section_break(start_type)
+        if space_before is None: return
+
+        # set after space of the section break if last paragraph is image only
+        p = self._last_paragraph(2)
+        if is_image_only(p): p = self._last_paragraph(1)
+        spacing = p.get_or_add_first('w:pPr').get_or_add('w:spacing')
+        set_attr(spacing, 'w:after', Pt(space_before), ST_TwipsMeasure)
+
+
+    def set_columns(self, width_list:list, space:float=0):
+        cols = self._sentinel.find('w:cols')
+
+        # do nothing if only one column
+        if len(width_list)==1:
+            if len(cols)!=1: cols.clear()
+            return
+
+        cols.clear()
+        cols.set('w:num', str(len(width_list)))
+        cols.set('w:equalWidth', '0')
+        for w in width_list:
+            cols.append(Element('w:col', {'w:w': str(int(20*w)), 'w:space': str(int(20*space))}))
+
+
+    def _add_section_break(self, start_type):
+        '''Add a section break paragraph with the properties of current section, while the
+        sentinel ``w:sectPr`` defines the new section, same to ``python-docx``.'''
+        sectPr = self._sentinel.clone()
+        sectPr.attrs.clear()
+        p = Element('w:p')
+        p.get_or_add_first('w:pPr').insert_in_order(sectPr)
+        self._body.append(p)
+        self._has_paragraph = True
+
+        # remove header and footer references from the new section
+        self._sentinel.remove_all('w:headerReference')
+        self._sentinel.remove_all('w:footerReference')
+
+        if start_type is WD_SECTION.NEW_PAGE:
+            self._sentinel.remove_all('w:type')
+        else:
+            self._sentinel.get_or_add('w:type').set('w:val', WD_SECTION.to_xml(start_type))
+
+
+    def _last_paragraph(self, n:int):
+        '''The n-th last paragraph in body, which is limited in the last two pages.'''
+        i = 0
+        for e in reversed(self._body.children):
+            if e.tag!='w:p': continue
+            i += 1
+            if i==n: return e
+        return None
+
+
+    # -----------------------------------------------
+    # paragraph and run
+    # -----------------------------------------------
+    def add_paragraph(self):
+        self._p = Element('w:p')
+        container = self._containers[-1]
+        container.append(self._p)
+        if container is self._body: self._has_paragraph = True
+
+
+    def set_paragraph_format(self, line_spacing:float=1.05, exact:bool=False,
+                            space_before:float=0.0, space_after:float=0.0,
+                            left_indent:float=0.0, right_indent:float=0.0,
+                            first_line_indent:float=None, alignment=None, tab_stops:list=()):
+        pPr = self._p.get_or_add_first('w:pPr')
+        spacing = pPr.get_or_add('w:spacing')
+        self._set_line_spacing(spacing, line_spacing, exact)
+        set_attr(spacing, 'w:before', Pt(space_before), ST_TwipsMeasure)
+        set_attr(spacing, 'w:after', Pt(space_after), ST_TwipsMeasure)
+
+        ind = pPr.get_or_add('w:ind')
+        set_attr(ind, 'w:left', Pt(left_indent), ST_SignedTwipsMeasure)
+        set_attr(ind, 'w:right', Pt(right_indent), ST_SignedTwipsMeasure)
+        if first_line_indent is not None:
+            value = Pt(first_line_indent)
+            if value < 0:
+                set_attr(ind, 'w:hanging', -value, ST_TwipsMeasure)
+            else:
+                set_attr(ind, 'w:firstLine', value, ST_TwipsMeasure)
+
+        pPr.get_or_add('w:widowControl')
+        pPr.insert(0, Element('w:autoSpaceDE', {'w:val': '0'}))
+        pPr.insert(0, Element('w:autoSpaceDN', {'w:val': '0'}))
+
+        if alignment is not None:
+            pPr.get_or_add('w:jc').set('w:val', WD_ALIGN_PARAGRAPH.to_xml(alignment))
+
+        for pos in tab_stops:
+            self._add_tab_stop(pPr, Pt(pos))
+
+
+    @staticmethod
+    def _set_line_spacing(spacing:Element, line_spacing:float, exact:bool):
+        if exact:
+            set_attr(spacing, 'w:line', Pt(line_spacing), ST_SignedTwipsMeasure)
+            if spacing.get('w:lineRule') != WD_LINE_SPACING.to_xml(WD_LINE_SPACING.AT_LEAST):
+                spacing.set('w:lineRule', WD_LINE_SPACING.to_xml(WD_LINE_SPACING.EXACTLY))
+        else:
+            set_attr(spacing, 'w:line', Emu(line_spacing * Twips(240)), ST_SignedTwipsMeasure)
+            spacing.set('w:lineRule', WD_LINE_SPACING.to_xml(WD_LINE_SPACING.MULTIPLE))
+
+
+    @staticmethod
+    def _add_tab_stop(pPr:Element, position):
+        '''Add a left aligned tab stop in position order.'''
+        tabs = pPr.get_or_add('w:tabs')
+        tab = Element('w:tab')
+        set_attr(tab, 'w:pos', position, ST_SignedTwipsMeasure)
+        tab.set('w:val', WD_TAB_ALIGNMENT.to_xml(WD_TAB_ALIGNMENT.LEFT))
+
+        pos = int(tab.get('w:pos'))
+        for i, e in enumerate(tabs):
+            if pos < int(e.get('w:pos')):
+                tabs.insert(i, tab)
+                break
+        else:
+            tabs.append(tab)
+
+
+    def add_run(self, text:str, font:str, size:float, color:int, bold:bool=False,
+                italic:bool=False, scale:float=None, spacing:float=0.0, effects:list=(),
+                hyperlink:str=None):
+        r = Element('w:r')
+        self._p.append(r)
+        if hyperlink:
+            r.append(self._new_hyperlink(hyperlink, text))
+        elif text:
+            add_run_content(r, text)
+
+        # basic font style is shared by character style, or set directly
+        style_id = self._char_style_id(font, size, color, bold, italic)
+        if style_id is None:
+            rPr = r.get_or_add_first('w:rPr')
+            set_on_off(rPr, 'w:i', italic)
+            set_on_off(rPr, 'w:b', bold)
+            rFonts = rPr.get_or_add('w:rFonts')
+            rFonts.set('w:ascii', ST_String.to_xml(font))
+            rFonts.set('w:hAnsi', ST_String.to_xml(font))
+            rFonts.set('w:eastAsia', font)
+            rPr.add('w:color', {'w:val': ST_HexColor.to_xml(RGBColor(*rgb_component(color)))})
+            rPr.get_or_add('w:sz').set('w:val', ST_HpsMeasure.to_xml(Pt(size)))
+
+        # the properties below are inserted at first like the helpers in common.docx
+        if scale:
+            r.get_or_add_first('w:rPr').insert(0, Element('w:w', {'w:val': f'{100*scale}'}))
+
+        for name, effect_color in effects:
+            rPr = r.get_or_add_first('w:rPr')
+            if name=='highlight':
+                highlight_color = docx.HIGHLIGHT_COLORS.get(effect_color, None)
+                if highlight_color is not None:
+                    rPr.get_or_add('w:highlight').set('w:val', WD_COLOR_INDEX.to_xml(highlight_color))
+                else:
+                    c = hex(effect_color)[2:].zfill(6)
+                    rPr.insert(0, Element('w:shd', {'w:val': 'clear', 'w:color': 'auto', 'w:fill': c}))
+            elif name=='underline':
+                if effect_color is None:
+                    rPr.remove_all('w:u')
+                    rPr.add('w:u', {'w:val': WD_UNDERLINE.to_xml(WD_UNDERLINE.SINGLE)})
+                else:
+                    c = hex(effect_color)[2:].zfill(6)
+                    rPr.insert(0, Element('w:u', {'w:val': 'single', 'w:color': c}))
+            elif name=='strike':
+                set_on_off(rPr, 'w:strike', True)
+
+        if spacing:
+            r.get_or_add_first('w:rPr').insert(0, Element('w:spacing', {'w:val': f'{20*spacing}'}))
+
+        if style_id:
+            r.get_or_add_first('w:rPr').insert(0, Element('w:rStyle', {'w:val': style_id}))
+
+
+    def _new_hyperlink(self, url:str, text:str):
+        '''Create ``w:hyperlink`` element, same to :py:meth:`~pdf2docx.common.docx.add_hyperlink`.'''
+        r_id = self._document.part.relate_to(url, RT.HYPERLINK, is_external=True)
+        hyperlink = Element('w:hyperlink', {'r:id': r_id, 'w:history': '1'})
+        r = Element('w:r')
+        rPr = Element('w:rPr')
+        rPr.append(Element('w:rStyle', {'w:val': 'Hyperlink'}))
+        r.append(rPr)
+        add_run_content(r, text)
+        hyperlink.append(r)
+        return hyperlink
+
+
+    def add_tab(self):
+        r = Element('w:r')
+        r.append(Element('w:tab'))
+        self._p.append(r)
+
+
+    def add_line_break(self):
+        r = Element('w:r')
+        r.append(Element('w:br'))
+        self._p.append(r)
+
+
+    # -----------------------------------------------
+    # image
+    # -----------------------------------------------
+    def add_image(self, image:bytes, x:float, y:float, width:float, height:float,
+                  rotation:int=0):
+        r = Element('w:r')
+        self._p.append(r)
+        try:
+            rId, docx_image = self._get_or_add_image(image)
+        except UnrecognizedImageError:
+            logging.warning('Ignore unrecognized image.')
+            return
+
+        x, y, cx, cy = docx.rotated_frame(docx.pt_to_emu(x), docx.pt_to_emu(y),
+                                          docx.pt_to_emu(width), docx.pt_to_emu(height), rotation)
+        self._add_anchor(r, rId, docx_image.filename, x, y, cx, cy, False, rotation)
+
+        # exactly line spacing will destroy image display, so set single line spacing instead
+        spacing = self._p.get_or_add_first('w:pPr').get_or_add('w:spacing')
+        self._set_line_spacing(spacing, 1.0, False)
+
+
+    def add_float_image(self, image:bytes, x:float, y:float, width:float, rotation:int=0):
+        p = next((e for e in self._body.children[self._float_start:] if e.tag=='w:p'), None)
+        r = Element('w:r')
+        p.append(r)
+        rId, docx_image = self._get_or_add_image(image)
+        if rotation % 180 == 0:
+            cx, cy = docx_image.scaled_dimensions(Pt(width), None)
+            x, y = Pt(x), Pt(y)
+        else: # the displayed width is the height of picture frame
+            cx, cy = docx_image.scaled_dimensions(None, Pt(width))
+            x, y, cx, cy = docx.rotated_frame(Pt(x), Pt(y), cy, cx, rotation)
+        self._add_anchor(r, rId, docx_image.filename, int(x), int(y), cx, cy, True, rotation)
+
+
+    def _get_or_add_image(self, image:bytes):
+        '''Relate image to the document part, and return ``(rId, image)``. If the output is
+        specified, the image is written to the zip file once added, and the image part keeps
+        no image bytes.'''
+        part = self._document.part
+        if self._zipf is None: return part.get_or_add_image(BytesIO(image))
+
+        # same to python-docx: one image part for identical images
+        docx_image = DocxImage.from_blob(image)
+        image_part = self._images.get(docx_image.sha1)
+        if image_part is None:
+            partname = PackURI(f'/word/media/image{len(self._images)+1}.{docx_image.ext}')
+            self._zipf.writestr(partname.membername, docx_image.blob)
+            image_part = ImagePart(partname, docx_image.content_type, b'')
+            self._images[docx_image.sha1] = image_part
+        return part.relate_to(image_part, RT.IMAGE), docx_image
+
+
+    def _add_anchor(self, r:Element, rId:str, filename:str, x:int, y:int, cx:int, cy:int,
+                    behind:bool, rotation:int=0):
+        '''Add ``w:drawing`` with a floating picture to run. The shape id is counted directly,
+        while ``python-docx`` gets it by scanning the whole document.'''
+        self._shape_id += 1
+        anchor = _ANCHOR.format(
+            dist='distT="0" distB="0" distL="0" distR="0" ' if behind else '',
+            behind=int(behind), x=x, y=y, cx=cx, cy=cy, id=self._shape_id,
+            name=escape_attr(filename), rId=rId,
+            rot=f' rot="{rotation*60000}"' if rotation else '')
+        drawing = Element('w:drawing')
+        drawing.append(RawElement('wp:anchor', anchor))
+        r.append(drawing)
+
+
+    # -----------------------------------------------
+    # table and cell
+    # -----------------------------------------------
+    def start_table(self, num_rows:int, num_cols:int, indent:float=0.0):
+        container = self._containers[-1]
+        if container is self._body: # width of page content region, zero taken as unset
+            def length(tag, name, default):
+                e = self._sentinel.find(tag)
+                return (Twips(int(e.get(name, 0))) if e is not None else 0) or default
+            page_width = length('w:pgSz', 'w:w', Inches(8.5))
+            left_margin = length('w:pgMar', 'w:left', Inches(1))
+            right_margin = length('w:pgMar', 'w:right', Inches(1))
+            width = Emu(page_width - left_margin - right_margin)
+        else: # width of cell
+            width = container.width if container.width is not None else Inches(1)
+
+        table = Table(num_rows, num_cols, width)
+        container.append(table.tbl)
+        tblPr = table.tbl.find('w:tblPr')
+        tblPr.get_or_add('w:tblLayout').set('w:type', 'fixed')
+        tblPr.append(Element('w:tblInd', {'w:w': str(20*indent), 'w:type': 'dxa'}))
+        self._tables.append(table)
+
+        # a cell must end with a paragraph, which is removed if the table is completed
+        if container is not self._body: container.append(Element('w:p'))
+
+
+    def end_table(self):
+        self._tables.pop()
+        container = self._containers[-1]
+        if container is not self._body: container.children.pop()
+
+
+    def set_row_height(self, i:int, height:float):
+        trHeight = self._tables[-1].rows[i].get_or_add_first('w:trPr').get_or_add('w:trHeight')
+        trHeight.set('w:hRule', WD_ROW_HEIGHT.to_xml(WD_ROW_HEIGHT.EXACTLY))
+        set_attr(trHeight, 'w:val', Pt(height), ST_TwipsMeasure)
+
+
+    def _cell(self, i:int, j:int):
+        '''``w:tc`` element at grid position ``(i, j)``, or None if out of the grid.'''
+        table = self._tables[-1]
+        return table.cell(i, j) if len(table) > i*table.num_cols + j else None
+
+
+    def set_cell_style(self, i:int, j:int, borders:dict, bg_color:int=None,
+                       vertical:bool=False, span:tuple=(1, 1)):
+        n_row, n_col = span
+        for m in range(i, i+n_row):
+            for n in range(j, j+n_col):
+                tc = self._cell(m, n)
+                if tc is not None: self._set_cell_border(tc, borders)
+
+        tcPr = self._cell(i, j).tcPr
+        if bg_color is not None:
+            tcPr.append(Element('w:shd', {'w:fill': hex(bg_color)[2:].zfill(6)}))
+
+        tcMar = Element('w:tcMar')
+        for m in ('start', 'end'):
+            tcMar.append(Element(f'w:{m}', {'w:w': '0', 'w:type': 'dxa'}))
+        tcPr.append(tcMar)
+
+        if vertical:
+            tcPr.append(Element('w:textDirection', {'w:val': 'btLr'}))
+
+
+    @staticmethod
+    def _set_cell_border(tc, borders:dict):
+        '''Set cell border like :py:meth:`~pdf2docx.common.docx.set_cell_border`.'''
+        tcPr = tc.tcPr
+        tcBorders = tcPr.find('w:tcBorders')
+        if tcBorders is None:
+            tcBorders = Element('w:tcBorders')
+            tcPr.append(tcBorders)
+
+        for edge in ('start', 'top', 'end', 'bottom', 'insideH', 'insideV'):
+            edge_data = borders.get(edge)
+            if not edge_data: continue
+            tag = f'w:{edge}'
+            element = tcBorders.find(tag)
+            if element is None:
+                element = Element(tag)
+                tcBorders.append(element)
+            for key in ('sz', 'val', 'color', 'space', 'shadow'):
+                if key in edge_data:
+                    element.set(f'w:{key}', str(edge_data[key]))
+
+
+    def merge_cells(self, i:int, j:int, n_row:int, n_col:int):
+        tc, other_tc = self._cell(i, j), self._cell(i+n_row-1, j+n_col-1)
+        if other_tc is not None: self._tables[-1].merge(tc, other_tc)
+
+
+    def set_cell_width(self, i:int, j:int, width:float):
+        self._cell(i, j).width = Pt(width)
+
+
+    def start_cell(self, i:int, j:int):
+        tc = self._cell(i, j)
+        tc.clear_content()
+        self._containers.append(tc)
+
+
+    def end_cell(self): self._containers.pop()
+
+
+    # -----------------------------------------------
+    # output
+    # -----------------------------------------------
+    def save(self, filename_or_stream=None):
+        '''Save docx package to file or stream.
+
+        Args:
+            filename_or_stream (str, file-like, optional): Docx file to write. It can be
+                omitted if the output is specified when creating the writer.
+        '''
+        if self._zipf is None:
+            if filename_or_stream is None:
+                raise ValueError('Please specify a docx file or stream to save.')
+            zipf = zipfile.ZipFile(filename_or_stream, 'w', compression=zipfile.ZIP_DEFLATED)
+        elif filename_or_stream is None or filename_or_stream is self._output:
+            zipf = self._zipf
+        else:
+            raise ValueError('Can not save to other file than the specified output.')
+
+        self._flush(len(self._body))
+
+        package = self._document.part.package
+        main_part = self._document.part
+        parts = package_parts(package)
+
+        with zipf:
+            written = set(zipf.namelist()) # images written already
+            zipf.writestr(CONTENT_TYPES_URI.membername, content_types(parts))
+            zipf.writestr(PACKAGE_URI.rels_uri.membername, package.rels.xml)
+            for part in parts:
+                if part.partname.membername in written: continue
+                if part is main_part:
+                    with zipf.open(part.partname.membername, 'w') as f: self._write_main_part(f)
+                else:
+                    zipf.writestr(part.partname.membername, part.blob)
+                if len(part.rels):
+                    zipf.writestr(part.partname.rels_uri.membername, part.rels.xml)
+
+        self._spool.close()
+
+
+    def discard(self):
+        '''Close the writer without saving, e.g. when failed to make pages, and remove the
+        partially written output file.'''
+        if self._zipf is not None: self._zipf.close()
+        self._spool.close()
+        if isinstance(self._output, (str, os.PathLike)) and os.path.exists(self._output):
+            os.remove(self._output)
+
+
+    def _flush(self, n:int):
+        '''Serialize the first ``n`` body elements to the temporary file.'''
+        if n<=0: return
+        out = []
+        for e in self._body.children[:n]: e.write(out)
+        self._spool.write(''.join(out).encode('utf-8'))
+        del self._body.children[:n]
+
+
+    def _write_main_part(self, f):
+        '''Write ``word/document.xml``: the document element with the serialized body.'''
+        # serialize document element with an empty body, and split it into header and tail
+        element = etree.fromstring(etree.tostring(self._document.element))
+        body = element.find(qn('w:body'))
+        for e in list(body): body.remove(e)
+        etree.SubElement(body, qn('w:sectPr'))
+        xml = etree.tostring(element, encoding='UTF-8', standalone=True)
+        header, tail = xml.split(b'<w:sectPr/>')
+
+        f.write(header)
+        self._spool.seek(0)
+        shutil.copyfileobj(self._spool, f)
+        f.write(self._sentinel.tostring().encode('utf-8'))
+        f.write(tail)
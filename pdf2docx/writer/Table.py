@@ -0,0 +1,298 @@
+'''Table of streaming docx writer.
+
+The merging logic of table cells follows ``python-docx`` closely, e.g. the ``gridSpan`` and
+``vMerge`` properties, and the content moving from merged cells to the top-left cell, so
+that the created xml is same to ``python-docx``. The difference is that the position of a
+cell is counted from the lightweight elements directly, rather than xpath queries.
+'''
+
+from docx.exceptions import InvalidSpanError
+from docx.oxml.simpletypes import ST_Merge
+from docx.shared import Emu, Length, Twips
+from .oxml import Element
+
+
+BLOCK_TAGS = ('w:p', 'w:tbl', 'w:sdt')
+
+
+def new_tbl(rows:int, cols:int, width:Length):
+    '''Create ``w:tbl`` element, same to ``CT_Tbl.new_tbl()`` of ``python-docx``.'''
+    col_width = Emu(width // cols) if cols > 0 else Emu(0)
+    w = str(col_width.twips)
+
+    tbl = Element('w:tbl')
+    tblPr = Element('w:tblPr')
+    tblPr.append(Element('w:tblW', {'w:type': 'auto', 'w:w': '0'}))
+    tblPr.append(Element('w:tblLook', {
+        'w:firstColumn': '1', 'w:firstRow': '1', 'w:lastColumn': '0', 'w:lastRow': '0',
+        'w:noHBand': '0', 'w:noVBand': '1', 'w:val': '04A0'}))
+    tbl.append(tblPr)
+
+    tblGrid = Element('w:tblGrid')
+    for _ in range(cols): tblGrid.append(Element('w:gridCol', {'w:w': w}))
+    tbl.append(tblGrid)
+
+    for idx in range(rows):
+        tr = Tr(tbl, idx)
+        for _ in range(cols):
+            tc = Tc(tr)
+            tcPr = Element('w:tcPr')
+            tcPr.append(Element('w:tcW', {'w:type': 'dxa', 'w:w': w}))
+            tc.append(tcPr)
+            tc.append(Element('w:p'))
+            tr.append(tc)
+        tbl.append(tr)
+    return tbl
+
+
+class Tr(Element):
+    '''``w:tr`` element.'''
+    __slots__ = ('tbl', 'idx')
+
+    def __init__(self, tbl:Element, idx:int):
+        super().__init__('w:tr')
+        self.tbl = tbl
+        self.idx = idx # rows are never removed, so the index is fixed
+
+    @property
+    def tc_lst(self): return self.findall('w:tc')
+
+    @property
+    def grid_before(self):
+        trPr = self.find('w:trPr')
+        e = None if trPr is None else trPr.find('w:gridBefore')
+        return 0 if e is None else int(e.get('w:val'))
+
+    @property
+    def next_tr(self):
+        '''The next ``w:tr`` element, or None if this is the last row.'''
+        trs = self.tbl.findall('w:tr')
+        return trs[self.idx+1] if self.idx+1 < len(trs) else None
+
+    @property
+    def previous_tr(self):
+        if self.idx==0: raise ValueError('no tr above topmost tr in w:tbl')
+        return self.tbl.findall('w:tr')[self.idx-1]
+
+    def tc_at_grid_offset(self, grid_offset:int):
+        '''The ``w:tc`` element at exact ``grid_offset``.'''
+        remaining_offset = grid_offset - self.grid_before
+        for tc in self.tc_lst:
+            if remaining_offset < 0: break
+            if remaining_offset == 0: return tc
+            remaining_offset -= tc.grid_span
+        raise ValueError(f'no `tc` element at grid_offset={grid_offset}')
+
+
+class Tc(Element):
+    '''``w:tc`` element, with the cell merging logic of ``python-docx``.'''
+    __slots__ = ('tr', )
+
+    def __init__(self, tr:Tr):
+        super().__init__('w:tc')
+        self.tr = tr
+
+    @property
+    def tcPr(self): return self.get_or_add_first('w:tcPr')
+
+    @property
+    def grid_span(self):
+        tcPr = self.find('w:tcPr')
+        e = None if tcPr is None else tcPr.find('w:gridSpan')
+        return 1 if e is None else int(e.get('w:val'))
+
+    @grid_span.setter
+    def grid_span(self, value:int):
+        tcPr = self.tcPr
+        tcPr.remove_all('w:gridSpan')
+        if value > 1: tcPr.add('w:gridSpan', {'w:val': value})
+
+    @property
+    def vMerge(self):
+        tcPr = self.find('w:tcPr')
+        e = None if tcPr is None else tcPr.find('w:vMerge')
+        return None if e is None else e.get('w:val', ST_Merge.CONTINUE)
+
+    @vMerge.setter
+    def vMerge(self, value:str):
+        tcPr = self.tcPr
+        tcPr.remove_all('w:vMerge')
+        if value is None: return
+        e = tcPr.add('w:vMerge')
+        if value != ST_Merge.CONTINUE: e.set('w:val', value)
+
+    @property
+    def width(self):
+        tcPr = self.find('w:tcPr')
+        tcW = None if tcPr is None else tcPr.find('w:tcW')
+        if tcW is None or tcW.get('w:type') != 'dxa': return None
+        return Twips(int(tcW.get('w:w')))
+
+    @width.setter
+    def width(self, value:Length):
+        tcW = self.tcPr.get_or_add('w:tcW')
+        tcW.set('w:type', 'dxa')
+        tcW.set('w:w', Emu(value).twips)
+
+    @property
+    def grid_offset(self):
+        res = self.tr.grid_before
+        for tc in self.tr.tc_lst:
+            if tc is self: break
+            res += tc.grid_span
+        return res
+
+    @property
+    def left(self): return self.grid_offset
+
+    @property
+    def right(self): return self.grid_offset + self.grid_span
+
+    @property
+    def top(self):
+        if self.vMerge is None or self.vMerge == ST_Merge.RESTART:
+            return self.tr.idx
+        return self.tr.previous_tr.tc_at_grid_offset(self.grid_offset).top
+
+    @property
+    def bottom(self):
+        if self.vMerge is not None:
+            tc_below = self._tc_below
+            if tc_below is not None and tc_below.vMerge == ST_Merge.CONTINUE:
+                return tc_below.bottom
+        return self.tr.idx + 1
+
+    def clear_content(self):
+        '''Remove all content elements, preserving ``w:tcPr`` element if present.'''
+        self.children = [e for e in self.children if e.tag=='w:tcPr']
+
+    def merge(self, other_tc):
+        '''Return top-left ``w:tc`` element of the span formed by this and ``other_tc``.'''
+        top, left, height, width = self._span_dimensions(other_tc)
+        top_tc = self.tr.tbl.findall('w:tr')[top].tc_at_grid_offset(left)
+        top_tc._grow_to(width, height)
+        return top_tc
+
+    @property
+    def _tc_below(self):
+        tr_below = self.tr.next_tr
+        return None if tr_below is None else tr_below.tc_at_grid_offset(self.grid_offset)
+
+    @property
+    def _next_tc(self):
+        tcs = self.tr.tc_lst
+        idx = next(i for i, tc in enumerate(tcs) if tc is self)
+        return tcs[idx+1] if idx+1 < len(tcs) else None
+
+    @property
+    def _block_items(self): return [e for e in self.children if e.tag in BLOCK_TAGS]
+
+    @property
+    def _is_empty(self):
+        block_items = self._block_items
+        if len(block_items) > 1: return False
+        only_item = block_items[0]
+        return only_item.tag=='w:p' and only_item.find('w:r') is None
+
+    def _span_dimensions(self, other_tc):
+        def raise_on_inverted_L(a, b):
+            if a.top == b.top and a.bottom != b.bottom:
+                raise InvalidSpanError('requested span not rectangular')
+            if a.left == b.left and a.right != b.right:
+                raise InvalidSpanError('requested span not rectangular')
+
+        def raise_on_tee_shaped(a, b):
+            top_most, other = (a, b) if a.top < b.top else (b, a)
+            if top_most.top < other.top and top_most.bottom > other.bottom:
+                raise InvalidSpanError('requested span not rectangular')
+
+            left_most, other = (a, b) if a.left < b.left else (b, a)
+            if left_most.left < other.left and left_most.right > other.right:
+                raise InvalidSpanError('requested span not rectangular')
+
+        raise_on_inverted_L(self, other_tc)
+        raise_on_tee_shaped(self, other_tc)
+
+        top = min(self.top, other_tc.top)
+        left = min(self.left, other_tc.left)
+        bottom = max(self.bottom, other_tc.bottom)
+        right = max(self.right, other_tc.right)
+        return top, left, bottom - top, right - left
+
+    def _grow_to(self, width:int, height:int, top_tc=None):
+        if top_tc is None: top_tc = self
+        if top_tc is not self:
+            vMerge = ST_Merge.CONTINUE
+        else:
+            vMerge = None if height == 1 else ST_Merge.RESTART
+
+        self._span_to_width(width, top_tc, vMerge)
+        if height > 1:
+            self._tc_below._grow_to(width, height-1, top_tc)
+
+    def _span_to_width(self, grid_width:int, top_tc, vMerge:str):
+        self._move_content_to(top_tc)
+        while self.grid_span < grid_width:
+            self._swallow_next_tc(grid_width, top_tc)
+        self.vMerge = vMerge
+
+    def _swallow_next_tc(self, grid_width:int, top_tc):
+        next_tc = self._next_tc
+        if next_tc is None:
+            raise InvalidSpanError('not enough grid columns')
+        if self.grid_span + next_tc.grid_span > grid_width:
+            raise InvalidSpanError('span is not rectangular')
+
+        next_tc._move_content_to(top_tc)
+        if self.width and next_tc.width:
+            self.width = Length(self.width + next_tc.width)
+        self.grid_span += next_tc.grid_span
+        self.tr.remove(next_tc)
+
+    def _move_content_to(self, other_tc):
+        if other_tc is self or self._is_empty: return
+
+        # remove trailing empty paragraph
+        last_item = other_tc._block_items[-1]
+        if last_item.tag=='w:p' and last_item.find('w:r') is None:
+            other_tc.remove(last_item)
+
+        # move block items to other cell, and add back the required empty paragraph
+        block_items = self._block_items
+        self.children = [e for e in self.children if e.tag not in BLOCK_TAGS]
+        other_tc.children.extend(block_items)
+        self.append(Element('w:p'))
+
+
+class Table:
+    '''Table of streaming docx writer, with the cells grid maintained when merging cells.'''
+    def __init__(self, rows:int, cols:int, width:Length):
+        '''
+        Args:
+            rows (int): Count of rows.
+            cols (int): Count of columns.
+            width (Length): Table width, which is distributed evenly between the columns.
+        '''
+        self.tbl = new_tbl(rows, cols, width)
+        self.rows = self.tbl.findall('w:tr')
+        self.num_cols = cols
+        self._cells = [tc for tr in self.rows for tc in tr.tc_lst] # type: list[Tc]
+
+    def __len__(self): return len(self._cells)
+
+    def cell(self, i:int, j:int):
+        '''``w:tc`` element at grid position ``(i, j)``.'''
+        return self._cells[i*self.num_cols + j]
+
+    def merge(self, tc:Tc, other_tc:Tc):
+        '''Merge the rectangular region defined by ``tc`` and ``other_tc`` as diagonal corners,
+        and point all grid positions in that region to the merged cell.
+
+        Returns:
+            Tc: The merged cell.
+        '''
+        merged_tc = tc.merge(other_tc)
+        for i in range(merged_tc.top, merged_tc.bottom):
+            for j in range(merged_tc.left, merged_tc.right):
+                self._cells[i*self.num_cols + j] = merged_tc
+        return merged_tc
@@ -0,0 +1,3 @@
+from .BaseWriter import BaseWriter
+from .DocxWriter import DocxWriter
+from .StreamWriter import StreamWriter
@@ -0,0 +1,258 @@
+'''Lightweight xml element for streaming docx writer.
+
+``python-docx`` creates each element with ``lxml`` and inserts child elements in schema
+order by searching the successors one by one. The lightweight element here keeps child
+elements in a plain list and is serialized to string directly, while following the same
+insertion rules as ``python-docx``, so the serialized xml keeps same to ``python-docx``.
+
+.. note::
+    Tag and attribute names are qualified names with prefix, e.g. ``w:p`` and ``w:val``.
+    The namespaces are declared by the root element of the document.
+'''
+
+import re
+
+
+# Sequence of child elements defined in schema, which determines the position to insert a
+# new child element. Copied from the associated ``python-docx`` element classes.
+SEQUENCES = {
+    'w:pPr': (
+        'w:pStyle', 'w:keepNext', 'w:keepLines', 'w:pageBreakBefore', 'w:framePr',
+        'w:widowControl', 'w:numPr', 'w:suppressLineNumbers', 'w:pBdr', 'w:shd', 'w:tabs',
+        'w:suppressAutoHyphens', 'w:kinsoku', 'w:wordWrap', 'w:overflowPunct',
+        'w:topLinePunct', 'w:autoSpaceDE', 'w:autoSpaceDN', 'w:bidi', 'w:adjustRightInd',
+        'w:snapToGrid', 'w:spacing', 'w:ind', 'w:contextualSpacing', 'w:mirrorIndents',
+        'w:suppressOverlap', 'w:jc', 'w:textDirection', 'w:textAlignment',
+        'w:textboxTightWrap', 'w:outlineLvl', 'w:divId', 'w:cnfStyle', 'w:rPr', 'w:sectPr',
+        'w:pPrChange'),
+    'w:rPr': (
+        'w:rStyle', 'w:rFonts', 'w:b', 'w:bCs', 'w:i', 'w:iCs', 'w:caps', 'w:smallCaps',
+        'w:strike', 'w:dstrike', 'w:outline', 'w:shadow', 'w:emboss', 'w:imprint',
+        'w:noProof', 'w:snapToGrid', 'w:vanish', 'w:webHidden', 'w:color', 'w:spacing',
+        'w:w', 'w:kern', 'w:position', 'w:sz', 'w:szCs', 'w:highlight', 'w:u', 'w:effect',
+        'w:bdr', 'w:shd', 'w:fitText', 'w:vertAlign', 'w:rtl', 'w:cs', 'w:em', 'w:lang',
+        'w:eastAsianLayout', 'w:specVanish', 'w:oMath'),
+    'w:tblPr': (
+        'w:tblStyle', 'w:tblpPr', 'w:tblOverlap', 'w:bidiVisual', 'w:tblStyleRowBandSize',
+        'w:tblStyleColBandSize', 'w:tblW', 'w:jc', 'w:tblCellSpacing', 'w:tblInd',
+        'w:tblBorders', 'w:shd', 'w:tblLayout', 'w:tblCellMar', 'w:tblLook', 'w:tblCaption',
+        'w:tblDescription', 'w:tblPrChange'),
+    'w:trPr': (
+        'w:cnfStyle', 'w:divId', 'w:gridBefore', 'w:gridAfter', 'w:wBefore', 'w:wAfter',
+        'w:cantSplit', 'w:trHeight', 'w:tblHeader', 'w:tblCellSpacing', 'w:jc', 'w:hidden',
+        'w:ins', 'w:del', 'w:trPrChange'),
+    'w:tcPr': (
+        'w:cnfStyle', 'w:tcW', 'w:gridSpan', 'w:hMerge', 'w:vMerge', 'w:tcBorders', 'w:shd',
+        'w:noWrap', 'w:tcMar', 'w:textDirection', 'w:tcFitText', 'w:vAlign', 'w:hideMark',
+        'w:headers', 'w:cellIns', 'w:cellDel', 'w:cellMerge', 'w:tcPrChange'),
+    'w:sectPr': (
+        'w:headerReference', 'w:footerReference', 'w:footnotePr', 'w:endnotePr', 'w:type',
+        'w:pgSz', 'w:pgMar', 'w:paperSrc', 'w:pgBorders', 'w:lnNumType', 'w:pgNumType',
+        'w:cols', 'w:formProt', 'w:vAlign', 'w:noEndnote', 'w:titlePg', 'w:textDirection',
+        'w:bidi', 'w:rtlGutter', 'w:docGrid', 'w:printerSettings', 'w:sectPrChange'),
+}
+
+_RANKS = {tag: {t: i for i, t in enumerate(seq)} for tag, seq in SEQUENCES.items()}
+
+# valid characters in xml 1.0, same to the check by ``lxml``
+_INVALID_CHARS = re.compile(r'[^\x09\x0A\x0D\x20-\uD7FF\uE000-\uFFFD\U00010000-\U0010FFFF]')
+_TEXT_ESCAPES = re.compile('[&<>\r]')
+_ATTR_ESCAPES = re.compile('[&<>"\n\r\t]')
+_ESCAPES = {
+    '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;',
+    '\n': '&#10;', '\r': '&#13;', '\t': '&#9;'
+}
+
+
+def check_xml_string(s:str):
+    '''Raise ``ValueError`` if the string contains characters not allowed in xml.'''
+    if _INVALID_CHARS.search(s):
+        raise ValueError('All strings must be XML compatible: Unicode or ASCII, ' \
+                        'no NULL bytes or control characters')
+
+
+def _escape(s:str, pattern):
+    if not pattern.search(s): return s
+    return pattern.sub(lambda m: _ESCAPES[m.group()], s)
+
+
+def escape_text(s:str):
+    '''Escape string as text content of xml element.'''
+    return _escape(s, _TEXT_ESCAPES)
+
+
+def escape_attr(s:str):
+    '''Escape string as value of xml attribute.'''
+    return _escape(s, _ATTR_ESCAPES)
+
+
+class Element:
+    '''Lightweight xml element.'''
+    __slots__ = ('tag', 'attrs', 'children', 'text')
+
+    def __init__(self, tag:str, attrs:dict=None, text:str=None):
+        self.tag = tag
+        self.attrs = attrs or {}    # type: dict[str, str]
+        self.children = []          # type: list[Element]
+        self.text = text
+
+    def __len__(self): return len(self.children)
+
+    def __iter__(self): return iter(self.children)
+
+    def clone(self):
+        '''Deep copy of this element.'''
+        res = Element(self.tag, dict(self.attrs), self.text)
+        res.children = [child.clone() for child in self.children]
+        return res
+
+
+    # -----------------------------------------------
+    # attributes
+    # -----------------------------------------------
+    def get(self, name:str, default=None): return self.attrs.get(name, default)
+
+    def set(self, name:str, value):
+        '''Set attribute. An existing attribute keeps its position, as ``lxml`` does.'''
+        value = str(value)
+        check_xml_string(value)
+        self.attrs[name] = value
+
+    def unset(self, name:str): self.attrs.pop(name, None)
+
+    def clear(self):
+        '''Remove all attributes, text and child elements, same to ``lxml``.'''
+        self.attrs.clear()
+        self.children.clear()
+        self.text = None
+
+
+    # -----------------------------------------------
+    # child elements
+    # -----------------------------------------------
+    def find(self, tag:str):
+        '''The first child element with given tag, or None.'''
+        for child in self.children:
+            if child.tag==tag: return child
+        return None
+
+    def findall(self, tag:str):
+        return [child for child in self.children if child.tag==tag]
+
+    def append(self, e): self.children.append(e)
+
+    def insert(self, idx:int, e): self.children.insert(idx, e)
+
+    def remove(self, e): self.children.remove(e)
+
+    def remove_all(self, tag:str):
+        '''Remove all child elements with given tag.'''
+        self.children = [child for child in self.children if child.tag!=tag]
+
+    def add(self, tag:str, attrs:dict=None):
+        '''Add a new child element in schema order.'''
+        e = Element(tag)
+        if attrs:
+            for k, v in attrs.items(): e.set(k, v)
+        return self.insert_in_order(e)
+
+    def get_or_add(self, tag:str):
+        '''Get the child element with given tag, or add a new one in schema order.'''
+        e = self.find(tag)
+        return self.add(tag) if e is None else e
+
+    def get_or_add_first(self, tag:str):
+        '''Get the child element with given tag, or insert a new one as the first child, e.g.
+        ``w:pPr`` in ``w:p``, ``w:rPr`` in ``w:r``.
+        '''
+        e = self.find(tag)
+        if e is None:
+            e = Element(tag)
+            self.children.insert(0, e)
+        return e
+
+    def insert_in_order(self, e):
+        '''Insert child element before the first existing successor defined in schema.
+
+        ``python-docx`` searches the successors in schema order, and then inserts the
+        new element before the first child element with the found tag. Otherwise,
+        append the element if no successors are found.
+        '''
+        ranks = _RANKS.get(self.tag)
+        if not ranks:
+            self.children.append(e)
+            return e
+
+        rank = ranks[e.tag]
+        idx, min_rank = len(self.children), len(ranks)
+        for i, child in enumerate(self.children):
+            k = ranks.get(child.tag, -1)
+            if rank < k < min_rank: idx, min_rank = i, k
+        self.children.insert(idx, e)
+        return e
+
+
+    # -----------------------------------------------
+    # serialization
+    # -----------------------------------------------
+    @property
+    def xml(self):
+        '''Serialized xml string.'''
+        return self.tostring()
+
+    def tostring(self):
+        '''Serialize to xml string.'''
+        out = []
+        self.write(out)
+        return ''.join(out)
+
+    def write(self, out:list):
+        '''Write serialized xml strings to the output list.'''
+        out.append(f'<{self.tag}')
+        for k, v in self.attrs.items():
+            out.append(f' {k}="{_escape(v, _ATTR_ESCAPES)}"')
+
+        if not self.children and not self.text:
+            out.append('/>')
+            return
+
+        out.append('>')
+        if self.text: out.append(_escape(self.text, _TEXT_ESCAPES))
+        for child in self.children: child.write(out)
+        out.append(f'</{self.tag}>')
+
+
+class RawElement(Element):
+    '''Element created from a serialized xml string, which is not changed any more.'''
+    __slots__ = ('_xml', )
+
+    def __init__(self, tag:str, xml:str):
+        super().__init__(tag)
+        self._xml = xml
+
+    def clone(self): return self # not changed any more
+
+    def write(self, out:list): out.append(self._xml)
+
+
+def text_element(tag:str, text:str):
+    '''Create element with text, e.g. ``w:t``.'''
+    check_xml_string(text)
+    return Element(tag, text=text)
+
+
+def from_lxml(e, nsmap:dict):
+    '''Convert ``lxml`` element to lightweight element.
+
+    Args:
+        e (etree._Element): The source ``lxml`` element.
+        nsmap (dict): ``{uri: prefix}`` to convert ``{uri}name`` to qualified name.
+    '''
+    def qname(name):
+        if not name.startswith('{'): return name
+        uri, local = name[1:].split('}')
+        return f'{nsmap[uri]}:{local}'
+
+    res = Element(qname(e.tag), {qname(k): v for k, v in e.attrib.items()}, text=e.text)
+    for child in e: res.append(from_lxml(child, nsmap))
+    return res
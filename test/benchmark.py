@@ -0,0 +1,74 @@
+'''
+Memory footprint of parsed pages, i.e. memory retained by ``pdf2docx`` objects after parsing.
+
+Usage::
+
+    python benchmark.py samples/demo-text.pdf [more pdf files]
+
+For each pdf file, it reports:
+
+* memory retained by allocations in ``pdf2docx`` package after parsing, measured with
+  ``tracemalloc``, in KB per page;
+* count and size of the layout elements per class, where the size of an instance with
+  ``__dict__`` counts the dict as well.
+
+Run it on two revisions to compare the footprint before and after a change, e.g. defining
+``__slots__`` for the elements.
+'''
+
+import gc
+import os
+import sys
+import tracemalloc
+from collections import defaultdict
+
+script_path = os.path.abspath(__file__)
+sys.path.insert(0, os.path.dirname(os.path.dirname(script_path))) # pdf2docx in this tree
+
+from pdf2docx import Converter
+from pdf2docx.common.Element import Element
+from pdf2docx.common.Collection import BaseCollection
+
+
+def instance_size(obj):
+    '''Size of instance itself, including ``__dict__`` if any.'''
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'): size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def benchmark(pdf_file):
+    '''Parse pdf file and report the memory retained by parsed pages.'''
+    package = os.path.dirname(sys.modules['pdf2docx'].__file__)
+    gc.collect()
+    tracemalloc.start()
+    c = Converter(pdf_file)
+    c.parse(**c.default_settings)
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(True, os.path.join(package, '*'))])
+    tracemalloc.stop()
+
+    num_pages = max(1, len([page for page in c.pages if page.finalized]))
+    total = sum(stat.size for stat in snapshot.statistics('filename'))
+    print(f'{os.path.basename(pdf_file)}: {num_pages} pages, '
+          f'{total/1024/num_pages:.1f} KB per page retained by pdf2docx objects')
+
+    # count and size of layout elements per class
+    stats = defaultdict(lambda: [0, 0])
+    for obj in gc.get_objects():
+        if isinstance(obj, (Element, BaseCollection)):
+            stat = stats[type(obj).__name__]
+            stat[0] += 1
+            stat[1] += instance_size(obj)
+    print(f'    {"class":<20}{"count":>10}{"bytes/object":>14}{"KB/page":>10}')
+    for name, (count, size) in sorted(stats.items(), key=lambda item: -item[1][1])[:12]:
+        print(f'    {name:<20}{count:>10}{size/count:>14.1f}{size/1024/num_pages:>10.1f}')
+    c.close()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    for filename in sys.argv[1:]: benchmark(filename)
@@ -31,13 +31,26 @@ object. Did not convert`, it might be necessary to follow the instructions at:
 import glob
 import os
 import io
+import json
+import zipfile
 import numpy as np
 import cv2 as cv
 import fitz
+from docx import Document
 from pdf2docx import Converter, parse
+from pdf2docx.converter import (ConversionException, MakedocxException)
+from pdf2docx.page.Page import Page
+from pdf2docx.page.RawPageFitz import RawPageFitz
+from pdf2docx.image.ImagesExtractor import ImagesExtractor
+from pdf2docx.shape.Paths import Paths
+from pdf2docx.common.algorithm import group_rects_by_connectivity
+from pdf2docx.common.share import PageType
+from pdf2docx.common.raster import (pixmap_to_array, pixmap_to_cv_image, samples_to_cv_image,
+                                    unmultiply_alpha, array_to_pixmap)
 import subprocess
 import time
 import shutil
+import types
 import platform
 import pytest
 
@@ -70,9 +83,7 @@ def get_page_similarity(page_a, page_b, diff_img_filename='diff.png'):
 
 def get_page_image(pdf_page):
     '''Convert fitz page to opencv image.'''
-    img_byte = pdf_page.get_pixmap(clip=pdf_page.rect).tobytes()
-    img = np.frombuffer(img_byte, np.uint8)
-    return cv.imdecode(img, cv.IMREAD_COLOR)
+    return pixmap_to_cv_image(pdf_page.get_pixmap(clip=pdf_page.rect))
 
 
 def get_mssism(i1, i2, kernel=(15,15)):
@@ -224,6 +235,18 @@ class TestConversion:
         docx_file = os.path.join(output_path, f'{filename}.docx')
         with open(docx_file, 'wb') as f: f.write(out_stream.getvalue())
 
+    def convert_to_stream(self, pdf_file, **kwargs):
+        '''Convert PDF file to docx in memory.'''
+        c = Converter(pdf_file)
+        stream = io.BytesIO()
+        c.convert(stream, **kwargs)
+        c.close()
+        return stream
+
+    def get_texts(self, docx_file):
+        '''Get text of paragraphs in docx file or stream.'''
+        return [p.text for p in Document(docx_file).paragraphs]
+
 
     # ------------------------------------------
     # table contents
@@ -277,6 +300,434 @@ class TestConversion:
         # check file
         assert os.path.isfile(docx_file)
 
+    def test_sparse_pages(self):
+        '''Test materializing only the selected pages.'''
+        filename = 'demo'
+        pdf_file = os.path.join(sample_path, f'{filename}.pdf')
+        docx_file = os.path.join(output_path, f'{filename}-sparse.docx')
+        c = Converter(pdf_file)
+        c.convert(docx_file, pages=[3, 1])
+        data = c.store()
+        c.close()
+        assert [page.id for page in c.pages]==[1, 3]
+        assert data['page_cnt']==c.pages.num_pages>3
+        assert [page['id'] for page in data['pages']]==[1, 3]
+
+        # reading pages like a list of all pages doesn't materialize any page
+        num = c.pages.num_pages
+        assert c.pages[1].finalized and not c.pages[0].finalized
+        assert c.pages[-1].id==num-1 and c.pages[-num+1] is c.pages[1]
+        assert [page.id for page in c.pages[-3:]]==list(range(num-3, num))
+        assert [page.id for page in c.pages[::2]]==list(range(0, num, 2))
+        assert len(c.pages)==2 and [page.id for page in c.pages]==[1, 3]
+
+    # ------------------------------------------
+    # store / restore parsed layout
+    # ------------------------------------------
+    def test_store_restore(self):
+        '''Test restoring parsed layout to lean elements, i.e. elements with ``__slots__``.'''
+        filename = 'demo-text'
+        pdf_file = os.path.join(sample_path, f'{filename}.pdf')
+        docx_file = os.path.join(output_path, f'{filename}.docx')
+        c = Converter(pdf_file)
+        c.convert(docx_file)
+        data = c.store()
+        c.close()
+
+        c = Converter(pdf_file)
+        c.restore(data)
+
+        blocks = c.pages[0].sections[0][0].blocks
+        block = next(block for block in blocks if block.is_text_block)
+        assert not hasattr(block.lines[0], '__dict__')
+        assert not hasattr(block.lines[0].spans[0], '__dict__')
+
+        docx_file = os.path.join(output_path, f'{filename}-restored.docx')
+        c.make_docx(docx_file)
+        c.close()
+        assert os.path.isfile(docx_file)
+
+    # ------------------------------------------
+    # streaming docx writer
+    # ------------------------------------------
+    def test_stream_writer(self):
+        '''Test streaming docx writer creates same docx package to ``python-docx``.'''
+        filename = 'demo'
+        pdf_file = os.path.join(sample_path, f'{filename}.pdf')
+        c = Converter(pdf_file)
+        settings = c.default_settings
+        c.parse(end=5, **settings)
+
+        outputs = []
+        for writer in ('python-docx', 'stream'):
+            stream = io.BytesIO()
+            settings.update(writer=writer)
+            c.make_docx(stream, **settings)
+            with zipfile.ZipFile(stream) as zipf:
+                outputs.append({name: zipf.read(name) for name in zipf.namelist()})
+        c.close()
+        assert outputs[0]==outputs[1]
+
+    def test_stream_writer_unseekable(self):
+        '''Test streaming docx writer writes images first to a non-seekable stream.'''
+        class UnseekableStream(io.BytesIO):
+            def seekable(self): return False
+            def seek(self, *args): raise io.UnsupportedOperation('seek')
+            def tell(self): raise io.UnsupportedOperation('tell')
+
+        filename = 'demo-image'
+        pdf_file = os.path.join(sample_path, f'{filename}.pdf')
+        stream = UnseekableStream()
+        c = Converter(pdf_file)
+        c.convert(stream, writer='stream')
+        c.close()
+
+        with zipfile.ZipFile(io.BytesIO(stream.getvalue())) as zipf:
+            assert zipf.testzip() is None
+            names = zipf.namelist()
+        media = [i for i, name in enumerate(names) if name.startswith('word/media/')]
+        assert media and media==list(range(len(media))) and names.index('word/document.xml')>len(media)
+
+    def test_stream_writer_error(self, monkeypatch):
+        '''Test streaming docx writer removes the partial docx file when failed to make page.'''
+        make_docx = Page.make_docx
+        def make_docx_or_fail(page, doc):
+            if page.id==1: raise ValueError('failed to make page')
+            return make_docx(page, doc)
+        monkeypatch.setattr(Page, 'make_docx', make_docx_or_fail)
+
+        filename = 'demo'
+        pdf_file = os.path.join(sample_path, f'{filename}.pdf')
+        docx_file = os.path.join(output_path, f'{filename}-stream-error.docx')
+        if os.path.exists(docx_file): os.remove(docx_file)
+        c = Converter(pdf_file)
+        with pytest.raises(MakedocxException):
+            c.convert(docx_file, writer='stream', ignore_page_error=False)
+        c.close()
+        assert not os.path.exists(docx_file)
+
+    def test_split_volumes(self):
+        '''Test splitting docx into volumes created in parallel processes.'''
+        filename = 'demo'
+        pdf_file = os.path.join(sample_path, f'{filename}.pdf')
+        docx_file = os.path.join(output_path, f'{filename}-split.docx')
+        c = Converter(pdf_file)
+        c.convert(docx_file, end=5, split_every=2, split_manifest=True, cpu_count=2)
+        c.convert(docx_file, end=5)
+        c.close()
+
+        with open(os.path.join(output_path, f'{filename}-split-manifest.json')) as f:
+            volumes = json.load(f)['volumes']
+        assert [(v['start'], v['end']) for v in volumes]==[(0, 2), (2, 4), (4, 5)]
+
+        # same text to the single docx
+        texts = lambda docx_file: [p.text for p in Document(docx_file).paragraphs if p.text]
+        split_texts = []
+        for v in volumes: split_texts.extend(texts(os.path.join(output_path, v['docx'])))
+        assert split_texts==texts(docx_file)
+
+        # volumes created in single process from pages in memory, e.g. blanks between words
+        filename = 'demo-text'
+        pdf_file = os.path.join(sample_path, f'{filename}.pdf')
+        docx_file = os.path.join(output_path, f'{filename}-split.docx')
+        c = Converter(pdf_file)
+        c.convert(docx_file, split_every=1, cpu_count=1)
+        c.close()
+        split_file = os.path.join(output_path, f'{filename}-split-001.docx')
+
+        stream = io.BytesIO()
+        c = Converter(pdf_file)
+        c.convert(stream)
+        c.close()
+        assert texts(split_file)==texts(stream)
+
+    def test_pipeline(self):
+        '''Test parsing and creating pages in pipeline gets same docx to sequential process.'''
+        filename = 'demo'
+        pdf_file = os.path.join(sample_path, f'{filename}.pdf')
+        streams = []
+        for settings in ({}, {'pipeline': True, 'pipeline_workers': (2, 2)}):
+            c = Converter(pdf_file)
+            stream = io.BytesIO()
+            c.convert(stream, **settings)
+            c.close()
+            streams.append(stream)
+
+        texts = lambda docx: [p.text for p in Document(docx).paragraphs]
+        assert texts(streams[0])==texts(streams[1])
+
+    def test_pipeline_rotated_pages(self, tmp_path):
+        '''Test parsing pages with different rotations in parallel threads of pipeline.'''
+        doc = fitz.open(os.path.join(sample_path, 'demo.pdf'))
+        for page in doc:
+            page.set_rotation(90*(page.number%2))
+        pdf_file = str(tmp_path / 'demo-pipeline-rotated.pdf')
+        doc.save(pdf_file)
+        doc.close()
+
+        documents = []
+        for settings in ({}, {'pipeline': True, 'pipeline_workers': (2, 2)}):
+            c = Converter(pdf_file)
+            stream = io.BytesIO()
+            c.convert(stream, **settings)
+            c.close()
+            with zipfile.ZipFile(stream) as docx:
+                documents.append(docx.read('word/document.xml'))
+        assert documents[0]==documents[1]
+
+    def test_pipeline_page_errors(self, monkeypatch, tmp_path):
+        '''Test no docx is created if all pages fail in pipeline, same to sequential process.'''
+        def parse_with_error(page, **settings): raise ValueError('parsing error')
+        monkeypatch.setattr(Page, 'parse', parse_with_error)
+
+        pdf_file = os.path.join(sample_path, 'demo.pdf')
+        docx_file = str(tmp_path / 'demo-pipeline-errors.docx')
+        for settings in ({}, {'pipeline': True}):
+            c = Converter(pdf_file)
+            with pytest.raises(ConversionException, match='No parsed pages'):
+                c.convert(docx_file, end=2, ignore_page_error=True, **settings)
+            c.close()
+            assert not os.path.exists(docx_file)
+
+    def test_checkpoint(self, monkeypatch, tmp_path):
+        '''Test resuming conversion from the parsed pages stored in checkpoint directory.'''
+        filename = 'demo'
+        pdf_file = os.path.join(sample_path, f'{filename}.pdf')
+        checkpoint_dir = str(tmp_path / 'checkpoint')
+
+        # count parsed pages
+        parsed_pages = []
+        parse_page = Page.parse
+        def parse_and_count(page, **settings):
+            parsed_pages.append(page.id)
+            return parse_page(page, **settings)
+        monkeypatch.setattr(Page, 'parse', parse_and_count)
+
+        streams = []
+        for pages in ([0, 1], [0, 1, 2]):
+            parsed_pages.clear()
+            c = Converter(pdf_file)
+            stream = io.BytesIO()
+            c.convert(stream, pages=pages, checkpoint_dir=checkpoint_dir)
+            c.close()
+            streams.append(stream)
+        assert parsed_pages==[2] # pages 0 and 1 are restored
+        assert sorted(os.listdir(checkpoint_dir))==[
+            'checkpoint.json', 'page-0.json', 'page-1.json', 'page-2.json']
+
+        c = Converter(pdf_file)
+        stream = io.BytesIO()
+        c.convert(stream, pages=[0, 1, 2])
+        c.close()
+        texts = lambda docx: [p.text for p in Document(docx).paragraphs]
+        assert texts(streams[1])==texts(stream)
+
+    def test_checkpoint_different_pdf(self, tmp_path):
+        '''Test a checkpoint isn't restored for a different pdf, even with the same count of
+        pages and metadata.'''
+        checkpoint_dir = str(tmp_path / 'checkpoint')
+
+        for word in ('Alpha', 'Beta'):
+            doc = fitz.open()
+            doc.new_page().insert_text((72, 72), f'{word} document')
+            pdf_file = str(tmp_path / 'demo-checkpoint.pdf')
+            doc.save(pdf_file)
+            doc.close()
+
+            c = Converter(pdf_file)
+            stream = io.BytesIO()
+            c.convert(stream, checkpoint_dir=checkpoint_dir)
+            c.close()
+            assert [p.text for p in Document(stream).paragraphs if p.text]==[f'{word} document']
+
+    def test_clip(self):
+        '''Test converting the region of interest of page only.'''
+        filename = 'demo-text'
+        pdf_file = os.path.join(sample_path, f'{filename}.pdf')
+        texts = lambda docx: [text for text in self.get_texts(docx) if text.strip()]
+        with fitz.open(pdf_file) as doc:
+            width, height = doc[0].cropbox.br
+
+        full = texts(self.convert_to_stream(pdf_file, pages=[0]))
+        top = texts(self.convert_to_stream(pdf_file, pages=[0], clip=(0, 0, width, height/2)))
+        assert 0 < len(top) < len(full)
+
+        clip = {0: (0, 0, 1, 1), 1: (0, 0, width, height)}
+        assert not texts(self.convert_to_stream(pdf_file, pages=[0], clip=clip))
+
+    def test_clip_rotated_page(self, tmp_path):
+        '''Test converting the region of rotated page, where the region is defined in un-rotated
+        page CS, i.e. the same to text and drawings, while links are in the final page CS.'''
+        doc = fitz.open()
+        page = doc.new_page()
+        page.set_rotation(90)
+        m = page.derotation_matrix
+        for y, word in ((100, 'Top'), (450, 'Bottom')): # the final page
+            page.insert_text(fitz.Point(72, y)*m, f'{word} of page', fontsize=14, rotate=90)
+            page.insert_link({'kind': fitz.LINK_URI, 'from': fitz.Rect(72, y-14, 180, y+4)*m,
+                              'uri': f'https://{word.lower()}.org'})
+            page.draw_circle(fitz.Point(600, y)*m, 30, color=(1, 0, 0), fill=(0, 0, 1))
+        width, height = page.rect.br
+        clip = fitz.Rect(0, 0, width, height/2) * m # top half of the final page
+        pdf_file = str(tmp_path / 'demo-clip-rotation.pdf')
+        doc.save(pdf_file)
+        doc.close()
+
+        stream = self.convert_to_stream(pdf_file, clip=tuple(clip))
+        with zipfile.ZipFile(stream) as zipf:
+            media = [name for name in zipf.namelist() if name.startswith('word/media/')]
+            xml = zipf.read('word/document.xml').decode()
+            rels = zipf.read('word/_rels/document.xml.rels').decode()
+        assert 'Top of page' in xml and 'Bottom of page' not in xml
+        assert len(media)==1 # vector graphic at top only
+        assert 'https://top.org' in rels and 'https://bottom.org' not in rels
+
+    def test_char_style(self):
+        '''Test sharing text format of runs by character styles.'''
+        filename = 'demo-text'
+        pdf_file = os.path.join(sample_path, f'{filename}.pdf')
+        docx_file = os.path.join(output_path, f'{filename}-char-style.docx')
+        c = Converter(pdf_file)
+        c.convert(docx_file, char_style=True)
+        c.close()
+
+        runs = [run for p in Document(docx_file).paragraphs for run in p.runs if run.text.strip()]
+        assert runs and all(run.style.name.startswith('PDF Span') for run in runs)
+
+    def test_multi_processing_stream(self):
+        '''Test converting pdf file-like object with multi-processing.'''
+        filename = 'demo-text'
+        pdf_file = os.path.join(sample_path, f'{filename}.pdf')
+        docx_file = os.path.join(output_path, f'{filename}-mp-stream.docx')
+        with open(pdf_file, 'rb') as f, Converter(stream=f) as c:
+            c.convert(docx_file, multi_processing=True, cpu_count=2)
+            tmp_pdf = c._tmp_pdf
+        assert not os.path.exists(tmp_pdf)
+
+        stream = io.BytesIO()
+        c = Converter(pdf_file)
+        c.convert(stream)
+        c.close()
+        texts = lambda docx: [p.text for p in Document(docx).paragraphs]
+        assert texts(docx_file)==texts(stream)
+
+    def test_classify_pages(self, tmp_path):
+        '''Test skipping needless stages according to classified page type, and rendering
+        scanned page to one image.'''
+        doc = fitz.open()
+        doc.new_page()
+        page = doc.new_page()
+        page.insert_text((72, 72), 'Hello pdf2docx')
+        # scanned page formed by two image strips
+        page = doc.new_page()
+        w, h = page.rect.width, page.rect.height
+        for i, color in enumerate([(200, 100, 50), (50, 100, 200)]):
+            pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 60, 40), False)
+            pixmap.set_rect(pixmap.irect, color)
+            page.insert_image((0, i*h/2, w, (i+1)*h/2), stream=pixmap.tobytes(),
+                                keep_proportion=False)
+        pdf_file = str(tmp_path / 'demo-classify.pdf')
+        doc.save(pdf_file)
+        doc.close()
+
+        docx_files = []
+        for classify_pages in (False, True):
+            docx_file = str(tmp_path / f'demo-classify-{classify_pages}.docx')
+            c = Converter(pdf_file)
+            c.convert(docx_file, classify_pages=classify_pages)
+            skipped = [page.skipped_stages for page in c.pages]
+            c.close()
+            docx_files.append(docx_file)
+        assert 'text' in skipped[0] and 'text' not in skipped[1]
+        assert 'tables' in skipped[1]
+        assert 'images' not in skipped[2] and 'text' in skipped[2]
+
+        # same text and sections, while the image strips are rendered to one image
+        images, texts, sections = [], [], []
+        for docx_file in docx_files:
+            with zipfile.ZipFile(docx_file) as zipf:
+                images.append(len([name for name in zipf.namelist() \
+                                    if name.startswith('word/media/')]))
+            texts.append([p.text for p in Document(docx_file).paragraphs if p.text.strip()])
+            sections.append(len(Document(docx_file).sections))
+        assert images==[2, 1]
+        assert texts[0]==texts[1]==['Hello pdf2docx']
+        assert sections[0]==sections[1]
+
+        # scanned only in the region of interest, i.e. the upper half covered by image
+        doc = fitz.open()
+        page = doc.new_page()
+        page.insert_image((0, 0, w, h/2), stream=pixmap.tobytes(), keep_proportion=False)
+        page_types = []
+        for clip in (None, (0, 0, w, h/2)):
+            raw_page = RawPageFitz(page)
+            raw_page.clip = clip
+            page_types.append(raw_page.classify())
+        doc.close()
+        assert page_types==[PageType.MIXED, PageType.SCANNED]
+
+    # ------------------------------------------
+    # vector graphics
+    # ------------------------------------------
+    def test_group_rects_by_connectivity(self):
+        '''Test grouping rects intersected with each other with tolerance considered.'''
+        rects = [(0, 0, 10, 10), (15, 0, 20, 10), (50, 50, 60, 60), (55, 65, 60, 70)]
+        groups = group_rects_by_connectivity(rects, 5, 5)
+        assert sorted(map(sorted, groups))==[[0, 1], [2, 3]]
+        groups = group_rects_by_connectivity(rects, 1, 1)
+        assert sorted(map(sorted, groups))==[[0], [1], [2], [3]]
+
+    def test_svg_regions_by_geometry(self, monkeypatch):
+        '''Test classifying connected paths by geometry: a table with graphic in cell, a chart,
+        and an ambiguous group which falls back to detecting contours from rendered page.'''
+        doc = fitz.open()
+        page = doc.new_page(width=600, height=800)
+        # table with a circle in the top-left cell
+        for x in (50, 150, 250): page.draw_line((x, 50), (x, 200))
+        for y in (50, 125, 200): page.draw_line((50, y), (250, y))
+        page.draw_circle((100, 87), 15)
+        # chart: grid lines across a curve
+        for y in (100, 150, 200): page.draw_line((300, y), (550, y))
+        page.draw_polyline([(310, 240), (380, 120), (450, 180), (540, 60)])
+        # ambiguous: a long line crossing a small graphic
+        page.draw_line((50, 400), (550, 400))
+        page.draw_line((290, 390), (310, 410))
+
+        clipped, detected = [], []
+        def clip_page_to_dict(extractor, bbox, **kwargs):
+            clipped.append(tuple(bbox))
+            return {'bbox': bbox}
+        def detect_svg_contours(extractor, *args, bbox=None):
+            detected.append(tuple(bbox))
+            return []
+        monkeypatch.setattr(ImagesExtractor, 'clip_page_to_dict', clip_page_to_dict)
+        monkeypatch.setattr(ImagesExtractor, 'detect_svg_contours', detect_svg_contours)
+
+        raw_page = RawPageFitz(page_engine=page)
+        raw_page.width, raw_page.height = page.rect.br
+        shapes, images = raw_page._init_paths().to_shapes_and_images()
+        doc.close()
+
+        # table borders are kept as shapes, while the circle in cell and the chart are clipped
+        assert len(shapes)==6
+        assert clipped==[(84.5, 71.5, 115.5, 102.5), (299.0, 60.0, 551.0, 240.0)]
+        assert detected==[(49.0, 390.0, 551.0, 410.0)]
+
+    def test_paths_clipping(self):
+        '''Test applying clipping paths to the visible bbox of the paths under them.'''
+        raw_page = RawPageFitz()
+        raw_page.width, raw_page.height = 600, 800
+        line = {'type': 's', 'color': (0, 0, 0), 'width': 1.0, 'rect': (50, 50, 50, 200),
+                'items': [('l', fitz.Point(50, 50), fitz.Point(50, 200))]}
+        raws = [{'type': 'clip', 'scissor': (0, 0, 100, 100), 'level': 0},
+                dict(line, level=1),
+                {'type': 'clip', 'scissor': (0, 0, 600, 70), 'level': 1},
+                dict(line, level=2), # clipped by both
+                dict(line, level=0)] # out of the clipping
+        paths = Paths(parent=raw_page).restore(raws)
+        assert [tuple(path.visible_bbox) for path in paths]==[
+            (49.5, 49.5, 50.5, 100.0), (49.5, 49.5, 50.5, 70.0), (49.5, 49.5, 50.5, 200.5)]
+
     # ------------------------------------------
     # rotated images (issue 346)
     # ------------------------------------------
@@ -288,6 +739,79 @@ class TestConversion:
         assert os.path.isfile(docx_file), f'Expected output file: {docx_file}'
         assert os.path.getsize(docx_file) > 0, 'Output docx should not be empty'
     
+    def test_jpeg_images(self):
+        '''Test embedding original JPEG image, with rotation applied by docx drawing.'''
+        filename = 'demo-image-rotation'
+        self.convert(filename)
+        docx_file = os.path.join(output_path, f'{filename}.docx')
+        with zipfile.ZipFile(docx_file) as zipf:
+            media = [name for name in zipf.namelist() if name.startswith('word/media/')]
+            xml = zipf.read('word/document.xml').decode()
+        assert media and all(name.endswith('.jpg') for name in media)
+        assert 'rot="16200000"' in xml
+
+    def test_jpeg_images_masked(self):
+        '''Test masked JPEG image is not embedded as the original stream, which loses mask.'''
+        doc = fitz.open()
+        page = doc.new_page()
+        pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 20, 20), False)
+        pixmap.set_rect(pixmap.irect, (200, 100, 50))
+        page.insert_image((100, 100, 200, 200), stream=pixmap.tobytes('jpeg'))
+        item = page.get_images(full=True)[0]
+        bbox = fitz.Rect(100, 100, 200, 200)
+        assert ImagesExtractor._to_jpeg_raw_dict(doc, item, bbox, 0)
+
+        # color key masking
+        doc.xref_set_key(item[0], 'Mask', '[0 10 0 10 0 10]')
+        assert ImagesExtractor._to_jpeg_raw_dict(doc, item, bbox, 0) is None
+        doc.close()
+
+    def test_extract_images_encoded(self):
+        '''Test the public extracting methods return encoded images, while the pending images
+        are encoded along with the other images of page.'''
+        doc = fitz.open()
+        page = doc.new_page()
+        pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 20, 20), True)
+        pixmap.set_rect(pixmap.irect, (200, 100, 50, 128))
+        page.insert_image((100, 100, 200, 200), pixmap=pixmap)
+        page.draw_rect((300, 300, 400, 400), fill=(1, 0, 0))
+
+        extractor = ImagesExtractor(page)
+        images = extractor.extract_images() + [extractor.clip_page_to_dict((300, 300, 400, 400))]
+        assert len(images)==2 and all(isinstance(raw['image'], bytes) for raw in images)
+
+        images = extractor.extract_images(encode=False)
+        assert not isinstance(images[0]['image'], bytes)
+        ImagesExtractor.encode_images(images)
+        assert isinstance(images[0]['image'], bytes)
+        doc.close()
+
+    def test_image_policy(self):
+        '''Test downsampling images and selecting image format by content.'''
+        filename = 'demo-image-colorspace'
+        pdf_file = os.path.join(sample_path, f'{filename}.pdf')
+        sizes = []
+        for settings in ({}, {'image_max_dpi': 150, 'image_format': 'auto'}):
+            c = Converter(pdf_file)
+            stream = io.BytesIO()
+            c.convert(stream, **settings)
+            c.close()
+            sizes.append(len(stream.getvalue()))
+        assert sizes[1] < sizes[0]
+
+    def test_render_scratch_page(self):
+        '''Test rendering vector graphics from a copy of page without modifying source pdf.'''
+        filename = 'demo-image-vector-graphic'
+        pdf_file = os.path.join(sample_path, f'{filename}.pdf')
+        docx_file = os.path.join(output_path, f'{filename}-scratch.docx')
+        c = Converter(pdf_file)
+        doc = c.fitz_doc
+        xrefs = [xref for page in doc for xref in page.get_contents()]
+        streams = [doc.xref_stream(xref) for xref in xrefs]
+        c.convert(docx_file, render_scratch_page=True)
+        assert streams==[doc.xref_stream(xref) for xref in xrefs]
+        c.close()
+
     # ------------------------------------------
     # non-grayscale/non-RGB images (issue 340)
     # ------------------------------------------
@@ -307,6 +831,52 @@ class TestConversion:
             parse(pdf_file, docx_file, start=0, end=None)
             assert os.path.isfile(docx_file), f'Expected output {docx_file}'
 
+    def test_pixmap_to_cv_image(self):
+        '''Test converting pixmap to opencv image from samples directly gets same image to
+        decoding the PNG image, for gray, RGB and CMYK pixmap, with alpha or not.'''
+        doc = fitz.open(os.path.join(sample_path, 'demo-image.pdf'))
+        page = doc[0]
+        for colorspace, alpha in ((fitz.csGRAY, False), (fitz.csGRAY, True), (fitz.csRGB, False),
+                                  (fitz.csRGB, True), (fitz.csCMYK, False)):
+            pixmap = page.get_pixmap(colorspace=colorspace, alpha=alpha, clip=(0, 0, 301, 201))
+            png = (fitz.Pixmap(fitz.csRGB, pixmap) if colorspace.n>3 else pixmap).tobytes()
+            for flags in (cv.IMREAD_COLOR, cv.IMREAD_UNCHANGED):
+                image = cv.imdecode(np.frombuffer(png, np.uint8), flags)
+                assert np.array_equal(pixmap_to_cv_image(pixmap, flags), image)
+        doc.close()
+
+    def test_array_to_pixmap(self):
+        '''Test converting opencv image back to pixmap without encoding gets same samples, i.e.
+        the straight color is premultiplied by alpha same to ``MuPDF``.'''
+        doc = fitz.open(os.path.join(sample_path, 'demo-image.pdf'))
+        page = doc[0]
+        for colorspace, alpha in ((fitz.csGRAY, False), (fitz.csGRAY, True), (fitz.csRGB, False),
+                                  (fitz.csRGB, True)):
+            pixmap = page.get_pixmap(colorspace=colorspace, alpha=alpha, clip=(0, 0, 301, 201))
+            samples = pixmap_to_array(pixmap)
+            images = [(unmultiply_alpha(samples) if alpha else samples, False)]
+            if colorspace.n==3: images.append((pixmap_to_cv_image(pixmap, cv.IMREAD_UNCHANGED), True))
+            for image, bgr in images:
+                pix = array_to_pixmap(image, bgr)
+                assert (pix.n, pix.alpha)==(pixmap.n, pixmap.alpha)
+                assert np.array_equal(pixmap_to_array(pix), samples)
+        doc.close()
+
+    def test_pixmap_to_array_stride(self):
+        '''Test wrapping samples with row padding, i.e. stride larger than ``width * n``.'''
+        doc = fitz.open(os.path.join(sample_path, 'demo-image.pdf'))
+        pixmap = doc[0].get_pixmap(alpha=True, clip=(0, 0, 301, 201))
+        doc.close()
+        h, w, n = pixmap.height, pixmap.width, pixmap.n
+        rows = np.frombuffer(pixmap.samples, np.uint8).reshape(h, w*n)
+        padded = types.SimpleNamespace(height=h, width=w, n=n, stride=w*n+3,
+                    samples_mv=memoryview(np.pad(rows, ((0, 0), (0, 3))).tobytes()))
+
+        samples = pixmap_to_array(padded)
+        assert samples.shape==(h, w, n) and np.array_equal(samples, pixmap_to_array(pixmap))
+        image = cv.imdecode(np.frombuffer(pixmap.tobytes(), np.uint8), cv.IMREAD_UNCHANGED)
+        assert np.array_equal(samples_to_cv_image(samples, True, cv.IMREAD_UNCHANGED), image)
+
 
 # We make a separate pytest test for each sample file.
 